@@ -2,70 +2,69 @@
 import requests
 import json
 from typing import Dict, List, Optional, Any
-from common import get_jwt, load_config
+from common import authorized_request, load_config
+from api.request_timing import operation
 
 
 class AtScaleAPIClient:
-    def __init__(self):
-        self.config = load_config()
+    @property
+    def config(self):
+        """Current configuration (cached; re-read only when config.json changes)"""
+        return load_config()
     
     def _get_headers(self) -> Dict[str, str]:
-        """Get headers with JWT token"""
+        """Get request headers (the JWT is added by authorized_request)"""
         return {
-            "Authorization": f"Bearer {get_jwt()}",
             "Content-Type": "application/json",
         }
     
+    @operation("project list")
     def get_published_projects(self) -> List[Dict]:
         """Get published projects with cubes"""
-        host = self.config["host"]
-        
-        if self.config.get("instance_type") == "installer":
-            org = self.config["organization"]
-            url = f"https://{host}:10502/projects/published/orgId/{org}"
+        if self.config.is_installer:
+            org = self.config.organization
+            url = f"{self.config.engine_base}/projects/published/orgId/{org}"
         else:
-            url = f"https://{host}/api/v1/projects/published"
+            url = f"{self.config.api_base}/projects/published"
         
-        response = requests.get(url, headers=self._get_headers(), verify=False, timeout=30)
+        response = authorized_request("GET", url, headers=self._get_headers(), verify=False, timeout=30)
         response.raise_for_status()
         data = response.json()
         return data.get("response", [])
     
+    @operation("aggregate list")
     def get_aggregates_by_cube(self, project_id: str, cube_id: str, limit: int = 200) -> Dict:
         """Get aggregates for a specific cube"""
-        host = self.config["host"]
-        
-        if self.config.get("instance_type") == "installer":
-            org = self.config["organization"]
-            url = f"https://{host}:10502/aggregates/orgId/{org}?limit={limit}&projectId={project_id}&cubeId={cube_id}"
+        if self.config.is_installer:
+            org = self.config.organization
+            url = f"{self.config.engine_base}/aggregates/orgId/{org}?limit={limit}&projectId={project_id}&cubeId={cube_id}"
         else:
-            url = f"https://{host}/api/v1/aggregates?limit={limit}&projectId={project_id}&cubeId={cube_id}"
+            url = f"{self.config.api_base}/aggregates?limit={limit}&projectId={project_id}&cubeId={cube_id}"
         
-        response = requests.get(url, headers=self._get_headers(), verify=False, timeout=30)
+        response = authorized_request("GET", url, headers=self._get_headers(), verify=False, timeout=30)
         response.raise_for_status()
         return response.json()
     
+    @operation("aggregate history")
     def get_aggregate_build_history(self, project_id: str, cube_id: str, limit: int = 20) -> Dict:
         """Get aggregate build history for a specific cube"""
-        host = self.config["host"]
-        
-        if self.config.get("instance_type") == "installer":
-            org = self.config["organization"]
-            url = f"https://{host}:10502/aggregate-batch/orgId/{org}/history?limit={limit}&projectId={project_id}&cubeId={cube_id}"
+        if self.config.is_installer:
+            org = self.config.organization
+            url = f"{self.config.engine_base}/aggregate-batch/orgId/{org}/history?limit={limit}&projectId={project_id}&cubeId={cube_id}"
         else:
-            url = f"https://{host}/api/v1/aggregates/build-history?limit={limit}&projectId={project_id}&cubeId={cube_id}"
+            url = f"{self.config.api_base}/aggregates/build-history?limit={limit}&projectId={project_id}&cubeId={cube_id}"
         
-        response = requests.get(url, headers=self._get_headers(), verify=False, timeout=30)
+        response = authorized_request("GET", url, headers=self._get_headers(), verify=False, timeout=30)
         response.raise_for_status()
         return response.json()
     
+    @operation("aggregate unblock")
     def unblock_aggregate(self, definition_id: str, instance_id: str) -> Dict:
         """Unblock an aggregate - TWO CALLS REQUIRED:
         1. Without instanceId (just definitionId)
         2. With instanceId
         """
-        host = self.config["host"]
-        org = self.config["organization"]
+        org = self.config.organization
         
         results = {
             "first_call": None,
@@ -74,11 +73,11 @@ class AtScaleAPIClient:
         }
         
         # FIRST CALL: Without instanceId
-        url1 = f"https://{host}:10502/aggregates/orgId/{org}/definitionId/{definition_id}?unblock=true"
+        url1 = f"{self.config.aggregate_control_base}/aggregates/orgId/{org}/definitionId/{definition_id}?unblock=true"
         
         try:
-            response1 = requests.put(
-                url1, 
+            response1 = authorized_request(
+                "PUT", url1, 
                 headers=self._get_headers(), 
                 verify=False, 
                 timeout=30
@@ -103,11 +102,11 @@ class AtScaleAPIClient:
             }
         
         # SECOND CALL: With instanceId (even if first call failed)
-        url2 = f"https://{host}:10502/aggregates/orgId/{org}/definitionId/{definition_id}/instanceId/{instance_id}?unblock=true"
+        url2 = f"{self.config.aggregate_control_base}/aggregates/orgId/{org}/definitionId/{definition_id}/instanceId/{instance_id}?unblock=true"
         
         try:
-            response2 = requests.put(
-                url2, 
+            response2 = authorized_request(
+                "PUT", url2, 
                 headers=self._get_headers(), 
                 verify=False, 
                 timeout=30
@@ -143,17 +142,17 @@ class AtScaleAPIClient:
         
         return results
     
+    @operation("aggregate block")
     def block_aggregate(self, definition_id: str, instance_id: str) -> Dict:
         """Block an aggregate (single call with instanceId)"""
-        host = self.config["host"]
-        org = self.config["organization"]
+        org = self.config.organization
         
         # Build URL
-        url = f"https://{host}:10502/aggregates/orgId/{org}/definitionId/{definition_id}/instanceId/{instance_id}?block=true"
+        url = f"{self.config.aggregate_control_base}/aggregates/orgId/{org}/definitionId/{definition_id}/instanceId/{instance_id}?block=true"
         
         try:
-            response = requests.delete(
-                url, 
+            response = authorized_request(
+                "DELETE", url, 
                 headers=self._get_headers(), 
                 verify=False, 
                 timeout=30
@@ -1,13 +1,44 @@
 # aggregate/common_selector.py
 import tkinter as tk
 from tkinter import ttk
-import threading
 from typing import List, Dict, Callable, Optional
 
 from common import append_log
+from api.catalog_registry import get_registry
 from .api_client import AtScaleAPIClient
 
 
+def load_project_cubes(publish, log):
+    """Registry loader for "projects" (see api/catalog_registry.py): published project/cube pairs"""
+    log("Loading published projects and cubes...")
+    
+    projects = AtScaleAPIClient().get_published_projects()
+    
+    results = []
+    for project in projects:
+        project_name = project.get("name", "Unknown Project")
+        project_id = project.get("id", "")
+        
+        cubes_list = project.get("cubes", [])
+        for cube in cubes_list:
+            cube_name = cube.get("name", "Unknown Cube")
+            cube_id = cube.get("id", "")
+            
+            display_text = f"{project_name} || {cube_name}"
+            results.append({
+                'display': display_text,
+                'project_name': project_name,
+                'project_id': project_id,
+                'cube_name': cube_name,
+                'cube_id': cube_id,
+                'full_data': {
+                    'project': project,
+                    'cube': cube
+                }
+            })
+    return results
+
+
 class ProjectCubeSelector:
     """Selector for projects and cubes using REST API (like catalog_tab.py)"""
     
@@ -15,7 +46,7 @@ class ProjectCubeSelector:
         self.parent = parent
         self.log_widget = log_ref_container[0] if isinstance(log_ref_container, list) else log_ref_container
         self.on_selection_change = on_selection_change
-        self.api_client = None
+        self._unsubscribe = None
         self.available_combinations = []  # List of dicts with project/cube data
         self.current_project_id = ""
         self.current_cube_id = ""
@@ -72,59 +103,33 @@ class ProjectCubeSelector:
                 return
     
     def load_initial_data(self):
-        """Load initial project and cube data"""
-        thread = threading.Thread(target=self._load_data_thread, daemon=True)
-        thread.start()
+        """Load initial project and cube data (shared through api/catalog_registry.py)"""
+        registry = get_registry()
+        if self._unsubscribe is None:
+            self._unsubscribe = registry.subscribe("projects", self._on_registry_update, log=self._safe_log)
+            self.selector.bind("<Destroy>", lambda event: self._unsubscribe(), add="+")
+        registry.ensure("projects")
     
-    def _load_data_thread(self):
-        """Thread function to load data"""
-        try:
-            self._safe_log("Loading published projects and cubes...")
-            
-            self.api_client = AtScaleAPIClient()
-            projects = self.api_client.get_published_projects()
-            
-            if not projects:
-                self._safe_update_selector(["No published projects found"])
-                return
-            
-            results = []
-            for project in projects:
-                project_name = project.get("name", "Unknown Project")
-                project_id = project.get("id", "")
-                
-                cubes_list = project.get("cubes", [])
-                for cube in cubes_list:
-                    cube_name = cube.get("name", "Unknown Cube")
-                    cube_id = cube.get("id", "")
-                    
-                    display_text = f"{project_name} || {cube_name}"
-                    results.append({
-                        'display': display_text,
-                        'project_name': project_name,
-                        'project_id': project_id,
-                        'cube_name': cube_name,
-                        'cube_id': cube_id,
-                        'full_data': {
-                            'project': project,
-                            'cube': cube
-                        }
-                    })
-            
-            self.available_combinations = results
-            
-            if results:
-                display_values = ["Select Project || Cube"] + [r['display'] for r in results]
-                self._safe_update_selector(display_values)
-                self._safe_log(f"Loaded {len(results)} project-cube combinations")
-            else:
-                self._safe_update_selector(["No cubes found in published projects"])
-                self._safe_log("No cubes found in published projects")
-                
-        except Exception as e:
-            error_msg = f"Error loading projects/cubes: {e}"
+    def _on_registry_update(self, entry):
+        """Registry callback (loading thread): show the published project list"""
+        if not entry.complete:
+            return
+        if entry.error is not None:
+            error_msg = f"Error loading projects/cubes: {entry.error}"
             self._safe_log(error_msg)
             self._safe_update_selector([error_msg])
+            return
+        
+        results = entry.data
+        self.available_combinations = results
+        
+        if results:
+            display_values = ["Select Project || Cube"] + [r['display'] for r in results]
+            self._safe_update_selector(display_values)
+            self._safe_log(f"Loaded {len(results)} project-cube combinations")
+        else:
+            self._safe_update_selector(["No cubes found in published projects"])
+            self._safe_log("No cubes found in published projects")
     
     def _safe_log(self, message):
         """Thread-safe logging"""
@@ -152,4 +157,4 @@ class ProjectCubeSelector:
         """Refresh the project-cube data"""
         self.selector["values"] = ["Refreshing..."]
         self.selector.current(0)
-        self.load_initial_data()
\ No newline at end of file
+        get_registry().refresh("projects")
\ No newline at end of file
@@ -0,0 +1,171 @@
+# api/app_config.py
+"""
+Process-wide, read-only view of config.json.
+
+The file is parsed once and only re-parsed when its mtime/size changes, so
+hot paths (every XMLA query, every REST call) no longer do file I/O.
+Endpoint URLs derived from host/instance_type are computed once per load.
+"""
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+
+# How often (seconds) the file is stat'ed for changes
+CHECK_INTERVAL = 1.0
+
+INSTALLER_AUTH_PORT = 10500
+INSTALLER_ENGINE_PORT = 10502
+GITHUB_API_URL = "https://api.github.com"
+
+
+class AppConfig(Mapping):
+    """
+    Immutable configuration with typed accessors and derived endpoint URLs:
+      auth_base        - installer design center (10500) / container ingress root
+      engine_base      - installer engine (10502) / container ingress root
+      api_base         - REST API root for aggregates, projects, rebuilds
+      aggregate_control_base - engine port (10502) in both modes; aggregate block/unblock always go there
+      xmla_url, query_submit_url, auth_url - full endpoint URLs
+      github_api_url   - GitHub REST root
+    """
+
+    def __init__(self, data):
+        data = MappingProxyType(dict(data))
+        instance_type = data.get("instance_type", "installer")
+        host = data.get("host", "")
+        organization = data.get("organization", "default")
+
+        # scheme / *_port overrides let config.json point at a local stand-in
+        # server (see api/replay_server.py) instead of a real AtScale host
+        scheme = data.get("scheme", "https")
+        auth_port = data.get("auth_port", INSTALLER_AUTH_PORT)
+        engine_port = data.get("engine_port", INSTALLER_ENGINE_PORT)
+
+        if instance_type == "container":
+            base = f"{scheme}://{host}"
+            engine_base = base
+            api_base = f"{base}/api/v1"
+            auth_base = base
+            xmla_url = f"{base}/engine/xmla"
+            query_submit_url = f"{base}/engine/query/submit"
+            auth_url = f"{base}/auth/realms/atscale/protocol/openid-connect/token"
+        else:
+            auth_base = f"{scheme}://{host}:{auth_port}"
+            engine_base = f"{scheme}://{host}:{engine_port}"
+            api_base = engine_base
+            xmla_url = f"{engine_base}/xmla/default"
+            query_submit_url = f"{engine_base}/query/orgId/{organization}/submit"
+            auth_url = f"{auth_base}/{organization}/auth"
+
+        # Block/unblock have always been sent to the engine port, container mode included
+        aggregate_control_base = f"{scheme}://{host}:{engine_port}"
+
+        values = {
+            "_data": data,
+            "instance_type": instance_type,
+            "host": host,
+            "organization": organization,
+            "auth_base": auth_base,
+            "engine_base": engine_base,
+            "api_base": api_base,
+            "aggregate_control_base": aggregate_control_base,
+            "xmla_url": xmla_url,
+            "query_submit_url": query_submit_url,
+            "auth_url": auth_url,
+            "github_api_url": data.get("github_api_url", GITHUB_API_URL).rstrip("/"),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AppConfig is read-only")
+
+    # --- Mapping interface so existing config["key"] / config.get() code keeps working ---
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    # --- Typed accessors ---
+    @property
+    def is_installer(self):
+        return self.instance_type == "installer"
+
+    @property
+    def is_container(self):
+        return self.instance_type == "container"
+
+    @property
+    def username(self):
+        return self._data["username"]
+
+    @property
+    def password(self):
+        return self._data["password"]
+
+    @property
+    def credentials(self):
+        return self._data["username"], self._data["password"]
+
+    @property
+    def workspace(self):
+        return self._data.get("workspace", "working_dir")
+
+    @property
+    def git_id(self):
+        return self._data.get("git_id")
+
+    @property
+    def git_token(self):
+        return self._data.get("git_token")
+
+    def get_int(self, key, default=None):
+        """Return an integer setting, falling back to default when missing or invalid"""
+        try:
+            return int(self._data[key])
+        except (KeyError, TypeError, ValueError):
+            return default
+
+
+_lock = threading.Lock()
+_cached = None
+_cached_stamp = None
+_last_check = 0.0
+
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def get_app_config(path=CONFIG_PATH):
+    """Return the cached AppConfig, re-parsing config.json only if it changed on disk"""
+    global _cached, _cached_stamp, _last_check
+    now = time.monotonic()
+    with _lock:
+        if _cached is not None and now - _last_check < CHECK_INTERVAL:
+            return _cached
+        _last_check = now
+        stamp = _file_stamp(path)
+        if _cached is None or stamp != _cached_stamp:
+            with open(path, "r", encoding="utf-8") as f:
+                _cached = AppConfig(json.load(f))
+            _cached_stamp = stamp
+        return _cached
+
+
+def invalidate_app_config():
+    """Force the next get_app_config() call to re-read the file"""
+    global _cached, _cached_stamp
+    with _lock:
+        _cached = None
+        _cached_stamp = None
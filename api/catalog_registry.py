@@ -0,0 +1,234 @@
+# api/catalog_registry.py
+"""
+Process-wide registry of the catalog / project / cube lists the tabs share.
+
+At startup three CatalogCubeSelectors (Queries, Cube Data Preview, Catalog)
+want the XMLA catalog -> cube -> GUID list, the Aggregates tab wants the
+published project -> cube -> ID list, and the Overview and Migrations tabs
+both want the design-center folder tree. The registry loads each list once:
+
+  - concurrent requests for the same list share one in-flight load
+    (SingleFlight), later ones get the stored copy until refresh();
+  - widgets subscribe and are called back whenever a list grows (catalogs
+    arrive one by one) or is replaced by a refresh.
+
+    registry = get_registry()
+    unsubscribe = registry.subscribe("catalogs", on_update, log=log)
+    registry.ensure("catalogs")            # background load unless loaded/loading
+    entry = registry.get("folders")        # blocking; entry.data is the folder JSON
+    registry.refresh("projects")           # background reload
+
+Callbacks run on the loading thread; Tk widgets must hop to the main loop
+with after(). Each subscriber sees entries in publication order (an entry
+older than one it already got is dropped), so posting them with after(0)
+keeps the widget on the latest list. Each list's loader is resolved lazily from LOADERS and called
+as loader(publish, log); publish(data) shows partial results, the return
+value is the complete list.
+"""
+import importlib
+import itertools
+import threading
+
+# kind -> (module, function)
+LOADERS = {
+    "catalogs": ("cubes.common_selector", "discover_catalog_cubes"),
+    "projects": ("aggregate.common_selector", "load_project_cubes"),
+    "folders": ("api.folders", "load_folders"),
+}
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, func):
+        """Run func() unless a call for key is already running; either way return (or raise) its outcome"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class RegistryEntry:
+    """One published state of a list: data so far, and whether the load has finished"""
+
+    def __init__(self, kind, generation, data, complete=False, error=None):
+        self.kind = kind
+        self.generation = generation
+        self.sequence = 0  # set by CatalogRegistry when published; later entries are higher
+        self.data = data
+        self.complete = complete
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.complete and self.error is None
+
+
+class _Subscriber:
+    """One subscription; delivers entries in sequence order and drops stale ones"""
+
+    def __init__(self, on_update, log):
+        self.on_update = on_update
+        self.log = log
+        self._lock = threading.Lock()
+        self._last_sequence = 0
+
+    def deliver(self, entry):
+        # Held across on_update so a check-then-deliver can't interleave with a newer entry
+        with self._lock:
+            if entry.sequence <= self._last_sequence:
+                return
+            self._last_sequence = entry.sequence
+            self.on_update(entry)
+
+
+class CatalogRegistry:
+    def __init__(self, loaders=None):
+        self.loaders = dict(LOADERS if loaders is None else loaders)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._subscribers = {kind: [] for kind in self.loaders}
+        self._flight = SingleFlight()
+        self._generations = itertools.count(1)
+        self._sequences = itertools.count(1)
+        self.loads = {kind: 0 for kind in self.loaders}
+
+    def _loader(self, kind):
+        module_name, func_name = self.loaders[kind]
+        return getattr(importlib.import_module(module_name), func_name)
+
+    def subscribe(self, kind, on_update, log=None):
+        """
+        Call on_update(entry) whenever kind is published; log(message) gets
+        the loader's progress messages. A list already (partly) loaded is
+        delivered right away. Returns a function that unsubscribes.
+        """
+        subscriber = _Subscriber(on_update, log)
+        with self._lock:
+            self._subscribers[kind].append(subscriber)
+            entry = self._entries.get(kind)
+        if entry is not None:
+            # A newer entry may have been delivered meanwhile; deliver() then drops this one
+            subscriber.deliver(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if subscriber in self._subscribers[kind]:
+                    self._subscribers[kind].remove(subscriber)
+        return unsubscribe
+
+    def peek(self, kind):
+        """The latest published entry for kind, or None"""
+        with self._lock:
+            return self._entries.get(kind)
+
+    def get(self, kind, refresh=False):
+        """Block until kind is loaded (joining a load in flight) and return its entry; load errors are raised"""
+        entry = self.peek(kind)
+        if entry is not None and entry.ok and not refresh:
+            return entry
+        entry = self._flight.do(kind, lambda: self._load(kind))
+        if entry.error is not None:
+            raise entry.error
+        return entry
+
+    def ensure(self, kind):
+        """Load kind in the background unless it is already loaded or loading"""
+        entry = self.peek(kind)
+        if (entry is not None and entry.ok) or self._flight.in_flight(kind):
+            return
+        self._start(kind, refresh=False)
+
+    def refresh(self, kind):
+        """Reload kind in the background (joins a load already in flight)"""
+        self._start(kind, refresh=True)
+
+    def _start(self, kind, refresh):
+        def run():
+            try:
+                self.get(kind, refresh=refresh)
+            except Exception:
+                pass  # Published to subscribers as entry.error
+        threading.Thread(target=run, name=f"registry-{kind}", daemon=True).start()
+
+    def _load(self, kind):
+        generation = next(self._generations)
+        self.loads[kind] += 1
+
+        def publish(data):
+            self._publish(RegistryEntry(kind, generation, data))
+
+        try:
+            data = self._loader(kind)(publish, lambda message: self._log(kind, message))
+            entry = RegistryEntry(kind, generation, data, complete=True)
+        except Exception as e:
+            previous = self.peek(kind)
+            # Keep showing the last good data alongside the error
+            entry = RegistryEntry(kind, generation, previous.data if previous else None, complete=True, error=e)
+        self._publish(entry)
+        return entry
+
+    def _publish(self, entry):
+        with self._lock:
+            entry.sequence = next(self._sequences)
+            self._entries[entry.kind] = entry
+            subscribers = list(self._subscribers[entry.kind])
+        for subscriber in subscribers:
+            subscriber.deliver(entry)
+
+    def _log(self, kind, message):
+        with self._lock:
+            subscribers = list(self._subscribers[kind])
+        for subscriber in subscribers:
+            if subscriber.log is not None:
+                subscriber.log(message)
+
+    def get_stats(self):
+        """Loads per list and how many requests joined a load already in flight"""
+        return {"loads": dict(self.loads), "coalesced": self._flight.coalesced}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CatalogRegistry()
+        return _registry
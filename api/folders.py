@@ -1,15 +1,18 @@
-import requests
 import urllib3
-from common import append_log
+from common import append_log, authorized_request, load_config
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def get_folders(host, org, jwt):
-    url = f"https://{host}:10500/api/1.0/org/{org}/folders"
+def get_folders(host, org):
+    url = f"{load_config().auth_base}/api/1.0/org/{org}/folders"
     headers = {
-        "Authorization": f"Bearer {jwt}",
         "Content-Type": "application/json",
     }
-    resp = requests.get(url, headers=headers, verify=False, timeout=20)
+    resp = authorized_request("GET", url, headers=headers, verify=False, timeout=20)
     resp.raise_for_status()
-    return resp.json()
\ No newline at end of file
+    return resp.json()
+
+def load_folders(publish, log):
+    """Registry loader for "folders" (see api/catalog_registry.py)"""
+    config = load_config()
+    return get_folders(config["host"], config["organization"])
@@ -1,5 +1,7 @@
 import os
 import requests
+from api import http_session
+from api.github_cache import get_github_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from common import append_log
 
@@ -8,9 +10,21 @@ class GitOperations:
         self.config = config
         self.git_token = config.get("git_token")
         self.git_id = config.get("git_id")
-        self.base_url = "https://api.github.com"
+        self.base_url = config.get("github_api_url", "https://api.github.com").rstrip("/")
         # Simple in-memory cache to avoid repeated checks during a session
         self._catalog_check_cache = {}
+        # full_name -> pushed_at from the repo listing; a cached "no catalog.yml" stays valid until it changes
+        self._repo_pushed_at = {}
+        # Persistent ETag cache shared across sessions (304s don't count against the rate limit)
+        self._github_cache = get_github_cache(self._cache_dir(config))
+
+    @staticmethod
+    def _cache_dir(config):
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        workspace = config.get("workspace", "working_dir")
+        if not os.path.isabs(workspace):
+            workspace = os.path.join(root_dir, workspace)
+        return os.path.join(workspace, ".cache")
 
     def _headers(self):
         headers = {
@@ -33,14 +47,13 @@ class GitOperations:
                 "per_page": 100
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            # Follows Link: rel="next", so accounts with more than per_page repos are complete
+            repositories, error_response = self._github_cache.get_all_pages(url, headers=headers, params=params, timeout=30)
 
-            if response.status_code != 200:
-                error_msg = f"GitHub API returned {response.status_code}: {response.text}"
+            if error_response is not None:
+                error_msg = f"GitHub API returned {error_response.status_code}: {error_response.text}"
                 return [], error_msg
 
-            repositories = response.json()
-
             if not isinstance(repositories, list):
                 error_msg = f"Unexpected response format: {repositories}"
                 return [], error_msg
@@ -48,6 +61,7 @@ class GitOperations:
             repo_list = []
             for repo in repositories:
                 repo_name = repo.get("full_name", "")
+                self._repo_pushed_at[repo_name] = repo.get("pushed_at")
                 private = repo.get("private", False)
                 visibility = "private" if private else "public"
                 display_name = f"{repo_name} [{visibility}]"
@@ -67,7 +81,7 @@ class GitOperations:
         try:
             headers = self._headers()
             url = f"{self.base_url}/repos/{repo_name}"
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._github_cache.get(url, headers=headers, timeout=30)
 
             if response.status_code == 200:
                 return True, None
@@ -91,7 +105,7 @@ class GitOperations:
                 "auto_init": False
             }
 
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = http_session.post(url, headers=headers, json=payload, timeout=30)
 
             if response.status_code == 201:
                 return True, None
@@ -107,7 +121,7 @@ class GitOperations:
         try:
             headers = self._headers()
             url = f"{self.base_url}/repos/{repo_name}"
-            response = requests.delete(url, headers=headers, timeout=30)
+            response = http_session.delete(url, headers=headers, timeout=30)
 
             if response.status_code == 204:
                 return True, None
@@ -137,7 +151,7 @@ class GitOperations:
             clean_repo_name = repo_name.split(" [")[0]
             headers = self._headers()
             url = f"{self.base_url}/repos/{clean_repo_name}/contents"
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._github_cache.get(url, headers=headers, timeout=30)
 
             if response.status_code != 200:
                 return [], f"GitHub API returned {response.status_code} for {clean_repo_name}"
@@ -163,12 +177,12 @@ class GitOperations:
                 "branch": "main"
             }
 
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._github_cache.get(url, headers=headers, timeout=30)
             if response.status_code == 200:
                 existing_file = response.json()
                 payload["sha"] = existing_file.get("sha")
 
-            response = requests.put(url, headers=headers, json=payload, timeout=30)
+            response = http_session.put(url, headers=headers, json=payload, timeout=30)
 
             if response.status_code in [200, 201]:
                 return True, None
@@ -185,7 +199,7 @@ class GitOperations:
             clean_repo_name = repo_name.split(" [")[0]
             headers = self._headers()
             url = f"{self.base_url}/repos/{clean_repo_name}/contents/{file_path}"
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._github_cache.get(url, headers=headers, timeout=30)
 
             if response.status_code != 200:
                 return None, f"GitHub API returned {response.status_code} for {file_path}"
@@ -214,7 +228,9 @@ class GitOperations:
 
             headers = self._headers()
             url = f"{self.base_url}/repos/{clean_name}/contents/catalog.yml"
-            resp = requests.get(url, headers=headers, timeout=12)
+            # Unchanged since the last probe (same pushed_at): a stored 404 is answered without a request
+            resp = self._github_cache.get(url, headers=headers, timeout=12,
+                                          validator=self._repo_pushed_at.get(clean_name))
 
             # 200 -> exists, 404 -> not found, other -> treat as not found but log
             if resp.status_code == 200:
@@ -273,4 +289,5 @@ class GitOperations:
                 except Exception as e:
                     append_log(f"Error checking repo {r}: {e}")
 
+        self._github_cache.flush()
         return matched
@@ -0,0 +1,192 @@
+# api/github_cache.py
+"""
+Persistent conditional-request cache for GitHub REST GETs.
+
+Responses are stored on disk keyed by URL (plus a fingerprint of the token,
+since different tokens see different repositories). Later requests send
+If-None-Match / If-Modified-Since; a 304 is answered from the cache and does
+not count against the GitHub rate limit. Paginated listings follow the
+Link: rel="next" header. When the rate limit is exhausted, requests are not
+sent until X-RateLimit-Reset and cached (possibly stale) data is served.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+from api import http_session
+
+CACHE_FILENAME = "github_responses.json"
+
+
+class CachedResponse:
+    """The subset of requests.Response that GitOperations relies on"""
+
+    def __init__(self, status_code, text, headers=None, links=None, from_cache=False):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.links = links or {}
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class GitHubCache:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+        self._rate_limit_reset = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def flush(self):
+        """Write the cache to disk if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self._entries)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _key(url, headers):
+        auth = (headers or {}).get("Authorization", "")
+        fingerprint = hashlib.sha1(auth.encode("utf-8")).hexdigest()[:12] if auth else "anon"
+        return f"{fingerprint} {url}"
+
+    def _note_rate_limit(self, response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        retry_after = response.headers.get("Retry-After")
+        with self._lock:
+            if remaining == "0" and reset:
+                self._rate_limit_reset = float(reset)
+            elif retry_after and response.status_code in (403, 429):
+                self._rate_limit_reset = time.time() + float(retry_after)
+
+    def rate_limited(self):
+        return time.time() < self._rate_limit_reset
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, url, headers=None, params=None, timeout=30, validator=None):
+        """
+        Conditional GET. Returns a CachedResponse. validator is an opaque
+        value that changes whenever the resource may have (e.g. the repo's
+        pushed_at for a file in it): a stored 404 with the same validator is
+        served without a request.
+        """
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        key = self._key(full_url, headers)
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if (entry is not None and entry["status"] == 404 and validator is not None
+                and entry.get("validator") == validator):
+            self._count(hit=True)
+            return self._from_entry(entry)
+
+        if self.rate_limited():
+            if entry is not None:
+                self._count(hit=True)
+                return self._from_entry(entry)
+            reset = time.strftime("%H:%M:%S", time.localtime(self._rate_limit_reset))
+            return CachedResponse(403, f"GitHub rate limit exhausted; resets at {reset}")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = http_session.get(full_url, headers=request_headers, timeout=timeout)
+        self._note_rate_limit(response)
+
+        if response.status_code == 304 and entry is not None:
+            self._count(hit=True)
+            if validator is not None and entry.get("validator") != validator:
+                with self._lock:
+                    entry["validator"] = validator
+                    self._dirty = True
+            return self._from_entry(entry)
+
+        self._count(hit=False)
+        if response.status_code in (200, 404):
+            entry = {
+                "status": response.status_code,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "links": {rel: link["url"] for rel, link in response.links.items()},
+                "text": response.text,
+                "stored_at": time.time(),
+                "validator": validator,
+            }
+            with self._lock:
+                self._entries[key] = entry
+                self._dirty = True
+        return CachedResponse(response.status_code, response.text, dict(response.headers), response.links)
+
+    @staticmethod
+    def _from_entry(entry):
+        links = {rel: {"url": url} for rel, url in entry.get("links", {}).items()}
+        return CachedResponse(entry["status"], entry["text"], links=links, from_cache=True)
+
+    def get_all_pages(self, url, headers=None, params=None, timeout=30):
+        """
+        Follow Link rel="next" and return (items, error_response). The first
+        non-200 page is returned as error_response with the items so far.
+        """
+        items = []
+        response = self.get(url, headers=headers, params=params, timeout=timeout)
+        while True:
+            if response.status_code != 200:
+                return items, response
+            page = response.json()
+            if not isinstance(page, list):
+                return page, None
+            items.extend(page)
+            next_link = response.links.get("next")
+            if not next_link:
+                return items, None
+            response = self.get(next_link["url"], headers=headers, timeout=timeout)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_github_cache(cache_dir):
+    """Return the process-wide cache stored in cache_dir (flushed at exit)"""
+    path = os.path.join(cache_dir, CACHE_FILENAME)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = GitHubCache(path)
+            atexit.register(cache.flush)
+        return cache
@@ -0,0 +1,383 @@
+# api/http_session.py
+"""
+Process-wide pooled HTTP transport.
+
+Every AtScale endpoint (installer auth on 10500, engine on 10502, container
+ingress) gets one keep-alive requests.Session, keyed by scheme/host/port, so
+repeated calls reuse TCP/TLS connections instead of handshaking each time.
+
+Responses are negotiated as gzip/deflate (plus br/zstd when the decoders are
+installed), large request bodies can optionally be gzip-compressed, and the
+bytes on the wire vs. decoded size of every call are recorded.
+
+read_body() returns a stream=True response body as bytes (never decoded to
+str); bodies over SPOOL_THRESHOLD are spooled to a temporary file and
+returned as a read-only mmap, which every XML parser here accepts as is.
+iter_body() yields the same body chunk by chunk for incremental parsers.
+"""
+import gzip
+import json
+import mmap
+import tempfile
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+
+from api import request_timing, retry_policy
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_COMPRESS_THRESHOLD = 8 * 1024  # bytes; smaller bodies are sent as-is
+MAX_RECENT_TRANSFERS = 200
+SPOOL_THRESHOLD = 16 * 1024 * 1024  # bytes; larger bodies go to a temp file + mmap
+READ_CHUNK_SIZE = 1024 * 1024
+
+_lock = threading.Lock()
+_sessions = {}
+_request_counts = {}
+_pool_settings = {
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "pool_block": False,
+}
+_compression = {
+    "requests": False,
+    "threshold": DEFAULT_COMPRESS_THRESHOLD,
+}
+_transfer_totals = {}
+_recent_transfers = deque(maxlen=MAX_RECENT_TRANSFERS)
+
+
+def configure_pools(pool_connections=None, pool_maxsize=None, pool_block=None):
+    """Change pool sizes. Existing sessions are closed and rebuilt on next use."""
+    with _lock:
+        if pool_connections is not None:
+            _pool_settings["pool_connections"] = int(pool_connections)
+        if pool_maxsize is not None:
+            _pool_settings["pool_maxsize"] = int(pool_maxsize)
+        if pool_block is not None:
+            _pool_settings["pool_block"] = bool(pool_block)
+        _close_sessions_locked()
+
+
+def configure_compression(compress_requests=None, threshold=None):
+    """
+    Enable gzip request bodies for calls that opt in with compress_body=True.
+    Off by default because the server has to accept Content-Encoding: gzip.
+    """
+    with _lock:
+        if compress_requests is not None:
+            _compression["requests"] = bool(compress_requests)
+        if threshold is not None:
+            _compression["threshold"] = int(threshold)
+
+
+def _host_key(url):
+    """Return 'scheme://host:port' for a URL, filling in the default port"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower() or "https"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{(parts.hostname or '').lower()}:{port}"
+
+
+class _TimingMixin:
+    """Reports connect / tls / ttfb phases of the current request to request_timing"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        self._tcp_seconds = time.perf_counter() - started
+        request_timing.add_phase("connect", self._tcp_seconds)
+        return sock
+
+    def connect(self):
+        self._tcp_seconds = 0.0
+        started = time.perf_counter()
+        super().connect()
+        handshake = time.perf_counter() - started - self._tcp_seconds
+        if isinstance(self, HTTPSConnection):
+            request_timing.add_phase("tls", handshake)
+
+    def getresponse(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        request_timing.add_phase("ttfb", time.perf_counter() - started)
+        request_timing.mark_headers_received()
+        return response
+
+
+class _TimedHTTPConnection(_TimingMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimingMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def _new_session():
+    session = requests.Session()
+    adapter = _TimedHTTPAdapter(
+        pool_connections=_pool_settings["pool_connections"],
+        pool_maxsize=_pool_settings["pool_maxsize"],
+        pool_block=_pool_settings["pool_block"],
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+def get_session(url):
+    """Return the shared session for the host/port of url (created on first use)"""
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _new_session()
+            _sessions[key] = session
+        _request_counts[key] = _request_counts.get(key, 0) + 1
+    return session
+
+
+def _prepare_body(kwargs, compress_body):
+    """
+    gzip the request body in place when enabled and large enough.
+    Returns (body_bytes, bytes_sent) for the transfer metrics.
+    """
+    body = kwargs.get("data")
+    if body is None and "json" in kwargs and compress_body and _compression["requests"]:
+        body = json.dumps(kwargs.pop("json")).encode("utf-8")
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+        kwargs["data"] = body
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+        kwargs["data"] = body
+    if not isinstance(body, (bytes, bytearray)):
+        return 0, 0
+
+    size = len(body)
+    if compress_body and _compression["requests"] and size >= _compression["threshold"]:
+        compressed = gzip.compress(body, compresslevel=5)
+        kwargs["data"] = compressed
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Encoding": "gzip"}
+        return size, len(compressed)
+    return size, size
+
+
+def request(method, url, retry=None, compress_body=False, **kwargs):
+    """
+    Drop-in replacement for requests.request() that uses the pooled session.
+    retry names the endpoint class in api.retry_policy (defaults by method);
+    compress_body=True lets a large body be gzip'ed if compression is enabled.
+    """
+    session = get_session(url)
+    body_bytes, sent_bytes = _prepare_body(kwargs, compress_body)
+    started = time.perf_counter()
+    streaming = bool(kwargs.get("stream"))
+    request_timing.begin_request(method, url)
+    try:
+        response = retry_policy.call(_host_key(url), method, lambda: session.request(method, url, **kwargs), retry=retry)
+    except Exception:
+        request_timing.end_request()
+        raise
+    # Streaming callers complete the record with request_timing.finish_stream()
+    response.timing_record = request_timing.end_request(response.status_code, streaming=streaming)
+    if streaming:
+        # read_body() records the transfer once the body has been consumed
+        response.transfer_context = (method, url, body_bytes, sent_bytes, started)
+    else:
+        # Body was read eagerly; raw.tell() is the (possibly compressed) byte count
+        record_transfer(method, url, response, len(response.content), body_bytes, sent_bytes,
+                        time.perf_counter() - started)
+    return response
+
+
+def iter_body(response, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yield the raw (decoded, not str) body chunks of a stream=True response.
+    The timing and transfer records are completed and the response closed
+    when the generator is exhausted or closed early - closing it is how a
+    caller abandons a transfer it no longer needs.
+    """
+    body_started = time.perf_counter()
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            size += len(chunk)
+            yield chunk
+    finally:
+        request_timing.finish_stream(getattr(response, "timing_record", None), time.perf_counter() - body_started)
+        context = getattr(response, "transfer_context", None)
+        if context is not None:
+            method, url, body_bytes, sent_bytes, started = context
+            record_transfer(method, url, response, size, body_bytes, sent_bytes, time.perf_counter() - started)
+        response.close()
+
+
+def read_body(response, spool_threshold=None):
+    """
+    Consume a stream=True response and return its body as bytes, or as a
+    read-only mmap of an anonymous temporary file once it grows past
+    spool_threshold (SPOOL_THRESHOLD by default). Either is bytes-like
+    (len, slicing, buffer protocol) and goes straight to the XML parsers,
+    so no charset guess or str decode happens. Completes the timing and
+    transfer records and closes the response.
+    """
+    threshold = SPOOL_THRESHOLD if spool_threshold is None else spool_threshold
+    chunks = []
+    spool = None
+    size = 0
+    body = iter_body(response)
+    try:
+        for chunk in body:
+            size += len(chunk)
+            if spool is not None:
+                spool.write(chunk)
+                continue
+            chunks.append(chunk)
+            if size > threshold:
+                spool = tempfile.TemporaryFile(prefix="atscale-body-")
+                spool.writelines(chunks)
+                chunks = None
+        if spool is None:
+            return b"".join(chunks)
+        spool.flush()
+        # The mapping stays valid after the (already unlinked) file is closed
+        return mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        body.close()
+        if spool is not None:
+            spool.close()
+
+
+def record_transfer(method, url, response, decoded_bytes, body_bytes=0, sent_bytes=None, elapsed=None):
+    """Record wire vs. decoded sizes for one call (streaming callers call this on close)"""
+    try:
+        wire_bytes = response.raw.tell()
+    except (AttributeError, ValueError):
+        wire_bytes = decoded_bytes
+    if sent_bytes is None:
+        sent = getattr(response.request, "body", None)
+        sent_bytes = len(sent) if isinstance(sent, (bytes, bytearray)) else body_bytes
+    entry = {
+        "method": method,
+        "url": url,
+        "status": response.status_code,
+        "content_encoding": response.headers.get("Content-Encoding", "identity"),
+        "wire_bytes": wire_bytes,
+        "decoded_bytes": decoded_bytes,
+        "request_bytes": body_bytes,
+        "request_wire_bytes": sent_bytes,
+        "elapsed": elapsed,
+    }
+    key = _host_key(url)
+    with _lock:
+        _recent_transfers.append(entry)
+        totals = _transfer_totals.setdefault(key, {
+            "calls": 0, "wire_bytes": 0, "decoded_bytes": 0, "request_bytes": 0, "request_wire_bytes": 0,
+        })
+        totals["calls"] += 1
+        for field in ("wire_bytes", "decoded_bytes", "request_bytes", "request_wire_bytes"):
+            totals[field] += entry[field]
+    return entry
+
+
+def get_transfer_stats():
+    """Per-host totals of bytes on the wire vs. decoded, both directions"""
+    with _lock:
+        return {key: dict(totals) for key, totals in _transfer_totals.items()}
+
+
+def get_recent_transfers():
+    """The last MAX_RECENT_TRANSFERS per-call transfer records, oldest first"""
+    with _lock:
+        return list(_recent_transfers)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def get_connection_stats():
+    """
+    Return per-host counters: requests issued, connections opened and how many
+    requests reused an already open connection.
+    """
+    stats = {}
+    with _lock:
+        for key, session in _sessions.items():
+            opened = 0
+            # Both schemes are mounted on the same adapter, so count it once
+            adapters = {id(a): a for a in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for pool_key in list(pools.keys()):
+                    pool = pools.get(pool_key)
+                    if pool is not None:
+                        opened += pool.num_connections
+            requests_sent = _request_counts.get(key, 0)
+            stats[key] = {
+                "requests": requests_sent,
+                "connections_opened": opened,
+                "reused": max(requests_sent - opened, 0),
+            }
+    return stats
+
+
+def reset_connection_stats():
+    """Reset request and transfer counters (connection counters live in the pools themselves)"""
+    with _lock:
+        _request_counts.clear()
+        _transfer_totals.clear()
+        _recent_transfers.clear()
+
+
+def _close_sessions_locked():
+    for session in _sessions.values():
+        session.close()
+    _sessions.clear()
+
+
+def close_all():
+    """Close every pooled connection (used on shutdown or config change)"""
+    with _lock:
+        _close_sessions_locked()
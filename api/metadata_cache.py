@@ -0,0 +1,208 @@
+# api/metadata_cache.py
+"""
+Persistent cache for XMLA DISCOVER rowsets (cube metadata, catalog tab data).
+
+Rowsets are stored in SQLite (<workspace>/.cache/xmla_metadata.sqlite),
+keyed by server scope (XMLA URL + user), catalog, cube, group and rowset
+name, together with the cube's schema version (its LAST_SCHEMA_UPDATE).
+load_cached() serves a stored group at once and revalidates it in a
+background thread: one cheap version query, and a full refetch only when
+the version changed (or is unknown):
+
+    frames = load_cached("cube_metadata", catalog, cube, fetch, fetch_version,
+                         log=log, on_refresh=redisplay)
+
+fetch() returns (version, {name: DataFrame}, complete); incomplete results
+(a failed query) are returned but never stored. Set "metadata_cache": false
+in config.json to disable the cache.
+"""
+import io
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from api.app_config import get_app_config
+
+CACHE_FILENAME = "xmla_metadata.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rowsets (
+    scope    TEXT NOT NULL,
+    catalog  TEXT NOT NULL,
+    cube     TEXT NOT NULL,
+    grp      TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    version  TEXT,
+    saved_at REAL NOT NULL,
+    data     TEXT NOT NULL,
+    PRIMARY KEY (scope, catalog, cube, grp, name)
+)
+"""
+
+
+def _dump_frame(df):
+    return df.to_json(orient="split", index=False)
+
+
+def _load_frame(text):
+    # dtype/convert_dates off: rowset values are kept as the strings parse_rows produced
+    return pd.read_json(io.StringIO(text), orient="split", dtype=False, convert_dates=False)
+
+
+class MetadataCache:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by the Tk thread and revalidation threads, serialized by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, scope, catalog, cube, group):
+        """Return (version, saved_at, {name: DataFrame}) for a stored group, or None"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, version, saved_at, data FROM rowsets "
+                "WHERE scope = ? AND catalog = ? AND cube = ? AND grp = ?",
+                (scope, catalog, cube, group)).fetchall()
+            if not rows:
+                self.misses += 1
+                return None
+            self.hits += 1
+        frames = {name: _load_frame(data) for name, _, _, data in rows}
+        _, version, saved_at, _ = rows[0]
+        return version, saved_at, frames
+
+    def put(self, scope, catalog, cube, group, version, frames):
+        """Replace a stored group"""
+        payload = [(scope, catalog, cube, group, name, version, time.time(), _dump_frame(df))
+                   for name, df in frames.items()]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM rowsets WHERE scope = ? AND catalog = ? AND cube = ? AND grp = ?",
+                               (scope, catalog, cube, group))
+            self._conn.executemany("INSERT INTO rowsets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", payload)
+
+    def touch(self, scope, catalog, cube, group):
+        """Mark a stored group as revalidated now"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE rowsets SET saved_at = ? WHERE scope = ? AND catalog = ? AND cube = ? AND grp = ?",
+                               (time.time(), scope, catalog, cube, group))
+
+    def invalidate(self, scope=None, catalog=None, cube=None):
+        """Drop stored groups; arguments left as None match everything"""
+        clauses, params = [], []
+        for column, value in (("scope", scope), ("catalog", catalog), ("cube", cube)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM rowsets{where}", params)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _cache_dir(config):
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    workspace = config.workspace
+    if not os.path.isabs(workspace):
+        workspace = os.path.join(root_dir, workspace)
+    return os.path.join(workspace, ".cache")
+
+
+def get_metadata_cache(config=None):
+    """Return the process-wide cache for the configured workspace, or None when disabled"""
+    config = config or get_app_config()
+    if not config.get("metadata_cache", True):
+        return None
+    path = os.path.join(_cache_dir(config), CACHE_FILENAME)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            try:
+                cache = _caches[path] = MetadataCache(path)
+            except (OSError, sqlite3.Error):
+                return None
+        return cache
+
+
+def cache_scope(config=None):
+    """Server + user the cached metadata belongs to (different users may see different cubes)"""
+    config = config or get_app_config()
+    return f"{config.get('username', '')}@{config.xmla_url}"
+
+
+def _same_frames(old, new):
+    return old.keys() == new.keys() and all(old[name].equals(new[name]) for name in new)
+
+
+def load_cached(group, catalog, cube, fetch, fetch_version, log=None, on_refresh=None):
+    """
+    Return {name: DataFrame} for a group of rowsets, from the cache when
+    possible. A cache hit is revalidated in a daemon thread; if the data
+    changed, the cache is updated and on_refresh(frames) is called from
+    that thread.
+    """
+    log = log or (lambda message: None)
+    cache = get_metadata_cache()
+    if cache is None:
+        return fetch()[1]
+
+    scope = cache_scope()
+    try:
+        cached = cache.get(scope, catalog, cube, group)
+    except (sqlite3.Error, ValueError) as e:
+        log(f"Metadata cache read failed ({e}); loading from server")
+        cached = None
+
+    if cached is None:
+        version, frames, complete = fetch()
+        if complete:
+            _store(cache, scope, catalog, cube, group, version, frames, log)
+        return frames
+
+    cached_version, saved_at, cached_frames = cached
+    age = time.time() - saved_at
+    log(f"Loaded {group.replace('_', ' ')} for {cube} from cache (saved {age / 60:.0f} min ago); revalidating")
+
+    def revalidate():
+        try:
+            version = fetch_version()
+            if version is not None and version == cached_version:
+                cache.touch(scope, catalog, cube, group)
+                log(f"Cached {group.replace('_', ' ')} for {cube} is up to date")
+                return
+            version, frames, complete = fetch()
+        except Exception as e:
+            log(f"Metadata revalidation failed: {e}")
+            return
+        if not complete:
+            return
+        _store(cache, scope, catalog, cube, group, version, frames, log)
+        if not _same_frames(cached_frames, frames):
+            log(f"{cube} changed on the server (schema version {cached_version} -> {version}); refreshing")
+            if on_refresh is not None:
+                on_refresh(frames)
+
+    threading.Thread(target=revalidate, daemon=True).start()
+    return cached_frames
+
+
+def _store(cache, scope, catalog, cube, group, version, frames, log):
+    try:
+        cache.put(scope, catalog, cube, group, version, frames)
+    except sqlite3.Error as e:
+        log(f"Metadata cache write failed: {e}")
@@ -0,0 +1,247 @@
+# api/replay_server.py
+"""
+Local record/replay stand-in for the AtScale and GitHub endpoints.
+
+record: each listener is a reverse proxy in front of one real upstream
+        (installer auth 10500, engine 10502, container ingress, GitHub API).
+        Every response is saved to the fixture directory.
+replay: the same listeners serve the saved fixtures with no network access,
+        optionally adding latency, a bandwidth cap and injected errors.
+
+Point config.json at it (installer example):
+    "host": "127.0.0.1", "scheme": "http",
+    "auth_port": 20500, "engine_port": 20502,
+    "github_api_url": "http://127.0.0.1:20600"
+
+Usage:
+    python -m api.replay_server record --fixtures fixtures/ \\
+        --listen auth=20500=https://atscale:10500 \\
+        --listen engine=20502=https://atscale:10502 \\
+        --listen github=20600=https://api.github.com
+    python -m api.replay_server replay --fixtures fixtures/ \\
+        --listen auth=20500 --listen engine=20502 --listen github=20600 \\
+        --latency 0.05 --bandwidth-kbps 2000 --error-rate 0.05
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+import urllib3
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Request headers that must not be forwarded upstream
+HOP_BY_HOP = {"host", "connection", "keep-alive", "proxy-connection", "te", "trailer",
+              "transfer-encoding", "upgrade", "content-length", "accept-encoding"}
+# Response headers that are not stored (the body is saved decoded)
+DROP_RESPONSE_HEADERS = HOP_BY_HOP | {"content-encoding", "date", "server", "set-cookie"}
+
+BANDWIDTH_CHUNK = 16 * 1024
+
+
+def fixture_key(method, path, body):
+    """
+    Stable fixture name: method + path/query + a hash of the body.
+    Auth headers are deliberately not part of the key so a replay with a
+    different token (or none) still matches.
+    """
+    digest = hashlib.sha1(method.encode() + b" " + path.encode() + b"\n" + (body or b"")).hexdigest()[:16]
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path.split("?", 1)[0]).strip("_")[:80] or "root"
+    return f"{method}_{slug}_{digest}"
+
+
+class FixtureStore:
+    """One directory per listener; <key>.json holds status/headers, <key>.body the decoded body"""
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _paths(self, listener, key):
+        directory = os.path.join(self.root, listener)
+        return os.path.join(directory, f"{key}.json"), os.path.join(directory, f"{key}.body")
+
+    def save(self, listener, key, method, path, status, headers, body):
+        meta_path, body_path = self._paths(listener, key)
+        meta = {"method": method, "path": path, "status": status, "headers": headers}
+        with self._lock:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            with open(body_path, "wb") as f:
+                f.write(body)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+
+    def load(self, listener, key):
+        meta_path, body_path = self._paths(listener, key)
+        if not os.path.exists(meta_path):
+            return None, None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+        return meta, body
+
+
+class ReplaySettings:
+    def __init__(self, latency=0.0, jitter=0.0, bandwidth_kbps=None, error_rate=0.0, error_status=502):
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth_kbps = bandwidth_kbps
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+
+def _make_handler(listener, store, upstream=None, settings=None, log=print):
+    session = requests.Session() if upstream else None
+    settings = settings or ReplaySettings()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _read_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def _send(self, status, headers, body, throttle=False):
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not throttle or not settings.bandwidth_kbps:
+                self.wfile.write(body)
+                return
+            bytes_per_second = settings.bandwidth_kbps * 1024 / 8
+            for start in range(0, len(body), BANDWIDTH_CHUNK):
+                chunk = body[start:start + BANDWIDTH_CHUNK]
+                self.wfile.write(chunk)
+                time.sleep(len(chunk) / bytes_per_second)
+
+        def _handle(self):
+            body = self._read_body()
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            key = fixture_key(self.command, self.path, body)
+            if upstream:
+                self._record(key, body)
+            else:
+                self._replay(key)
+
+        def _record(self, key, body):
+            headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP | {"content-encoding"}}
+            try:
+                resp = session.request(self.command, upstream + self.path, data=body or None,
+                                       headers=headers, verify=False, timeout=300, allow_redirects=False)
+            except requests.RequestException as e:
+                self._send(502, {"Content-Type": "text/plain"}, f"Upstream error: {e}".encode())
+                return
+            kept = {k: v for k, v in resp.headers.items() if k.lower() not in DROP_RESPONSE_HEADERS}
+            store.save(listener, key, self.command, self.path, resp.status_code, kept, resp.content)
+            log(f"[{listener}] recorded {self.command} {self.path} -> {resp.status_code} ({len(resp.content)} bytes)")
+            self._send(resp.status_code, kept, resp.content)
+
+        def _replay(self, key):
+            delay = settings.latency + random.uniform(0, settings.jitter)
+            if delay > 0:
+                time.sleep(delay)
+            if settings.error_rate and random.random() < settings.error_rate:
+                self._send(settings.error_status, {"Content-Type": "text/plain"}, b"Injected error")
+                return
+            meta, body = store.load(listener, key)
+            if meta is None:
+                log(f"[{listener}] no fixture for {self.command} {self.path} ({key})")
+                message = json.dumps({"error": "no recorded fixture", "key": key}).encode()
+                self._send(404, {"Content-Type": "application/json"}, message)
+                return
+            self._send(meta["status"], meta["headers"], body, throttle=True)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _handle
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class ReplayServer:
+    """
+    Runs one HTTP listener per endpoint in background threads.
+    listeners: {name: (port, upstream_url_or_None)}; upstream set => record mode.
+    """
+
+    def __init__(self, fixtures_dir, listeners, settings=None, bind="127.0.0.1", log=print):
+        self.store = FixtureStore(fixtures_dir)
+        self.listeners = listeners
+        self.settings = settings or ReplaySettings()
+        self.bind = bind
+        self.log = log
+        self._servers = []
+
+    def start(self):
+        for name, (port, upstream) in self.listeners.items():
+            handler = _make_handler(name, self.store, upstream and upstream.rstrip("/"), self.settings, self.log)
+            server = ThreadingHTTPServer((self.bind, int(port)), handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name=f"replay-{name}", daemon=True).start()
+            self._servers.append(server)
+            mode = f"recording {upstream}" if upstream else "replaying"
+            self.log(f"[{name}] listening on http://{self.bind}:{server.server_address[1]} ({mode})")
+        return self
+
+    @property
+    def ports(self):
+        return {name: server.server_address[1] for name, server in zip(self.listeners, self._servers)}
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+
+def _parse_listen(values, record):
+    listeners = {}
+    for value in values:
+        parts = value.split("=", 2)
+        if record and len(parts) != 3:
+            raise SystemExit(f"--listen must be name=port=upstream in record mode: {value}")
+        if not record and len(parts) < 2:
+            raise SystemExit(f"--listen must be name=port in replay mode: {value}")
+        listeners[parts[0]] = (int(parts[1]), parts[2] if record else None)
+    return listeners
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record/replay stand-in for AtScale and GitHub endpoints")
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("--fixtures", required=True, help="fixture directory")
+    parser.add_argument("--listen", action="append", required=True,
+                        help="name=port=upstream (record) or name=port (replay); repeatable")
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every replayed response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, seconds")
+    parser.add_argument("--bandwidth-kbps", type=float, default=None, help="cap replay throughput (kbit/s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of replays answered with an error")
+    parser.add_argument("--error-status", type=int, default=502)
+    args = parser.parse_args(argv)
+
+    settings = ReplaySettings(args.latency, args.jitter, args.bandwidth_kbps, args.error_rate, args.error_status)
+    server = ReplayServer(args.fixtures, _parse_listen(args.listen, args.mode == "record"), settings, args.bind)
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
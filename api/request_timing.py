@@ -0,0 +1,190 @@
+# api/request_timing.py
+"""
+Per-request timing instrumentation.
+
+Every HTTP call made through http_session is broken into phases
+(connect, tls, ttfb, download) by hooks on the urllib3 connection class.
+Parsing and DataFrame building are timed with phase("parse") /
+phase("dataframe"). Each record is tagged with the current operation,
+set with the operation() context manager / decorator, e.g.
+
+    @operation("aggregate list")
+    def get_aggregates_by_cube(...): ...
+
+Records live in a fixed-size ring buffer; summary() gives p50/p95 per
+operation and phase, and export_jsonl() writes the raw records.
+"""
+import contextvars
+import math
+import json
+import threading
+import time
+from collections import deque
+from contextlib import ContextDecorator, contextmanager
+
+MAX_RECORDS = 5000
+DEFAULT_OPERATION = "other"
+
+_operation_var = contextvars.ContextVar("request_timing_operation", default=DEFAULT_OPERATION)
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_active = threading.local()  # in-flight HTTP record for this thread
+
+
+class operation(ContextDecorator):
+    """Tag all timings recorded inside the block (or decorated call) with name"""
+
+    def __init__(self, name):
+        self.name = name
+        self._tokens = []
+
+    def _recreate_cm(self):
+        # Decorated functions may run on several threads at once; give each call its own token stack
+        return operation(self.name)
+
+    def __enter__(self):
+        self._tokens.append(_operation_var.set(self.name))
+        return self
+
+    def __exit__(self, *exc):
+        _operation_var.reset(self._tokens.pop())
+        return False
+
+
+def current_operation():
+    return _operation_var.get()
+
+
+def _append(record):
+    with _lock:
+        _records.append(record)
+
+
+# --- HTTP records (driven by http_session and its connection hooks) ---
+def begin_request(method, url):
+    record = {
+        "ts": time.time(),
+        "kind": "http",
+        "operation": current_operation(),
+        "method": method,
+        "url": url,
+        "phases": {},
+    }
+    _active.record = record
+    _active.started = time.perf_counter()
+    _active.headers_at = None
+    return record
+
+
+def add_phase(name, seconds):
+    """Accumulate a phase on this thread's in-flight request (retries add up)"""
+    record = getattr(_active, "record", None)
+    if record is not None:
+        record["phases"][name] = record["phases"].get(name, 0.0) + seconds
+
+
+def mark_headers_received():
+    _active.headers_at = time.perf_counter()
+
+
+def end_request(status=None, streaming=False):
+    """
+    Close the in-flight record. For buffered responses the body has already
+    been read, so download = now - headers received. Streaming callers pass
+    streaming=True and report the download themselves via finish_stream().
+    """
+    record = getattr(_active, "record", None)
+    if record is None:
+        return None
+    now = time.perf_counter()
+    headers_at = getattr(_active, "headers_at", None)
+    if headers_at is not None and not streaming:
+        record["phases"]["download"] = now - headers_at
+    record["status"] = status
+    record["total"] = now - _active.started
+    _active.record = None
+    if not streaming:
+        _append(record)
+    return record
+
+
+def finish_stream(record, download_seconds):
+    """Complete a streaming record once its body has been consumed"""
+    if record is None:
+        return
+    record["phases"]["download"] = download_seconds
+    record["total"] = record.get("total", 0.0) + download_seconds
+    _append(record)
+
+
+# --- Non-HTTP phases ---
+@contextmanager
+def phase(name, **extra):
+    """Time a local step (parse, dataframe build, ...) under the current operation"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _append({
+            "ts": time.time(),
+            "kind": name,
+            "operation": current_operation(),
+            "phases": {name: elapsed},
+            "total": elapsed,
+            **extra,
+        })
+
+
+# --- Reporting ---
+def get_records():
+    with _lock:
+        return list(_records)
+
+
+def clear():
+    with _lock:
+        _records.clear()
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    # nearest-rank percentile
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summary():
+    """
+    {operation: {phase: {"count", "p50", "p95"}}}; "total" is the whole
+    request (HTTP) or step duration.
+    """
+    grouped = {}
+    for record in get_records():
+        by_phase = grouped.setdefault(record["operation"], {})
+        for name, seconds in record["phases"].items():
+            by_phase.setdefault(name, []).append(seconds)
+        if record["kind"] == "http" and "total" in record:
+            by_phase.setdefault("total", []).append(record["total"])
+
+    result = {}
+    for op_name, by_phase in grouped.items():
+        result[op_name] = {}
+        for name, values in by_phase.items():
+            values.sort()
+            result[op_name][name] = {
+                "count": len(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+            }
+    return result
+
+
+def export_jsonl(path):
+    """Write every buffered record as one JSON object per line; returns the count"""
+    records = get_records()
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    return len(records)
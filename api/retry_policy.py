@@ -0,0 +1,188 @@
+# api/retry_policy.py
+"""
+Retry / backoff / circuit-breaker policy for outgoing HTTP calls.
+
+Every request sent through http_session is tagged with an endpoint class:
+  "read"     - GETs (query history, aggregate listing, GitHub reads): retried
+  "xmla"     - XMLA Discover/Execute POSTs (read-only by nature): retried
+  "mutation" - block/unblock, rebuild, delete, uploads: never retried
+Unless a caller passes retry=..., GET/HEAD/OPTIONS map to "read" and
+everything else to "mutation".
+
+Retries use exponential backoff with full jitter. Independently, one circuit
+breaker per host counts consecutive connection failures / 502-504 responses and
+fails fast (CircuitOpenError) while the host looks down, letting a single
+probe through once the cool-down has passed.
+"""
+import random
+import threading
+import time
+
+import requests
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Gateway/availability errors only: a 500 is how XMLA reports SOAP faults (MDX
+# syntax errors, unknown members), which say nothing about the host's health
+BREAKER_STATUSES = frozenset({502, 503, 504})
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the host's breaker is open"""
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=1, backoff_base=0.5, backoff_max=8.0):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def delay(self, attempt):
+        """Full-jitter exponential backoff for the given (1-based) failed attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+
+POLICIES = {
+    "read": RetryPolicy(max_attempts=4),
+    "xmla": RetryPolicy(max_attempts=4),
+    "mutation": RetryPolicy(max_attempts=1),
+}
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """Return True if a request may be sent (caller holds the module lock)"""
+        if self.opened_at is None:
+            return True
+        if not self.probing and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.probing = True  # let exactly one probe through
+            return True
+        return False
+
+    def record(self, ok):
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+        else:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+        self.probing = False
+
+
+_lock = threading.Lock()
+_breakers = {}
+_retry_counts = {}
+_short_circuits = {}
+
+
+def configure_policies(overrides):
+    """
+    Apply config overrides, e.g. {"read": {"max_attempts": 3}, "breaker": {"failure_threshold": 10}}.
+    Unknown endpoint classes are added as new policies.
+    """
+    global BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS
+    for name, settings in (overrides or {}).items():
+        if name == "breaker":
+            BREAKER_FAILURE_THRESHOLD = int(settings.get("failure_threshold", BREAKER_FAILURE_THRESHOLD))
+            BREAKER_RESET_SECONDS = float(settings.get("reset_seconds", BREAKER_RESET_SECONDS))
+            with _lock:
+                _breakers.clear()
+            continue
+        policy = POLICIES.setdefault(name, RetryPolicy())
+        for attr in ("max_attempts", "backoff_base", "backoff_max"):
+            if attr in settings:
+                setattr(policy, attr, type(getattr(policy, attr))(settings[attr]))
+
+
+def endpoint_class(method, retry=None):
+    """Resolve the endpoint class for a request"""
+    if retry is not None:
+        return retry
+    return "read" if method.upper() in SAFE_METHODS else "mutation"
+
+
+def _breaker_for(host_key):
+    breaker = _breakers.get(host_key)
+    if breaker is None:
+        breaker = _breakers[host_key] = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+    return breaker
+
+
+def call(host_key, method, send, retry=None):
+    """
+    Run send() (which performs one HTTP request and returns a Response) under
+    the policy for this endpoint class and the breaker for host_key.
+    The final Response is returned unchanged, even if it is an error status,
+    so callers keep their existing status handling.
+    """
+    name = endpoint_class(method, retry)
+    policy = POLICIES.get(name, POLICIES["mutation"])
+    attempt = 0
+
+    while True:
+        attempt += 1
+        with _lock:
+            breaker = _breaker_for(host_key)
+            if not breaker.allow():
+                _short_circuits[host_key] = _short_circuits.get(host_key, 0) + 1
+                raise CircuitOpenError(f"Circuit open for {host_key}; failing fast")
+
+        try:
+            response = send()
+        except RETRY_EXCEPTIONS:
+            with _lock:
+                breaker.record(False)
+            if attempt >= policy.max_attempts:
+                raise
+        except Exception:
+            # Not a transport failure - release a half-open probe slot and propagate
+            with _lock:
+                breaker.probing = False
+            raise
+        else:
+            with _lock:
+                breaker.record(response.status_code not in BREAKER_STATUSES)
+            if response.status_code not in RETRY_STATUSES or attempt >= policy.max_attempts:
+                return response
+            response.close()
+
+        with _lock:
+            _retry_counts[name] = _retry_counts.get(name, 0) + 1
+        time.sleep(policy.delay(attempt))
+
+
+def get_retry_stats():
+    """Return retry counts per endpoint class, short-circuit counts and breaker state per host"""
+    with _lock:
+        return {
+            "retries": dict(_retry_counts),
+            "short_circuits": dict(_short_circuits),
+            "breakers": {key: b.state for key, b in _breakers.items()},
+        }
+
+
+def reset_retry_stats():
+    with _lock:
+        _retry_counts.clear()
+        _short_circuits.clear()
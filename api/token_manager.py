@@ -0,0 +1,167 @@
+# api/token_manager.py
+"""
+Thread-safe, expiry-aware JWT cache.
+
+The token is refreshed in the background shortly before it expires,
+concurrent refreshes collapse into a single auth request, and a 401 from
+any endpoint triggers one re-authentication followed by a single replay.
+"""
+import base64
+import json
+import logging
+import threading
+import time
+
+from api import http_session
+
+REFRESH_MARGIN_SECONDS = 60      # refresh this long before exp
+EXPIRY_SKEW_SECONDS = 10         # stop handing out a token this close to exp
+DEFAULT_TOKEN_LIFETIME = 15 * 60  # used when neither exp nor expires_in is known
+
+logger = logging.getLogger(__name__)
+
+
+def decode_jwt_expiry(token):
+    """Return the exp claim (epoch seconds) of a JWT, or None if it can't be read"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except (AttributeError, IndexError, ValueError, TypeError):
+        return None
+
+
+class _Flight:
+    """One in-progress refresh that other threads can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class TokenManager:
+    def __init__(self, fetch_token, refresh_margin=REFRESH_MARGIN_SECONDS, log=None):
+        """
+        fetch_token: callable returning (token, expires_in_seconds_or_None).
+        log: optional callable(message) for background refresh failures
+             (they go to the module logger until one is set, see set_log).
+        """
+        self._fetch_token = fetch_token
+        self._refresh_margin = refresh_margin
+        self._log = log
+        self.last_refresh_error = None
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+        self._flight = None
+        self._timer = None
+        self.refresh_count = 0
+
+    def set_log(self, log):
+        """Report background refresh failures through log(message) from now on"""
+        self._log = log
+
+    def _is_valid_locked(self):
+        return bool(self._token) and time.time() < self._expires_at - EXPIRY_SKEW_SECONDS
+
+    def get_token(self, force_refresh=False):
+        """Return a valid token, fetching one if needed"""
+        if not force_refresh:
+            with self._lock:
+                if self._is_valid_locked():
+                    return self._token
+        return self._refresh()
+
+    def refresh_after_unauthorized(self, rejected_token):
+        """
+        Called when rejected_token got a 401. Only re-authenticates if no other
+        thread has already replaced that token.
+        """
+        return self._refresh(stale_token=rejected_token)
+
+    def clear(self):
+        """Forget the cached token and cancel any scheduled refresh"""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+            self._cancel_timer_locked()
+
+    def _refresh(self, stale_token=None):
+        with self._lock:
+            if stale_token is not None and self._token != stale_token and self._is_valid_locked():
+                return self._token
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+
+        if not leader:
+            # Another thread is already authenticating - wait for its result
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                return self._token
+
+        try:
+            token, expires_in = self._fetch_token()
+            expires_at = decode_jwt_expiry(token)
+            if expires_at is None:
+                expires_at = time.time() + (float(expires_in) if expires_in else DEFAULT_TOKEN_LIFETIME)
+            with self._lock:
+                self._token = token
+                self._expires_at = expires_at
+                self.refresh_count += 1
+                self._schedule_refresh_locked()
+            return token
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+
+    def _schedule_refresh_locked(self):
+        self._cancel_timer_locked()
+        delay = max(self._expires_at - self._refresh_margin - time.time(), 1.0)
+        self._timer = threading.Timer(delay, self._background_refresh, args=(self._token,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _background_refresh(self, token):
+        try:
+            self._refresh(stale_token=token)
+        except Exception as e:
+            # The next get_token() call will retry and surface the error to its caller
+            self.last_refresh_error = e
+            message = f"Background token refresh failed: {e}"
+            if self._log is not None:
+                self._log(message)
+            else:
+                logger.warning(message)
+        else:
+            self.last_refresh_error = None
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a Bearer-authenticated request through the pooled session.
+        On a 401 the token is refreshed and the request replayed once.
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = self.get_token()
+        headers["Authorization"] = f"Bearer {token}"
+        response = http_session.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            response.close()
+            token = self.refresh_after_unauthorized(token)
+            headers["Authorization"] = f"Bearer {token}"
+            response = http_session.request(method, url, headers=headers, **kwargs)
+        return response
@@ -1,8 +1,8 @@
 import json
 import requests
 import urllib3
-import xml.etree.ElementTree as ET
-import pandas as pd
+
+from cubes.sql_result_reader import read_sql_result
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -45,24 +45,11 @@ def submit_query(host, jwt, payload, installer=True):
     headers = {"Authorization": f"Bearer {jwt}", "Content-Type": "application/json"}
     resp = requests.post(url, json=payload, headers=headers, verify=False)
     resp.raise_for_status()
-    return resp.text
+    return resp.content
 
 def parse_xml_results(xml_text):
-    root = ET.fromstring(xml_text)
-    columns = [col.find("name").text for col in root.findall(".//columns/column")]
-    rows = []
-    for row in root.findall(".//data/row"):
-        values = []
-        for col in row.findall("column"):
-            if "null" in col.attrib:
-                values.append(None)
-            else:
-                values.append(col.text)
-        rows.append(values)
-    df = pd.DataFrame(rows, columns=columns)
-    for col in df.columns[1:]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    return df
+    # Typed columns straight from the declared <columns> schema
+    return read_sql_result(xml_text)
 
 # Example query payload
 payload = {
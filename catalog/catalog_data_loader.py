@@ -1,27 +1,140 @@
 # tabs/catalog_data_loader.py
+import threading
 import pandas as pd
-from cubes.cube_data_queries import run_xmla_query
+from cubes.xmla_async import iter_xmla_completed
 from cubes.cube_data_parsers import parse_rows
+from cubes.cube_data_queries import CUBE_VERSION_QUERY
+from cubes.cube_data_metadata import fetch_schema_version, parse_schema_version
+from cubes.cube_metadata_index import CubeMetadataIndex
 from catalog.catalog_queries import CATALOG_QUERIES
 from cubes.common_xmla import build_xmla_query
+from api.metadata_cache import load_cached
+from api.request_timing import operation, phase
 
-def load_catalog_data(catalog: str, cube: str, log_function):
-    """Load all catalog metadata for the selected catalog and cube."""
-    catalog_data = {name: None for name in CATALOG_QUERIES.keys()}
+EAGER_ROWSETS = [name for name, meta in CATALOG_QUERIES.items() if not meta.get("lazy")]
+LAZY_ROWSETS = [name for name, meta in CATALOG_QUERIES.items() if meta.get("lazy")]
+# Rowsets CatalogData.metadata_index is built from
+INDEX_ROWSETS = ('dimensions_detail_df', 'hierarchies_detail_df', 'levels_detail_df')
+
+
+class CatalogData(dict):
+    """
+    Rowsets of one catalog/cube by CATALOG_QUERIES name. Eager rowsets are
+    None until they arrive; lazy ones are fetched (and cached) the first
+    time they are read, so views that never need them never pay for them.
+    """
+
+    def __init__(self, catalog, cube, log_function, frames=None):
+        super().__init__({name: None for name in EAGER_ROWSETS})
+        self.update(frames or {})
+        self.catalog = catalog
+        self.cube = cube
+        self.log_function = log_function
+        self._lazy_lock = threading.Lock()
+        self._index = None
+
+    def __setitem__(self, name, df):
+        super().__setitem__(name, df)
+        if name in INDEX_ROWSETS:
+            self._index = None
+
+    @property
+    def metadata_index(self):
+        """CubeMetadataIndex over this cube's dimension rowsets, rebuilt only when one of them changes"""
+        if self._index is None:
+            self._index = CubeMetadataIndex(*(self.get(name) for name in INDEX_ROWSETS), cube=self.cube)
+        return self._index
+
+    def __missing__(self, name):
+        if name not in LAZY_ROWSETS:
+            raise KeyError(name)
+        with self._lazy_lock:
+            if not dict.__contains__(self, name):
+                self[name] = load_lazy_rowset(self.catalog, self.cube, name, self.log_function)
+            return dict.__getitem__(self, name)
+
+    def get(self, name, default=None):
+        try:
+            value = self[name]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+
+def fetch_catalog_data(catalog: str, cube: str, log_function, names=None, on_rowset=None):
+    """
+    Run the given CATALOG_QUERIES (default: the eager ones) plus the cube's
+    schema version concurrently. on_rowset(name, df) is called as each
+    rowset is parsed, in completion order. Returns (version, frames,
+    complete) for load_cached; a failed query leaves an empty DataFrame and
+    marks the result incomplete.
+    """
+    names = list(EAGER_ROWSETS if names is None else names)
+    frames = {}
+    complete = True
+    version = None
+
+    log_function(f"Loading {len(names)} metadata sets concurrently...")
+    bodies = [CUBE_VERSION_QUERY.format(catalog=catalog, cube_name=cube)] + \
+        [build_xmla_query(CATALOG_QUERIES[df_name]["sql"], catalog, cube) for df_name in names]
+
+    for index, xml_response in iter_xmla_completed(bodies):
+        if index == 0:
+            if not isinstance(xml_response, Exception):
+                version = parse_schema_version(xml_response)
+            continue
+        df_name = names[index - 1]
+        try:
+            if isinstance(xml_response, Exception):
+                raise xml_response
+            with phase("parse"):
+                frames[df_name] = parse_rows(xml_response, CATALOG_QUERIES[df_name]["columns"])
+            log_function(f"Loaded {len(frames[df_name])} rows for {df_name}")
+        except Exception as e:
+            log_function(f"Error loading {df_name}: {e}")
+            frames[df_name] = pd.DataFrame()
+            complete = False
+        if on_rowset is not None:
+            on_rowset(df_name, frames[df_name])
+
+    return version, frames, complete
+
+
+@operation("catalog load")
+def load_catalog_data(catalog: str, cube: str, log_function, on_rowset=None, on_refresh=None):
+    """
+    Load the eager catalog rowsets for the selected catalog and cube and
+    return them as CatalogData. Blocks until all of them are in, so call it
+    off the Tk thread; on_rowset(name, df) reports each rowset as it lands
+    (from the metadata cache, all at once). Cached data is revalidated in
+    the background and on_refresh(catalog_data) is called if it changed.
+    """
+    catalog_data = CatalogData(catalog, cube, log_function)
+    delivered = set()
+
+    def deliver(name, df):
+        delivered.add(name)
+        catalog_data[name] = df
+        if on_rowset is not None:
+            on_rowset(name, df)
+
+    def refresh(frames):
+        if on_refresh is not None:
+            on_refresh(CatalogData(catalog, cube, log_function, frames))
 
     try:
         log_function(f"Loading catalog metadata for {catalog} -> {cube}...")
 
-        for df_name, meta in CATALOG_QUERIES.items():
-            try:
-                log_function(f"Loading {df_name}...")
-                query_xml = query_xml = build_xmla_query(meta["sql"], catalog, cube)
-                xml_response = run_xmla_query(query_xml)
-                catalog_data[df_name] = parse_rows(xml_response, meta["columns"])
-                log_function(f"Loaded {len(catalog_data[df_name])} rows for {df_name}")
-            except Exception as e:
-                log_function(f"Error loading {df_name}: {e}")
-                catalog_data[df_name] = pd.DataFrame()
+        frames = load_cached(
+            "catalog_data", catalog, cube,
+            fetch=lambda: fetch_catalog_data(catalog, cube, log_function, on_rowset=deliver),
+            fetch_version=lambda: fetch_schema_version(catalog, cube),
+            log=log_function,
+            on_refresh=refresh,
+        )
+        for name, df in frames.items():
+            if name not in delivered:
+                deliver(name, df)
 
         log_function(f"Successfully loaded catalog metadata for {catalog}")
         return catalog_data
@@ -29,3 +142,20 @@ def load_catalog_data(catalog: str, cube: str, log_function):
     except Exception as e:
         log_function(f"Error loading catalog metadata: {e}")
         return catalog_data
+
+
+@operation("catalog load")
+def load_lazy_rowset(catalog: str, cube: str, name: str, log_function):
+    """Fetch one lazy rowset on demand (cached on disk like the eager ones)"""
+    log_function(f"Loading {name} on demand...")
+    try:
+        frames = load_cached(
+            f"catalog_data:{name}", catalog, cube,
+            fetch=lambda: fetch_catalog_data(catalog, cube, log_function, names=[name]),
+            fetch_version=lambda: fetch_schema_version(catalog, cube),
+            log=log_function,
+        )
+        return frames.get(name, pd.DataFrame())
+    except Exception as e:
+        log_function(f"Error loading {name}: {e}")
+        return pd.DataFrame()
@@ -2,6 +2,8 @@
 from cubes.common_xmla import build_xmla_query
 
 # Central registry of SQL fragments and their expected columns.
+# "lazy" rowsets are large and not needed by the trees; they are only
+# fetched when something reads them (see catalog_data_loader.CatalogData).
 CATALOG_QUERIES = {
     "columns_df": {
         "sql": """
@@ -11,6 +13,7 @@ CATALOG_QUERIES = {
         "columns": [
             "CATALOG_NAME", "DATASET_NAME", "COLUMN_NAME", "DATA_TYPE", "EXPRESSION", "CONNECTION_ID"
         ],
+        "lazy": True,
     },
     "tables_df": {
         "sql": """
@@ -138,6 +141,7 @@ CATALOG_QUERIES = {
             "DATABASE_NAME", "OBJECT_TYPE", "TABLE", "OBJECT", "EXPRESSION", "REFERENCED_OBJECT_TYPE",
             "REFERENCED_TABLE", "REFERENCED_OBJECT", "REFERENCED_EXPRESSION", "CATALOG_NAME", "CUBE_NAME"
         ],
+        "lazy": True,
     },
 }
 
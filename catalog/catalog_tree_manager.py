@@ -1,54 +1,47 @@
 # tabs/catalog_tree_manager.py
 import pandas as pd
 
+# Rowsets each tree is built from; a tree can be filled as soon as its own rowsets are loaded
+DIMENSION_TREE_ROWSETS = ('dimensions_detail_df', 'hierarchies_detail_df', 'levels_detail_df')
+MEASURE_TREE_ROWSETS = ('measures_detail_df',)
+
 def populate_catalog_treeviews(dimensions_tree, measures_tree, catalog_data, current_cube):
     """Populate the dimensions and measures treeviews with catalog structure"""
-    # Clear existing trees
+    populate_dimensions_tree(dimensions_tree, catalog_data, current_cube)
+    populate_measures_tree(measures_tree, catalog_data, current_cube)
+    return True
+
+def populate_dimensions_tree(dimensions_tree, catalog_data, current_cube):
+    """Populate the dimensions treeview: dimension -> hierarchy -> level"""
     dimensions_tree.delete(*dimensions_tree.get_children())
-    measures_tree.delete(*dimensions_tree.get_children())
     
-    # Populate dimensions tree
-    dimensions_df = catalog_data.get('dimensions_detail_df')
-    hierarchies_df = catalog_data.get('hierarchies_detail_df')
-    levels_df = catalog_data.get('levels_detail_df')
+    # Filtered to current_cube and grouped once, so each node is a dict lookup
+    metadata_index = catalog_data.metadata_index
     
-    if dimensions_df is not None and not dimensions_df.empty:
-        # Filter for current cube
-        cube_dimensions = dimensions_df[dimensions_df['CUBE_NAME'] == current_cube]
+    for dim_row in metadata_index.dimensions:
+        dim_name = dim_row['DIMENSION_CAPTION']
+        dim_unique_name = dim_row['DIMENSION_UNIQUE_NAME']
         
-        for _, dim_row in cube_dimensions.iterrows():
-            dim_name = dim_row['DIMENSION_CAPTION']
-            dim_unique_name = dim_row['DIMENSION_UNIQUE_NAME']
+        dim_id = dimensions_tree.insert("", "end", text=dim_name, values=("dimension", dim_unique_name))
+        
+        # Add hierarchies for this dimension
+        for hier_row in metadata_index.hierarchies_of(dim_unique_name):
+            hier_name = hier_row['HIERARCHY_CAPTION']
+            hier_unique_name = hier_row['HIERARCHY_UNIQUE_NAME']
             
-            dim_id = dimensions_tree.insert("", "end", text=dim_name, values=("dimension", dim_unique_name))
+            hier_id = dimensions_tree.insert(dim_id, "end", text=hier_name, values=("hierarchy", hier_unique_name))
             
-            # Add hierarchies for this dimension
-            if hierarchies_df is not None and not hierarchies_df.empty:
-                cube_hierarchies = hierarchies_df[
-                    (hierarchies_df['CUBE_NAME'] == current_cube) & 
-                    (hierarchies_df['DIMENSION_UNIQUE_NAME'] == dim_unique_name)
-                ]
+            # Add levels for this hierarchy
+            for level_row in metadata_index.levels_of(hier_unique_name):
+                level_name = level_row['LEVEL_CAPTION']
+                level_unique_name = level_row['LEVEL_UNIQUE_NAME']
                 
-                for _, hier_row in cube_hierarchies.iterrows():
-                    hier_name = hier_row['HIERARCHY_CAPTION']
-                    hier_unique_name = hier_row['HIERARCHY_UNIQUE_NAME']
-                    
-                    hier_id = dimensions_tree.insert(dim_id, "end", text=hier_name, values=("hierarchy", hier_unique_name))
-                    
-                    # Add levels for this hierarchy
-                    if levels_df is not None and not levels_df.empty:
-                        hierarchy_levels = levels_df[
-                            (levels_df['CUBE_NAME'] == current_cube) & 
-                            (levels_df['HIERARCHY_UNIQUE_NAME'] == hier_unique_name)
-                        ]
-                        
-                        for _, level_row in hierarchy_levels.iterrows():
-                            level_name = level_row['LEVEL_CAPTION']
-                            level_unique_name = level_row['LEVEL_UNIQUE_NAME']
-                            
-                            dimensions_tree.insert(hier_id, "end", text=level_name, values=("level", level_unique_name))
+                dimensions_tree.insert(hier_id, "end", text=level_name, values=("level", level_unique_name))
+
+def populate_measures_tree(measures_tree, catalog_data, current_cube):
+    """Populate the measures treeview, grouped by display folder"""
+    measures_tree.delete(*measures_tree.get_children())
     
-    # Populate measures tree
     measures_df = catalog_data.get('measures_detail_df')
     if measures_df is not None and not measures_df.empty:
         cube_measures = measures_df[measures_df['CUBE_NAME'] == current_cube]
@@ -74,8 +67,6 @@ def populate_catalog_treeviews(dimensions_tree, measures_tree, catalog_data, cur
                 else:
                     measures_tree.insert("", "end", text=measure_name, values=("measure", measure_unique_name))
 
-    return True
-
 def handle_tree_selection(event, tree_type, catalog_data, display_function, log_function):
     """Handle treeview item selection and display recursive information"""
     tree = event.widget
@@ -128,46 +119,39 @@ def display_recursive_dimension(tree, item, catalog_data, display_function, colu
     dim_unique_name = item_values[1]
     dim_name = tree.item(item, "text")
     
-    hierarchies_df = catalog_data.get('hierarchies_detail_df')
-    levels_df = catalog_data.get('levels_detail_df')
+    metadata_index = catalog_data.metadata_index
     
     all_data = []
     
-    if hierarchies_df is not None and not hierarchies_df.empty:
-        # Get all hierarchies for this dimension
-        dim_hierarchies = hierarchies_df[hierarchies_df['DIMENSION_UNIQUE_NAME'] == dim_unique_name]
+    # Get all hierarchies for this dimension
+    for hier_row in metadata_index.hierarchies_of(dim_unique_name):
+        hier_name = hier_row['HIERARCHY_CAPTION']
+        hier_unique_name = hier_row['HIERARCHY_UNIQUE_NAME']
         
-        for _, hier_row in dim_hierarchies.iterrows():
-            hier_name = hier_row['HIERARCHY_CAPTION']
-            hier_unique_name = hier_row['HIERARCHY_UNIQUE_NAME']
-            
-            # Add hierarchy row
+        # Add hierarchy row
+        all_data.append({
+            'TYPE': 'Hierarchy',
+            'NAME': hier_name,
+            'DEFAULT_MEMBER': hier_row.get('DEFAULT_MEMBER', ''),
+            'HIERARCHY_ORIGIN': hier_row.get('HIERARCHY_ORIGIN', ''),
+            'HIERARCHY_DISPLAY_FOLDER': hier_row.get('HIERARCHY_DISPLAY_FOLDER', ''),
+            'PARENT_DIMENSION': dim_name
+        })
+        
+        # Get all levels for this hierarchy
+        for level_row in metadata_index.levels_of(hier_unique_name):
+            # Add level row
             all_data.append({
-                'TYPE': 'Hierarchy',
-                'NAME': hier_name,
-                'DEFAULT_MEMBER': hier_row.get('DEFAULT_MEMBER', ''),
-                'HIERARCHY_ORIGIN': hier_row.get('HIERARCHY_ORIGIN', ''),
-                'HIERARCHY_DISPLAY_FOLDER': hier_row.get('HIERARCHY_DISPLAY_FOLDER', ''),
+                'TYPE': 'Level',
+                'NAME': level_row['LEVEL_CAPTION'],
+                'LEVEL_NUMBER': level_row.get('LEVEL_NUMBER', ''),
+                'CARDINALITY': level_row.get('CARDINALITY', ''),
+                'LEVEL_TYPE': level_row.get('LEVEL_TYPE', ''),
+                'LEVEL_UNIQUE_SETTINGS': level_row.get('LEVEL_UNIQUE_SETTINGS', ''),
+                'LEVEL_IS_VISIBLE': level_row.get('LEVEL_IS_VISIBLE', ''),
+                'PARENT_HIERARCHY': hier_name,
                 'PARENT_DIMENSION': dim_name
             })
-            
-            # Get all levels for this hierarchy
-            if levels_df is not None and not levels_df.empty:
-                hierarchy_levels = levels_df[levels_df['HIERARCHY_UNIQUE_NAME'] == hier_unique_name]
-                
-                for _, level_row in hierarchy_levels.iterrows():
-                    # Add level row
-                    all_data.append({
-                        'TYPE': 'Level',
-                        'NAME': level_row['LEVEL_CAPTION'],
-                        'LEVEL_NUMBER': level_row.get('LEVEL_NUMBER', ''),
-                        'CARDINALITY': level_row.get('CARDINALITY', ''),
-                        'LEVEL_TYPE': level_row.get('LEVEL_TYPE', ''),
-                        'LEVEL_UNIQUE_SETTINGS': level_row.get('LEVEL_UNIQUE_SETTINGS', ''),
-                        'LEVEL_IS_VISIBLE': level_row.get('LEVEL_IS_VISIBLE', ''),
-                        'PARENT_HIERARCHY': hier_name,
-                        'PARENT_DIMENSION': dim_name
-                    })
     
     # Create combined dataframe
     if all_data:
@@ -182,41 +166,35 @@ def display_recursive_hierarchy(tree, item, catalog_data, display_function, colu
     hier_unique_name = item_values[1]
     hier_name = tree.item(item, "text")
     
-    hierarchies_df = catalog_data.get('hierarchies_detail_df')
-    levels_df = catalog_data.get('levels_detail_df')
+    metadata_index = catalog_data.metadata_index
     
     all_data = []
     
     # Get hierarchy details
-    if hierarchies_df is not None and not hierarchies_df.empty:
-        hierarchy_details = hierarchies_df[hierarchies_df['HIERARCHY_UNIQUE_NAME'] == hier_unique_name]
-        if not hierarchy_details.empty:
-            hier_row = hierarchy_details.iloc[0]
-            # Add hierarchy row
-            all_data.append({
-                'TYPE': 'Hierarchy',
-                'NAME': hier_row['HIERARCHY_CAPTION'],
-                'DEFAULT_MEMBER': hier_row.get('DEFAULT_MEMBER', ''),
-                'HIERARCHY_ORIGIN': hier_row.get('HIERARCHY_ORIGIN', ''),
-                'HIERARCHY_DISPLAY_FOLDER': hier_row.get('HIERARCHY_DISPLAY_FOLDER', '')
-            })
+    hier_row = metadata_index.hierarchy(hier_unique_name)
+    if hier_row is not None:
+        # Add hierarchy row
+        all_data.append({
+            'TYPE': 'Hierarchy',
+            'NAME': hier_row['HIERARCHY_CAPTION'],
+            'DEFAULT_MEMBER': hier_row.get('DEFAULT_MEMBER', ''),
+            'HIERARCHY_ORIGIN': hier_row.get('HIERARCHY_ORIGIN', ''),
+            'HIERARCHY_DISPLAY_FOLDER': hier_row.get('HIERARCHY_DISPLAY_FOLDER', '')
+        })
     
     # Get all levels for this hierarchy
-    if levels_df is not None and not levels_df.empty:
-        hierarchy_levels = levels_df[levels_df['HIERARCHY_UNIQUE_NAME'] == hier_unique_name]
-        
-        for _, level_row in hierarchy_levels.iterrows():
-            # Add level row
-            all_data.append({
-                'TYPE': 'Level',
-                'NAME': level_row['LEVEL_CAPTION'],
-                'LEVEL_NUMBER': level_row.get('LEVEL_NUMBER', ''),
-                'CARDINALITY': level_row.get('CARDINALITY', ''),
-                'LEVEL_TYPE': level_row.get('LEVEL_TYPE', ''),
-                'LEVEL_UNIQUE_SETTINGS': level_row.get('LEVEL_UNIQUE_SETTINGS', ''),
-                'LEVEL_IS_VISIBLE': level_row.get('LEVEL_IS_VISIBLE', ''),
-                'PARENT_HIERARCHY': hier_name
-            })
+    for level_row in metadata_index.levels_of(hier_unique_name):
+        # Add level row
+        all_data.append({
+            'TYPE': 'Level',
+            'NAME': level_row['LEVEL_CAPTION'],
+            'LEVEL_NUMBER': level_row.get('LEVEL_NUMBER', ''),
+            'CARDINALITY': level_row.get('CARDINALITY', ''),
+            'LEVEL_TYPE': level_row.get('LEVEL_TYPE', ''),
+            'LEVEL_UNIQUE_SETTINGS': level_row.get('LEVEL_UNIQUE_SETTINGS', ''),
+            'LEVEL_IS_VISIBLE': level_row.get('LEVEL_IS_VISIBLE', ''),
+            'PARENT_HIERARCHY': hier_name
+        })
     
     # Create combined dataframe
     if all_data:
@@ -252,9 +230,9 @@ def display_level_details(tree, item, catalog_data, display_function, columns_to
     item_values = tree.item(item, "values")
     level_unique_name = item_values[1]
     
-    levels_df = catalog_data.get('levels_detail_df')
-    if levels_df is not None and not levels_df.empty:
-        detail_df = levels_df[levels_df['LEVEL_UNIQUE_NAME'] == level_unique_name].copy()
+    level_row = catalog_data.metadata_index.level(level_unique_name)
+    if level_row is not None:
+        detail_df = pd.DataFrame([level_row])
         # Remove unwanted columns
         for col in columns_to_remove:
             if col in detail_df.columns:
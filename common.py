@@ -1,8 +1,11 @@
 # common.py (add these functions)
-import os, json, requests, urllib3
+import os, urllib3
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import List, Dict, Any, Optional
+from api import http_session
+from api.token_manager import TokenManager
+from api.app_config import get_app_config
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -19,13 +22,11 @@ def append_log(text_widget, message):
 
 def get_instance_type():
     """Return the instance_type from config.json"""
-    config = load_config()
-    return config.get("instance_type", "installer")
+    return load_config().instance_type
 
 def get_credentials():
     """Return username and password from config.json"""
-    config = load_config()
-    return config["username"], config["password"]
+    return load_config().credentials
 
 def make_tab_with_log(notebook, title, content_builder, log_ref_container):
     """Create a tab with content area and log area"""
@@ -61,37 +62,25 @@ def make_tab_with_log(notebook, title, content_builder, log_ref_container):
 
 # --- Config + JWT helpers ---
 def load_config():
-    """Load configuration from config.json"""
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Return the cached, read-only configuration (re-parsed only when config.json changes)"""
+    return get_app_config(CONFIG_PATH)
 
-_jwt_cache = None
-
-def get_jwt(force_refresh=False):
+def _fetch_jwt():
     """
-    Returns a JWT depending on instance_type (installer vs container).
-    Caches the token unless force_refresh=True.
+    Authenticate against AtScale depending on instance_type (installer vs container).
+    Returns (token, expires_in) where expires_in may be None.
     """
-    global _jwt_cache
-    if _jwt_cache and not force_refresh:
-        return _jwt_cache
-
     config = load_config()
-    host = config["host"]
-    username = config["username"]
-    password = config["password"]
+    username, password = config.credentials
 
-    if config.get("instance_type") == "installer":
+    if config.instance_type == "installer":
         # Installer flow
-        org = config["organization"]
-        url = f"https://{host}:10500/{org}/auth"
-        resp = requests.get(url, auth=(username, password), verify=False, timeout=15)
+        resp = http_session.get(config.auth_url, auth=(username, password), verify=False, timeout=15)
         resp.raise_for_status()
-        _jwt_cache = resp.text.strip()
+        return resp.text.strip(), None
 
-    elif config.get("instance_type") == "container":
+    elif config.instance_type == "container":
         # Container flow (OpenID Connect token endpoint)
-        url = f"https://{host}/auth/realms/atscale/protocol/openid-connect/token"
         data = {
             "client_id": config["client_id"],
             "client_secret": config["client_secret"],
@@ -99,19 +88,38 @@ def get_jwt(force_refresh=False):
             "password": password,
             "grant_type": "password",
         }
-        resp = requests.post(url, data=data, verify=False, timeout=15)
+        resp = http_session.post(config.auth_url, data=data, verify=False, timeout=15)
         resp.raise_for_status()
-        _jwt_cache = resp.json().get("access_token")
+        body = resp.json()
+        return body.get("access_token"), body.get("expires_in")
 
     else:
         raise ValueError(f"Unknown instance_type: {config.get('instance_type')}")
 
-    return _jwt_cache
+_token_manager = TokenManager(_fetch_jwt)
+
+def get_jwt(force_refresh=False):
+    """
+    Returns a JWT depending on instance_type (installer vs container).
+    The token is cached until shortly before it expires; force_refresh=True re-authenticates.
+    """
+    return _token_manager.get_token(force_refresh=force_refresh)
 
 def clear_jwt_cache():
     """Clear the cached JWT token"""
-    global _jwt_cache
-    _jwt_cache = None
+    _token_manager.clear()
+
+def set_token_log(log):
+    """Route background token refresh failures to log(message) (called from a timer thread)"""
+    _token_manager.set_log(log)
+
+def token_refresh_error():
+    """The last background token refresh failure, or None once a refresh succeeds"""
+    return _token_manager.last_refresh_error
+
+def authorized_request(method, url, **kwargs):
+    """Send a request with the current JWT; re-authenticates and replays once on 401"""
+    return _token_manager.request(method, url, **kwargs)
 
 def show_error(message):
     """Show error message box"""
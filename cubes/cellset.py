@@ -0,0 +1,351 @@
+# cubes/cellset.py
+"""
+Ordinal-correct MDX cellset engine.
+
+An XMLA cellset is (Axis0 tuples = columns) x (Axis1 tuples = rows) with
+each Cell carrying a CellOrdinal = row * n_columns + column. Empty cells are
+omitted by the server (NON EMPTY / sparse results), so a cell's position in
+the CellData list is NOT its ordinal.
+
+CellsetBuilder preallocates one NumPy value array of shape
+(n_rows, n_columns), fills it by CellOrdinal in bulk (missing cells stay
+NaN) and keeps FmtValue in an optional parallel object array. The DataFrame
+is built in one shot from those arrays.
+
+Both axes become a pandas MultiIndex with one level per hierarchy, coded
+by member unique name (axis_index); captions are kept as a lookup in
+df.attrs["captions"] and joined for display only (flat_labels).
+"""
+import numpy as np
+import pandas as pd
+
+from cubes import xml_backend
+from cubes.type_decoding import XSI_NS, XSI_TYPE, decode_typed_cells
+
+MDDATASET_NS = "urn:schemas-microsoft-com:xml-analysis:mddataset"
+_NS = f"{{{MDDATASET_NS}}}"
+
+AXIS_TAG = f"{_NS}Axis"
+TUPLE_TAG = f"{_NS}Tuple"
+MEMBER_TAG = f"{_NS}Member"
+CELL_DATA_TAG = f"{_NS}CellData"
+CELL_TAG = f"{_NS}Cell"
+CAPTION_TAG = f"{_NS}Caption"
+UNAME_TAG = f"{_NS}UName"
+VALUE_TAG = f"{_NS}Value"
+FMT_VALUE_TAG = f"{_NS}FmtValue"
+
+
+def member_label(caption, uname, index, is_row):
+    """Display label for a member: Caption, else the last part of UName"""
+    if caption:
+        return caption
+    if uname:
+        parts = uname.split(".")
+        if len(parts) >= 2:
+            label = parts[-1].replace("]", "")
+            return label.replace("&amp;", "") if is_row else label
+        return uname
+    return f"Dimension_{index}" if is_row else None
+
+
+def read_member(member_elem):
+    """(hierarchy, caption, unique_name) of a Member element"""
+    return member_elem.get("Hierarchy"), member_elem.findtext(CAPTION_TAG), member_elem.findtext(UNAME_TAG)
+
+
+def read_cell(cell_elem):
+    """(ordinal, value_text, fmt_value_text, xsi_type) of a Cell element"""
+    value = cell_elem.find(VALUE_TAG)
+    if value is None:
+        return int(cell_elem.get("CellOrdinal", 0)), None, cell_elem.findtext(FMT_VALUE_TAG), None
+    return int(cell_elem.get("CellOrdinal", 0)), value.text, cell_elem.findtext(FMT_VALUE_TAG), value.get(XSI_TYPE)
+
+
+_XPATH_NS = {"m": MDDATASET_NS, "xsi": XSI_NS}
+_CELL_COUNT_XPATH = xml_backend.compile_xpath("count(m:Cell)", _XPATH_NS)
+_CELL_COLUMN_XPATHS = [
+    xml_backend.compile_xpath(expr, _XPATH_NS)
+    for expr in ("m:Cell/@CellOrdinal", "m:Cell/m:Value/text()",
+                 "m:Cell/m:Value/@xsi:type", "m:Cell/m:FmtValue/text()")
+]
+
+
+def read_cell_columns(cell_data):
+    """Column-wise read of a CellData element: (ordinals, value_texts, fmt_value_texts, xsi_types)"""
+    if cell_data is None:
+        return np.empty(0, dtype=np.int64), [], [], []
+    if _CELL_COLUMN_XPATHS[0] is not None:
+        # lxml: pull each column with one XPath. The columns line up only if
+        # every Cell has exactly one Value (with text and type) and FmtValue;
+        # otherwise fall through to the per-cell walk.
+        ordinals, value_texts, value_types, fmt_texts = [xpath(cell_data) for xpath in _CELL_COLUMN_XPATHS]
+        cell_count = int(_CELL_COUNT_XPATH(cell_data))
+        if len(value_texts) == len(value_types) == len(fmt_texts) == len(ordinals) == cell_count:
+            return np.array(ordinals, dtype=np.int64), value_texts, fmt_texts, value_types
+    cells = cell_data.findall(CELL_TAG)
+    ordinals = np.array([cell.get("CellOrdinal", "0") for cell in cells], dtype=np.int64)
+    values = [cell.find(VALUE_TAG) for cell in cells]
+    value_texts = [value.text if value is not None else None for value in values]
+    value_types = [value.get(XSI_TYPE) if value is not None else None for value in values]
+    fmt_texts = [cell.findtext(FMT_VALUE_TAG) for cell in cells]
+    return ordinals, value_texts, fmt_texts, value_types
+
+
+_TUPLE_COUNT_XPATH = xml_backend.compile_xpath("count(m:Tuples/m:Tuple)", _XPATH_NS)
+_MEMBER_COUNT_XPATH = xml_backend.compile_xpath("count(m:Tuples/m:Tuple/m:Member)", _XPATH_NS)
+_MEMBER_COLUMN_XPATHS = [
+    xml_backend.compile_xpath(expr, _XPATH_NS)
+    for expr in ("m:Tuples/m:Tuple/m:Member/@Hierarchy", "m:Tuples/m:Tuple/m:Member/m:Caption/text()",
+                 "m:Tuples/m:Tuple/m:Member/m:UName/text()")
+]
+
+
+def read_axis_tuples(axis_elem):
+    """[[(hierarchy, caption, uname), ...] per tuple] for one Axis element"""
+    if _TUPLE_COUNT_XPATH is not None:
+        # lxml: same column-wise fast path as read_cell_columns, valid when
+        # every Member has a Hierarchy, Caption and UName
+        tuple_count = int(_TUPLE_COUNT_XPATH(axis_elem))
+        member_count = int(_MEMBER_COUNT_XPATH(axis_elem))
+        hierarchies, captions, unames = [xpath(axis_elem) for xpath in _MEMBER_COLUMN_XPATHS]
+        if (tuple_count and len(hierarchies) == len(captions) == len(unames) == member_count
+                and member_count % tuple_count == 0):
+            width = member_count // tuple_count
+            members = list(zip(hierarchies, captions, unames))
+            return [members[start:start + width] for start in range(0, len(members), width)]
+    return [
+        [read_member(m) for m in tuple_elem.iter(MEMBER_TAG)]
+        for tuple_elem in axis_elem.iter(TUPLE_TAG)
+    ]
+
+
+def read_axes(data_root):
+    """{axis_name: [[(hierarchy, caption, uname), ...] per tuple]} from an mddataset root"""
+    return {axis.get("name"): read_axis_tuples(axis) for axis in data_root.iter(AXIS_TAG)}
+
+
+def tuple_labels(tuples, is_row):
+    """One ' - '-joined label per tuple (matching the preview's Row_Label / header text)"""
+    labels = []
+    for members in tuples:
+        parts = [member_label(caption, uname, i, is_row) for i, (_, caption, uname) in enumerate(members)]
+        parts = [p for p in parts if p]
+        if parts:
+            labels.append(" - ".join(parts))
+        else:
+            labels.append("All" if is_row else "Measure")
+    return labels
+
+
+def axis_index(tuples, is_row):
+    """
+    pandas MultiIndex for an axis: one level per hierarchy, built with
+    pd.factorize over member unique names (so each member is stored once
+    and every tuple is just a row of integer codes). Returns
+    (index, captions) where captions maps unique name -> display caption.
+    """
+    width = max((len(members) for members in tuples), default=0)
+    if width == 0:
+        fallback = "All" if is_row else "Measure"
+        return pd.MultiIndex.from_arrays([[fallback] * len(tuples)], names=[None]), {fallback: fallback}
+
+    captions = {}
+    codes, levels, names = [], [], []
+    for position in range(width):
+        keys = []
+        name = None
+        for members in tuples:
+            if position < len(members):
+                hierarchy, caption, uname = members[position]
+            else:
+                hierarchy, caption, uname = None, None, None
+            label = member_label(caption, uname, position, is_row) or ""
+            key = uname or label
+            if key not in captions:
+                captions[key] = label
+            keys.append(key)
+            name = name or hierarchy
+        level_codes, uniques = pd.factorize(np.array(keys, dtype=object))
+        codes.append(level_codes)
+        levels.append(pd.Index(uniques, dtype=object))
+        names.append(name or f"Level_{position}")
+    index = pd.MultiIndex(levels=levels, codes=codes, names=names, verify_integrity=False)
+    return index, captions
+
+
+def flat_labels(index, captions=None, sep=" - "):
+    """
+    Display text per entry of a (Multi)Index: level captions joined with sep,
+    mapped once per level and then gathered through the codes.
+    """
+    if not isinstance(index, pd.MultiIndex):
+        return [str(value) for value in index]
+    captions = captions or {}
+    per_level = []
+    for level, level_codes in zip(index.levels, index.codes):
+        text = np.array([captions.get(key, str(key)) for key in level], dtype=object)
+        per_level.append(text[level_codes] if len(text) else np.full(len(level_codes), "", dtype=object))
+    if len(per_level) == 1:
+        return list(per_level[0])
+    return [sep.join(part for part in parts if part) for parts in zip(*per_level)]
+
+
+class CellsetBuilder:
+    """Accumulates cells by ordinal into preallocated (rows x columns) arrays"""
+
+    def __init__(self, n_rows, n_columns, keep_formatted=True, max_rows=None):
+        self.n_columns = max(n_columns, 1)
+        self.n_rows = n_rows if max_rows is None else min(n_rows, max_rows)
+        self.size = self.n_rows * self.n_columns
+        self.values = np.full(self.size, np.nan, dtype=np.float64)
+        self.formatted = np.full(self.size, np.nan, dtype=object) if keep_formatted else None
+        self.max_ordinal = -1  # highest CellOrdinal seen, including dropped ones
+
+    def _ensure_object_values(self):
+        if self.values.dtype != object:
+            self.values = self.values.astype(object)
+
+    def add_cells(self, cells):
+        """cells: iterable of (ordinal, value_text, fmt_value_text, xsi_type)"""
+        if cells:
+            self.add_columns(*zip(*cells))
+
+    def add_columns(self, ordinals, value_texts, fmt_texts, value_types=None):
+        """
+        Column-wise form of add_cells: parallel sequences of ordinals, Value
+        text, FmtValue text and the Value's xsi:type (decoded in bulk).
+        """
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        self._see(ordinals)
+        in_range = (ordinals >= 0) & (ordinals < self.size)
+        if not in_range.all():
+            # Rows beyond max_rows (or malformed ordinals) are dropped
+            keep = np.flatnonzero(in_range)
+            ordinals = ordinals[keep]
+            value_texts = [value_texts[i] for i in keep]
+            fmt_texts = [fmt_texts[i] for i in keep]
+            if value_types is not None:
+                value_types = [value_types[i] for i in keep]
+        if len(ordinals) == 0:
+            return
+
+        formatted = None
+        if self.formatted is not None:
+            # No FmtValue: show the raw value text instead
+            formatted = np.array([f if f is not None else v for f, v in zip(fmt_texts, value_texts)], dtype=object)
+        if value_types is None:
+            value_types = [None] * len(value_texts)
+        self.put(ordinals, decode_typed_cells(value_texts, value_types), formatted)
+
+    def put(self, ordinals, values, formatted=None):
+        """Scatter already-decoded values (and optional display text) to their ordinals"""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        self._see(ordinals)
+        values = np.asarray(values)
+        in_range = (ordinals >= 0) & (ordinals < self.size)
+        if not in_range.all():
+            ordinals = ordinals[in_range]
+            values = values[in_range]
+            if formatted is not None:
+                formatted = np.asarray(formatted, dtype=object)[in_range]
+        if values.dtype.kind not in "fiu":
+            inferred = pd.Series(values, dtype=object).infer_objects()
+            if inferred.dtype.kind in "fiu":
+                values = inferred.to_numpy(dtype=np.float64)
+            else:
+                self._ensure_object_values()
+        self.values[ordinals] = values
+        if formatted is not None and self.formatted is not None:
+            self.formatted[ordinals] = formatted
+
+    def _see(self, ordinals):
+        if len(ordinals):
+            self.max_ordinal = max(self.max_ordinal, int(ordinals.max()))
+
+    def complete_rows(self):
+        """
+        Rows that can no longer change. Servers send cells in CellOrdinal
+        order, so every row before the one holding the highest ordinal seen
+        is final (its missing cells are empty, not late).
+        """
+        if not self.n_columns:
+            return self.n_rows
+        return min(self.n_rows, (self.max_ordinal + 1) // self.n_columns)
+
+    def value_matrix(self):
+        return self.values.reshape(self.n_rows, self.n_columns)
+
+    def formatted_matrix(self):
+        if self.formatted is None:
+            return None
+        return self.formatted.reshape(self.n_rows, self.n_columns)
+
+    def to_dataframe(self, index, columns, formatted=False, rows=None):
+        """
+        One-shot DataFrame; formatted=True uses FmtValue text where available.
+        rows (a slice) limits it to those rows; index must already match them.
+        """
+        matrix = self.formatted_matrix() if formatted and self.formatted is not None else self.value_matrix()
+        if rows is not None:
+            matrix = matrix[rows]
+        if len(columns) != self.n_columns:
+            columns = [f"Column_{i}" for i in range(self.n_columns)]
+        return pd.DataFrame(matrix, index=index[:len(matrix)], columns=columns)
+
+
+def cellset_frame(builder, row_tuples, column_tuples, formatted=False, rows=None):
+    """
+    DataFrame with a MultiIndex on rows (Axis1) and columns (Axis0), one
+    level per hierarchy. df.attrs["captions"] maps member unique names to
+    captions; use flat_labels() for display text. rows (a slice) builds just
+    those rows, e.g. the ones completed so far while streaming.
+    """
+    if rows is not None:
+        row_tuples = row_tuples[rows]
+    row_index, captions = axis_index(row_tuples, is_row=True)
+    column_index, column_captions = axis_index(column_tuples, is_row=False)
+    captions.update(column_captions)
+    df = builder.to_dataframe(row_index, column_index, formatted=formatted, rows=rows)
+    df.attrs["captions"] = captions
+    return df
+
+
+def flat_frame(df):
+    """
+    Tabular form of a cellset frame, as the Queries tab shows MDX results:
+    one caption column per row hierarchy, then one column per column tuple.
+    """
+    captions = df.attrs.get("captions") or {}
+    flat = pd.DataFrame(df.to_numpy(), columns=flat_labels(df.columns, captions))
+    if isinstance(df.index, pd.MultiIndex):
+        for position, name in enumerate(df.index.names):
+            keys = df.index.get_level_values(position)
+            flat.insert(position, name or f"Level_{position}", [captions.get(key, key) for key in keys],
+                        allow_duplicates=True)
+    return flat
+
+
+def cellset_to_dataframe(data_root, formatted=False, max_rows=None):
+    """
+    Build the preview DataFrame (see cellset_frame) from a parsed mddataset
+    root element. A single-axis result becomes one row per Axis0 tuple with
+    a 'Value' column.
+    """
+    axes = read_axes(data_root)
+    ordinals, value_texts, fmt_texts, value_types = read_cell_columns(data_root.find(CELL_DATA_TAG))
+    column_tuples = axes.get("Axis0", [])
+    row_tuples = axes.get("Axis1")
+
+    if row_tuples is None:
+        if not column_tuples:
+            return pd.DataFrame()
+        builder = CellsetBuilder(len(column_tuples), 1, keep_formatted=formatted, max_rows=max_rows)
+        builder.add_columns(ordinals, value_texts, fmt_texts, value_types)
+        return cellset_frame(builder, column_tuples, [[(None, "Value", "Value")]], formatted=formatted)
+
+    if not row_tuples:
+        return pd.DataFrame()
+    builder = CellsetBuilder(len(row_tuples), len(column_tuples), keep_formatted=formatted, max_rows=max_rows)
+    builder.add_columns(ordinals, value_texts, fmt_texts, value_types)
+    return cellset_frame(builder, row_tuples, column_tuples, formatted=formatted)
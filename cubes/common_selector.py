@@ -4,6 +4,66 @@ from tkinter import ttk
 from common import append_log
 from cubes.cube_data_queries import run_xmla_query, CATALOG_QUERY, CUBE_QUERY_TEMPLATE
 from cubes.cube_data_parsers import parse_catalogs, parse_cubes
+from cubes.xmla_async import iter_xmla_completed
+from api.catalog_registry import get_registry
+from api.request_timing import operation
+
+PLACEHOLDER = "Select Catalog || Cube"
+
+
+def catalog_combinations(cat_dict, cube_xml, log):
+    """Combination dicts for one catalog's cube response (empty on failure)"""
+    cat_name = cat_dict['name']
+    cat_guid = cat_dict['guid']
+    results = []
+    try:
+        if isinstance(cube_xml, Exception):
+            raise cube_xml
+        cube_dicts = parse_cubes(cube_xml)
+        
+        for cube_dict in cube_dicts:
+            cube_name = cube_dict['name']
+            cube_guid = cube_dict['guid']
+            
+            display_text = f"{cat_name} || {cube_name}"
+            results.append({
+                'display': display_text,
+                'catalog_name': cat_name,
+                'cube_name': cube_name,
+                'catalog_guid': cat_guid,
+                'cube_guid': cube_guid
+            })
+        
+        log(f"Found {len(cube_dicts)} cubes in {cat_name}")
+    except Exception as e:
+        log(f"Error fetching cubes for {cat_name}: {e}")
+    return results
+
+
+@operation("cube discovery")
+def discover_catalog_cubes(publish, log):
+    """
+    Registry loader for "catalogs" (see api/catalog_registry.py): fetch the
+    catalogs, then fan out one cube query per catalog on the bounded
+    xmla_async pool. publish() gets the list so far, in catalog order, each
+    time a catalog resolves; a failed catalog is logged and skipped.
+    """
+    log("Loading catalogs...")
+    cat_xml = run_xmla_query(CATALOG_QUERY)
+    catalog_dicts = parse_catalogs(cat_xml)
+    log(f"Catalogs retrieved: {len(catalog_dicts)}")
+    
+    log(f"Loading cubes for {len(catalog_dicts)} catalogs...")
+    catalog_results = {}  # catalog position -> list of combination dicts
+    results = []
+    responses = iter_xmla_completed(
+        CUBE_QUERY_TEMPLATE.format(catalog=cat_dict['name']) for cat_dict in catalog_dicts
+    )
+    for index, cube_xml in responses:
+        catalog_results[index] = catalog_combinations(catalog_dicts[index], cube_xml, log)
+        results = [combo for position in sorted(catalog_results) for combo in catalog_results[position]]
+        publish(results)
+    return results
 
 class CatalogCubeSelector:
     def __init__(self, parent, log_ref_container, on_selection_change=None):
@@ -15,6 +75,7 @@ class CatalogCubeSelector:
         self.current_catalog_guid = ""
         self.current_cube_guid = ""
         self.available_combinations = []  # List of dicts
+        self._unsubscribe = None
         
         self.create_selector()
         self.load_initial_data()
@@ -23,7 +84,7 @@ class CatalogCubeSelector:
         """Create the combobox selector"""
         self.selector_var = tk.StringVar()
         self.selector = ttk.Combobox(self.parent, textvariable=self.selector_var, state="readonly")
-        self.selector["values"] = ["Select Catalog || Cube"]
+        self.selector["values"] = [PLACEHOLDER]
         self.selector.current(0)
         self.selector.bind("<<ComboboxSelected>>", self._on_select)
     
@@ -42,7 +103,7 @@ class CatalogCubeSelector:
     def _on_select(self, event):
         """Handle selection changes"""
         choice = self.selector_var.get()
-        if choice == "Select Catalog || Cube":
+        if choice == PLACEHOLDER:
             self.current_catalog = ""
             self.current_cube = ""
             self.current_catalog_guid = ""
@@ -78,54 +139,45 @@ class CatalogCubeSelector:
             self.on_selection_change(catalog, cube)
     
     def load_initial_data(self):
-        """Load initial catalog and cube data with GUIDs"""
+        """
+        Show the shared catalog -> cube list (api/catalog_registry.py). The
+        first selector starts discovery in the background, the others join
+        it; cubes appear in the combobox as each catalog resolves.
+        """
+        registry = get_registry()
+        if self._unsubscribe is None:
+            self._unsubscribe = registry.subscribe("catalogs", self._on_registry_update, log=self._log)
+            self.selector.bind("<Destroy>", lambda event: self._unsubscribe(), add="+")
+        registry.ensure("catalogs")
+    
+    def _post(self, func, *args):
+        """Run func(*args) on the Tk thread"""
         try:
-            append_log(self.log_ref_container[0], "Loading catalogs...")
-            cat_xml = run_xmla_query(CATALOG_QUERY)
-            catalog_dicts = parse_catalogs(cat_xml)
-            append_log(self.log_ref_container[0], f"Catalogs retrieved: {len(catalog_dicts)}")
-        except Exception as e:
-            append_log(self.log_ref_container[0], f"Error fetching catalogs: {e}")
+            self.selector.after(0, func, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Window is gone
+    
+    def _log(self, message):
+        self._post(append_log, self.log_ref_container[0], message)
+    
+    def _on_registry_update(self, entry):
+        self._post(self._show_catalogs, entry)
+    
+    def _show_catalogs(self, entry):
+        """Tk thread: show the catalog list as published by the registry"""
+        if entry.data is not None:
+            self.available_combinations = entry.data
+            self.selector["values"] = [PLACEHOLDER] + [r['display'] for r in self.available_combinations]
+        if not entry.complete:
             return
-
-        results = []
-        for cat_dict in catalog_dicts:
-            cat_name = cat_dict['name']
-            cat_guid = cat_dict['guid']
-            
-            try:
-                append_log(self.log_ref_container[0], f"Loading cubes for catalog: {cat_name}")
-                cube_xml = run_xmla_query(CUBE_QUERY_TEMPLATE.format(catalog=cat_name))
-                cube_dicts = parse_cubes(cube_xml)
-                
-                for cube_dict in cube_dicts:
-                    cube_name = cube_dict['name']
-                    cube_guid = cube_dict['guid']
-                    
-                    display_text = f"{cat_name} || {cube_name}"
-                    results.append({
-                        'display': display_text,
-                        'catalog_name': cat_name,
-                        'cube_name': cube_name,
-                        'catalog_guid': cat_guid,
-                        'cube_guid': cube_guid
-                    })
-                
-                append_log(self.log_ref_container[0], f"Found {len(cube_dicts)} cubes in {cat_name}")
-            except Exception as e:
-                append_log(self.log_ref_container[0], f"Error fetching cubes for {cat_name}: {e}")
-
-        if not results:
+        if entry.error is not None:
+            append_log(self.log_ref_container[0], f"Error fetching catalogs: {entry.error}")
+        elif not self.available_combinations:
             append_log(self.log_ref_container[0], "No cubes found.")
-            return
-
-        self.available_combinations = results
-        display_values = ["Select Catalog || Cube"] + [r['display'] for r in results]
-        self.selector["values"] = display_values
-        self.selector.current(0)
-        append_log(self.log_ref_container[0], f"Loaded {len(results)} catalog-cube combinations with GUIDs")
-        
-        
+        else:
+            append_log(self.log_ref_container[0],
+                       f"Loaded {len(self.available_combinations)} catalog-cube combinations with GUIDs")
+    
     def refresh_data(self):
-        """Refresh the catalog-cube data"""
-        self.load_initial_data()
\ No newline at end of file
+        """Refresh the catalog-cube data (for every selector)"""
+        get_registry().refresh("catalogs")
\ No newline at end of file
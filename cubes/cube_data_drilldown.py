@@ -2,88 +2,31 @@
 import pandas as pd
 import tkinter as tk
 from tkinter import ttk
-from cubes.cube_data_queries import run_xmla_query, build_xmla_request
-from cubes.cube_data_parsers import parse_xmla_result_to_dataframe
+from cubes.cube_data_queries import build_xmla_request
+from cubes.xmla_stream import read_cellset_streaming
+from api.request_timing import operation
 
-def get_hierarchy_levels_fallback(hierarchy_unique_name, levels_df):
-    """Fallback method to get levels if LEVEL_NUMBER is not available"""
-    if levels_df is not None and not levels_df.empty:
-        hierarchy_levels = levels_df[
-            (levels_df['HIERARCHY_UNIQUE_NAME'] == hierarchy_unique_name)
-        ]
-        
-        # If LEVEL_NUMBER is not available, try to infer order from LEVEL_UNIQUE_NAME
-        if 'LEVEL_NUMBER' not in hierarchy_levels.columns or hierarchy_levels['LEVEL_NUMBER'].isna().all():
-            # Create a temporary ordering based on row order or level name pattern
-            hierarchy_levels = hierarchy_levels.reset_index(drop=True)
-            hierarchy_levels['_inferred_order'] = hierarchy_levels.index
-            
-            # Try to detect natural hierarchy order
-            all_levels = hierarchy_levels.to_dict('records')
-            return sorted(all_levels, key=lambda x: x.get('_inferred_order', 0))
-        
-        return hierarchy_levels.to_dict('records')
-    return []
+def get_hierarchy_levels(hierarchy_unique_name, metadata_index):
+    """Get all levels for a hierarchy, sorted by level number (see CubeMetadataIndex.levels_of)"""
+    if metadata_index is None:
+        return []
+    return metadata_index.levels_of(hierarchy_unique_name)
 
-def get_hierarchy_levels(hierarchy_unique_name, levels_df):
-    """Get all levels for a hierarchy, sorted by level number with fallback"""
-    if levels_df is not None and not levels_df.empty:
-        hierarchy_levels = levels_df[
-            (levels_df['HIERARCHY_UNIQUE_NAME'] == hierarchy_unique_name)
-        ]
-        
-        # Check if LEVEL_NUMBER exists and has valid data
-        if 'LEVEL_NUMBER' in hierarchy_levels.columns and not hierarchy_levels['LEVEL_NUMBER'].isna().all():
-            try:
-                # Convert to integer and sort
-                hierarchy_levels = hierarchy_levels.copy()
-                hierarchy_levels['LEVEL_NUMBER'] = hierarchy_levels['LEVEL_NUMBER'].astype(int)
-                hierarchy_levels = hierarchy_levels.sort_values('LEVEL_NUMBER')
-                return hierarchy_levels.to_dict('records')
-            except (ValueError, TypeError):
-                # If conversion fails, use fallback
-                pass
-        
-        # Use fallback ordering
-        return get_hierarchy_levels_fallback(hierarchy_unique_name, levels_df)
-    return []
-
-def get_current_level_info(current_hierarchy, levels_df):
+def get_current_level_info(current_hierarchy, metadata_index):
     """Get information about the current level being displayed"""
-    if not current_hierarchy:
+    if not current_hierarchy or metadata_index is None:
         return None
         
     # Extract level unique name from current hierarchy reference
     # Format: [Dimension].[Hierarchy].[Level].Members
     level_unique_name = current_hierarchy.replace('.Members', '')
-    
-    # Find this level in our levels_df
-    if levels_df is not None and not levels_df.empty:
-        matching_levels = levels_df[levels_df['LEVEL_UNIQUE_NAME'] == level_unique_name]
-        if not matching_levels.empty:
-            return matching_levels.iloc[0].to_dict()
-    
-    return None
+    return metadata_index.level(level_unique_name)
 
-def get_next_level_info(current_level_info, levels_df):
+def get_next_level_info(current_level_info, metadata_index):
     """Get the next level in the hierarchy"""
-    if not current_level_info:
-        return None
-        
-    hierarchy_unique_name = current_level_info['HIERARCHY_UNIQUE_NAME']
-    all_levels = get_hierarchy_levels(hierarchy_unique_name, levels_df)
-    
-    if not all_levels:
+    if not current_level_info or metadata_index is None:
         return None
-        
-    # Find current level and get next one
-    for i, level in enumerate(all_levels):
-        if level['LEVEL_UNIQUE_NAME'] == current_level_info['LEVEL_UNIQUE_NAME']:
-            if i + 1 < len(all_levels):
-                return all_levels[i + 1]
-            break
-            
-    return None
+    return metadata_index.next_level(current_level_info['LEVEL_UNIQUE_NAME'])
 
 def build_drilldown_mdx(current_hierarchies, current_measures, 
                     selected_member_caption, current_level_info, next_level_info, cube):
@@ -196,7 +139,7 @@ def build_nested_drilldown_mdx(base_mdx, current_hierarchies, current_measures,
     
     return MDX_QUERY
 
-def drill_down_selection(result_tree, query_history, current_query_index, levels_df, 
+def drill_down_selection(result_tree, query_history, current_query_index, metadata_index, 
                         current_hierarchies, current_measures, current_catalog, current_cube,
                         log_function):
     """Drill down into the selected hierarchy member"""
@@ -220,12 +163,12 @@ def drill_down_selection(result_tree, query_history, current_query_index, levels
         log_function(f"Current hierarchies: {current_query['hierarchies']}")
         
         # For now, drill down on the first hierarchy
-        if current_query['hierarchies'] and levels_df is not None:
+        if current_query['hierarchies'] and metadata_index is not None:
             current_hierarchy = current_query['hierarchies'][0]
             
             # Get current level information
-            current_level_info = get_current_level_info(current_hierarchy, levels_df)
-            next_level_info = get_next_level_info(current_level_info, levels_df)
+            current_level_info = get_current_level_info(current_hierarchy, metadata_index)
+            next_level_info = get_next_level_info(current_level_info, metadata_index)
             
             if current_level_info and next_level_info:
                 log_function(f"Drilling down from level: {current_level_info['LEVEL_CAPTION']}")
@@ -289,8 +232,8 @@ def drill_down_selection(result_tree, query_history, current_query_index, levels
                 log_function("Executing drill-down query...")
                 
                 # Execute drill-down query
-                response = run_xmla_query(XMLA_REQUEST)
-                df = parse_xmla_result_to_dataframe(response)
+                with operation("MDX drilldown"):
+                    df = read_cellset_streaming(XMLA_REQUEST)
                 
                 if not df.empty:
                     # Limit to first 1000 rows
@@ -346,8 +289,8 @@ def drill_up_selection(query_history, current_query_index,
         log_function(f"Executing previous query...")
         
         # Execute query
-        response = run_xmla_query(XMLA_REQUEST)
-        df = parse_xmla_result_to_dataframe(response)
+        with operation("MDX drilldown"):
+            df = read_cellset_streaming(XMLA_REQUEST)
         
         if not df.empty:
             # Limit to first 1000 rows
@@ -1,55 +1,90 @@
 # tabs/cube_data_metadata.py
 import pandas as pd
-from cubes.cube_data_queries import run_xmla_query, DIMENSIONS_QUERY, HIERARCHIES_QUERY, LEVELS_QUERY, MEASURES_QUERY
+from cubes.cube_data_queries import (DIMENSIONS_QUERY, HIERARCHIES_QUERY, LEVELS_QUERY, MEASURES_QUERY,
+                                     CUBE_VERSION_QUERY, run_xmla_query)
 from cubes.cube_data_parsers import parse_rows
+from cubes.xmla_async import run_xmla_batch
+from api.metadata_cache import load_cached
+from api.request_timing import operation, phase
 
-def load_cube_metadata(catalog, cube, log_function):
-    """Load all metadata for the selected cube"""
-    dimensions_df = None
-    hierarchies_df = None  
-    levels_df = None
-    measures_df = None
-    dimension_mapping = {}
-    measure_mapping = {}
+# rowset name -> (DISCOVER query, columns); the order is the order load_cube_metadata returns them in
+METADATA_ROWSETS = {
+    "dimensions": (DIMENSIONS_QUERY, ["DIMENSION_UNIQUE_NAME", "DIMENSION_CAPTION", "DEFAULT_HIERARCHY"]),
+    # Hierarchies - NOW INCLUDING HIERARCHY_CAPTION
+    "hierarchies": (HIERARCHIES_QUERY, ["DIMENSION_UNIQUE_NAME", "HIERARCHY_NAME", "HIERARCHY_UNIQUE_NAME", "HIERARCHY_CAPTION", "HIERARCHY_DISPLAY_FOLDER"]),
+    "levels": (LEVELS_QUERY, ["DIMENSION_UNIQUE_NAME", "HIERARCHY_UNIQUE_NAME", "LEVEL_NAME", "LEVEL_UNIQUE_NAME", "LEVEL_CAPTION", "LEVEL_NUMBER"]),
+    "measures": (MEASURES_QUERY, ["MEASURE_NAME", "MEASURE_UNIQUE_NAME", "MEASURE_CAPTION", "MEASURE_DISPLAY_FOLDER"]),
+}
+
+def parse_schema_version(xml_response):
+    """LAST_SCHEMA_UPDATE from a CUBE_VERSION_QUERY response (None if the server doesn't report it)"""
+    df = parse_rows(xml_response, ["CUBE_NAME", "LAST_SCHEMA_UPDATE"])
+    if df.empty:
+        return None
+    return df["LAST_SCHEMA_UPDATE"].iloc[0] or None
+
+def fetch_schema_version(catalog, cube):
+    """One round trip: the cube's current schema version"""
+    return parse_schema_version(run_xmla_query(CUBE_VERSION_QUERY.format(catalog=catalog, cube_name=cube)))
+
+def fetch_cube_metadata(catalog, cube, log_function):
+    """
+    Run the four DISCOVER queries (plus the schema version) concurrently.
+    Returns (version, {rowset name: DataFrame}, complete) for load_cached.
+    """
+    log_function(f"Loading dimensions, hierarchies, levels and measures for {cube}...")
+    version_xml, *responses = run_xmla_batch(
+        [CUBE_VERSION_QUERY.format(catalog=catalog, cube_name=cube)] +
+        [query.format(catalog=catalog, cube_name=cube) for query, _ in METADATA_ROWSETS.values()]
+    )
+    for response in responses:
+        if isinstance(response, Exception):
+            raise response
     
+    frames = {}
+    for (name, (_, columns)), response in zip(METADATA_ROWSETS.items(), responses):
+        with phase("parse"):
+            frames[name] = parse_rows(response, columns)
+        log_function(f"Loaded {len(frames[name])} {name}")
+    
+    version = None if isinstance(version_xml, Exception) else parse_schema_version(version_xml)
+    # A cube without any of these is a failed or partial load - don't cache it
+    complete = all(not df.empty for df in frames.values())
+    return version, frames, complete
+
+def _metadata_result(frames):
+    return tuple(frames[name] for name in METADATA_ROWSETS) + ({}, {})
+
+@operation("metadata load")
+def load_cube_metadata(catalog, cube, log_function, on_refresh=None):
+    """
+    Load all metadata for the selected cube. Metadata seen before comes
+    from the on-disk cache (api/metadata_cache.py) and is revalidated in the
+    background; if it changed on the server, on_refresh(result) is called
+    from that background thread with the same tuple this returns.
+    """
     try:
-        # Clear previous mappings
-        dimension_mapping.clear()
-        measure_mapping.clear()
+        refresh = None
+        if on_refresh is not None:
+            refresh = lambda frames: on_refresh(_metadata_result(frames))
         
-        # Load dimensions
-        log_function(f"Loading dimensions for {cube}...")
-        dim_xml = run_xmla_query(DIMENSIONS_QUERY.format(catalog=catalog, cube_name=cube))
-        dimensions_df = parse_rows(dim_xml, ["DIMENSION_UNIQUE_NAME", "DIMENSION_CAPTION", "DEFAULT_HIERARCHY"])
-        log_function(f"Loaded {len(dimensions_df)} dimensions")
-        
-        # Load hierarchies - NOW INCLUDING HIERARCHY_CAPTION
-        log_function(f"Loading hierarchies for {cube}...")
-        hier_xml = run_xmla_query(HIERARCHIES_QUERY.format(catalog=catalog, cube_name=cube))
-        hierarchies_df = parse_rows(hier_xml, ["DIMENSION_UNIQUE_NAME", "HIERARCHY_NAME", "HIERARCHY_UNIQUE_NAME", "HIERARCHY_CAPTION", "HIERARCHY_DISPLAY_FOLDER"])
-        log_function(f"Loaded {len(hierarchies_df)} hierarchies")
-        
-        # Load levels
-        log_function(f"Loading levels for {cube}...")
-        levels_xml = run_xmla_query(LEVELS_QUERY.format(catalog=catalog, cube_name=cube))
-        levels_df = parse_rows(levels_xml, ["DIMENSION_UNIQUE_NAME", "HIERARCHY_UNIQUE_NAME", "LEVEL_NAME", "LEVEL_UNIQUE_NAME", "LEVEL_CAPTION", "LEVEL_NUMBER"])
-        log_function(f"Loaded {len(levels_df)} levels")
-        
-        # Load measures
-        log_function(f"Loading measures for {cube}...")
-        measures_xml = run_xmla_query(MEASURES_QUERY.format(catalog=catalog, cube_name=cube))
-        measures_df = parse_rows(measures_xml, ["MEASURE_NAME", "MEASURE_UNIQUE_NAME", "MEASURE_CAPTION", "MEASURE_DISPLAY_FOLDER"])
-        log_function(f"Loaded {len(measures_df)} measures")
+        frames = load_cached(
+            "cube_metadata", catalog, cube,
+            fetch=lambda: fetch_cube_metadata(catalog, cube, log_function),
+            fetch_version=lambda: fetch_schema_version(catalog, cube),
+            log=log_function,
+            on_refresh=refresh,
+        )
         
         log_function(f"Successfully loaded metadata for {cube}")
         
-        return dimensions_df, hierarchies_df, levels_df, measures_df, dimension_mapping, measure_mapping
+        return _metadata_result(frames)
         
     except Exception as e:
         log_function(f"Error loading cube metadata: {e}")
         return None, None, None, None, {}, {}
 
-def populate_listboxes(dimensions_listbox, measures_listbox, dimensions_df, hierarchies_df, levels_df, measures_df, dimension_mapping, measure_mapping):
+def populate_listboxes(dimensions_listbox, measures_listbox, metadata_index, measures_df, dimension_mapping, measure_mapping):
     """Populate the dimensions and measures listboxes with hierarchies and levels"""
     dimensions_listbox.delete(0, 'end')
     measures_listbox.delete(0, 'end')
@@ -59,33 +94,13 @@ def populate_listboxes(dimensions_listbox, measures_listbox, dimensions_df, hier
     measure_mapping.clear()
     
     # Build structure: Dimension -> Hierarchy -> Levels
-    if (dimensions_df is not None and not dimensions_df.empty and 
-        hierarchies_df is not None and not hierarchies_df.empty and
-        levels_df is not None and not levels_df.empty):
+    if metadata_index is not None and metadata_index.dimensions and metadata_index.dimension_names():
         
         # Get dimension captions
-        dim_captions = {}
-        for _, dim_row in dimensions_df.iterrows():
-            dim_captions[dim_row['DIMENSION_UNIQUE_NAME']] = dim_row['DIMENSION_CAPTION']
-        
-        # Group hierarchies by dimension
-        dimension_hierarchies = {}
-        for _, hierarchy_row in hierarchies_df.iterrows():
-            dim_unique_name = hierarchy_row['DIMENSION_UNIQUE_NAME']
-            if dim_unique_name not in dimension_hierarchies:
-                dimension_hierarchies[dim_unique_name] = []
-            dimension_hierarchies[dim_unique_name].append(hierarchy_row)
-        
-        # Group levels by hierarchy
-        hierarchy_levels = {}
-        for _, level_row in levels_df.iterrows():
-            hierarchy_name = level_row['HIERARCHY_UNIQUE_NAME']
-            if hierarchy_name not in hierarchy_levels:
-                hierarchy_levels[hierarchy_name] = []
-            hierarchy_levels[hierarchy_name].append(level_row)
+        dim_captions = {row['DIMENSION_UNIQUE_NAME']: row['DIMENSION_CAPTION'] for row in metadata_index.dimensions}
         
         # Build the tree structure
-        for dim_unique_name, hierarchies in dimension_hierarchies.items():
+        for dim_unique_name in metadata_index.dimension_names():
             dim_caption = dim_captions.get(dim_unique_name, dim_unique_name)
             
             # Add dimension as a header (non-selectable)
@@ -96,7 +111,7 @@ def populate_listboxes(dimensions_listbox, measures_listbox, dimensions_df, hier
             dimension_mapping[dim_index] = None  # Header, not selectable
             
             # Add hierarchies and their levels
-            for hierarchy_row in hierarchies:
+            for hierarchy_row in metadata_index.hierarchies_of(dim_unique_name):
                 hierarchy_caption = hierarchy_row.get('HIERARCHY_CAPTION', hierarchy_row['HIERARCHY_NAME'])
                 hierarchy_unique_name = hierarchy_row['HIERARCHY_UNIQUE_NAME']
                 
@@ -108,16 +123,15 @@ def populate_listboxes(dimensions_listbox, measures_listbox, dimensions_df, hier
                 dimension_mapping[hierarchy_index] = ("hierarchy", hierarchy_unique_name)
                 
                 # Add levels for this hierarchy
-                if hierarchy_unique_name in hierarchy_levels:
-                    for level_row in hierarchy_levels[hierarchy_unique_name]:
-                        level_caption = level_row.get('LEVEL_CAPTION', level_row['LEVEL_NAME'])
-                        level_unique_name = level_row['LEVEL_UNIQUE_NAME']
-                        
-                        level_display = f"    [L] {level_caption}"
-                        level_index = dimensions_listbox.size()
-                        dimensions_listbox.insert('end', level_display)
-                        # Levels use default color (black)
-                        dimension_mapping[level_index] = ("level", level_unique_name)
+                for level_row in metadata_index.levels_of(hierarchy_unique_name):
+                    level_caption = level_row.get('LEVEL_CAPTION', level_row['LEVEL_NAME'])
+                    level_unique_name = level_row['LEVEL_UNIQUE_NAME']
+                    
+                    level_display = f"    [L] {level_caption}"
+                    level_index = dimensions_listbox.size()
+                    dimensions_listbox.insert('end', level_display)
+                    # Levels use default color (black)
+                    dimension_mapping[level_index] = ("level", level_unique_name)
     
     if measures_df is not None and not measures_df.empty:
         # Group measures by display folder for better organization
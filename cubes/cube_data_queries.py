@@ -1,10 +1,39 @@
 # tabs/cube_data_queries.py
-import requests
 import urllib3
-from common import load_config, get_instance_type, get_credentials
+from common import load_config
+from api import http_session
+from cubes import xml_backend
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+SOAP_FAULT_TAG = "{http://schemas.xmlsoap.org/soap/envelope/}Fault"
+
+
+class XmlaFaultError(Exception):
+    """A SOAP Fault returned by the XMLA endpoint (MDX errors, unknown members, ...)"""
+
+    def __init__(self, fault_string, fault_code=None):
+        super().__init__(f"{fault_string} ({fault_code})" if fault_code else fault_string)
+        self.fault_string = fault_string
+        self.fault_code = fault_code
+
+
+def is_fault_response(resp):
+    """XMLA reports SOAP faults as HTTP 500 with an XML body"""
+    return resp.status_code == 500 and "xml" in resp.headers.get("Content-Type", "").lower()
+
+
+def parse_fault(body):
+    """XmlaFaultError for the SOAP Fault in a response body, or None if it has none"""
+    try:
+        root = xml_backend.fromstring(body)
+    except xml_backend.ParseError:
+        return None
+    fault = next(root.iter(SOAP_FAULT_TAG), None)
+    if fault is None:
+        return None
+    return XmlaFaultError(fault.findtext("faultstring") or "XMLA fault", fault.findtext("faultcode"))
+
 # XMLA Query Templates
 CATALOG_QUERY = """<?xml version="1.0" encoding="utf-8"?>
 <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
@@ -133,26 +162,54 @@ MEASURES_QUERY = """<?xml version="1.0" encoding="utf-8"?>
   </soap:Body>
 </soap:Envelope>"""
 
-def run_xmla_query(xml_body: str):
-    config = load_config()
-    host = config["host"]
-    username, password = get_credentials()
-    instance_type = get_instance_type()
+# Schema version of a cube, used to revalidate cached metadata (api/metadata_cache.py)
+CUBE_VERSION_QUERY = """<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <Execute xmlns="urn:schemas-microsoft-com:xml-analysis">
+      <Command>
+        <Statement>
+          SELECT [CUBE_NAME], [LAST_SCHEMA_UPDATE]
+          FROM $system.MDSCHEMA_CUBES 
+          WHERE [CUBE_NAME] = '{cube_name}'
+        </Statement>
+      </Command>
+      <Properties>
+        <PropertyList>
+          <Catalog>{catalog}</Catalog>
+          <Cube>{cube_name}</Cube>
+        </PropertyList>
+      </Properties>
+    </Execute>
+  </soap:Body>
+</soap:Envelope>"""
 
-    if instance_type == "container":
-        url = f"https://{host}/engine/xmla"
-    else:
-        url = f"https://{host}:10502/xmla/default"
+def run_xmla_query(xml_body: str, timeout=None):
+    """
+    POST an XMLA request and return the raw response body: bytes, or a
+    read-only mmap for very large bodies (see http_session.read_body).
+    All parsers accept either; nothing is decoded to str.
+    """
+    config = load_config()
 
-    resp = requests.post(
-        url,
+    resp = http_session.post(
+        config.xmla_url,
         data=xml_body.encode("utf-8"),
         headers={"Content-Type": "text/xml"},
-        auth=(username, password),
-        verify=False
+        auth=config.credentials,
+        verify=False,
+        retry="xmla",
+        compress_body=True,
+        timeout=timeout,
+        stream=True
     )
+    body = http_session.read_body(resp)
+    if is_fault_response(resp):
+        fault = parse_fault(body)
+        if fault is not None:
+            raise fault
     resp.raise_for_status()
-    return resp.text
+    return body
 
 def build_xmla_request(mdx_query, catalog, cube, use_agg=True, use_cache=True):
     """Build XMLA request from MDX query with flags"""
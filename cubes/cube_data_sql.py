@@ -1,21 +1,20 @@
 # tabs/cube_data_sql.py
 import json
-import requests
 import urllib3
-import xml.etree.ElementTree as ET
 import pandas as pd
-from common import load_config, get_jwt, get_instance_type, append_log
+from common import load_config, authorized_request, append_log
+from api import http_session
+from cubes import parse_service
+from cubes.sql_result_reader import SqlResultReader, read_sql_result
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def submit_sql_query(sql_query, catalog, cube, use_agg=True, use_cache=True):
-    """Submit SQL query to AtScale with flags"""
-    # Use the common get_jwt function instead of duplicating the logic
-    jwt = get_jwt()
+STREAM_CHUNK_SIZE = 64 * 1024  # small chunks so the first rows parse early
+
+def _post_sql_query(sql_query, catalog, cube, use_agg=True, use_cache=True):
+    """POST the query-submit request; returns the (stream=True) response"""
     config = load_config()
-    organization = config.get("organization", "default")
-    instance_type = get_instance_type()
-    host = config["host"]
+    organization = config.organization
     
     payload = {
         "language": "SQL",
@@ -34,43 +33,48 @@ def submit_sql_query(sql_query, catalog, cube, use_agg=True, use_cache=True):
         "timeout": "2.minutes"
     }
     
-    if instance_type == "installer":
-        url = f"https://{host}:10502/query/orgId/{organization}/submit"
-    else:
-        url = f"https://{host}/engine/query/submit"
-        
-    headers = {"Authorization": f"Bearer {jwt}", "Content-Type": "application/json"}
-    resp = requests.post(url, json=payload, headers=headers, verify=False)
+    headers = {"Content-Type": "application/json"}
+    return authorized_request("POST", config.query_submit_url, json=payload, headers=headers, verify=False,
+                              compress_body=True, stream=True)
+
+def submit_sql_query(sql_query, catalog, cube, use_agg=True, use_cache=True):
+    """Submit SQL query to AtScale with flags"""
+    resp = _post_sql_query(sql_query, catalog, cube, use_agg, use_cache)
+    # Raw bytes (or an mmap for very large results) go straight to the reader
+    body = http_session.read_body(resp)
     resp.raise_for_status()
-    return resp.text
+    return body
+
+def stream_sql_query(sql_query, catalog, cube, use_agg=True, use_cache=True, on_rows=None, stop=None):
+    """
+    Submit SQL query and parse the result while it downloads. on_rows(frame)
+    gets each batch of typed rows as it is decoded; setting the stop event
+    closes the transfer and returns the rows read so far.
+    """
+    resp = _post_sql_query(sql_query, catalog, cube, use_agg, use_cache)
+    if not resp.ok:
+        http_session.read_body(resp)
+        resp.raise_for_status()
+    
+    reader = SqlResultReader(on_rows=on_rows)
+    body = http_session.iter_body(resp, chunk_size=STREAM_CHUNK_SIZE)
+    try:
+        for chunk in body:
+            reader.feed(chunk)
+            if stop is not None and stop.is_set():
+                return reader.result()
+    finally:
+        body.close()
+    return reader.close()
 
 def parse_sql_results(xml_text):
-    """Parse SQL query results from XML response - FIXED to match MDX format"""
+    """
+    Parse SQL query results from XML response - FIXED to match MDX format.
+    The columnar reader (cubes/sql_result_reader.py) streams rows into one
+    typed buffer per declared column instead of building the whole DOM.
+    """
     try:
-        root = ET.fromstring(xml_text)
-        columns = [col.find("name").text for col in root.findall(".//columns/column")]
-        rows = []
-        for row in root.findall(".//data/row"):
-            values = []
-            for col in row.findall("column"):
-                if "null" in col.attrib:
-                    values.append(None)
-                else:
-                    values.append(col.text)
-            rows.append(values)
-        
-        df = pd.DataFrame(rows, columns=columns)
-        
-        # Convert numeric columns (skip the first column which is usually dimension)
-        for col in df.columns:
-            # Use the new approach without errors parameter
-            try:
-                df[col] = pd.to_numeric(df[col])
-            except (ValueError, TypeError):
-                # If conversion fails, leave as string
-                pass
-            
-        return df
+        return read_sql_result(xml_text)
     except Exception as e:
         print(f"Error parsing SQL results: {e}")
         return pd.DataFrame()
@@ -126,8 +130,13 @@ GROUP BY {group_by_clause}"""
     
     return sql_query
 
-def execute_sql_query(dimensions, measures, catalog, cube, log_function, use_agg=True, use_cache=True):
-    """Execute SQL query with the given dimensions and measures with flags"""
+def execute_sql_query(dimensions, measures, catalog, cube, log_function, use_agg=True, use_cache=True,
+                      on_rows=None, stop=None):
+    """
+    Execute SQL query with the given dimensions and measures with flags.
+    With on_rows, rows are parsed and handed over while downloading (see
+    stream_sql_query); stop ends the transfer early.
+    """
     try:
         log_function("Building SQL query...")
         sql_query = build_sql_query(dimensions, measures, cube)
@@ -136,11 +145,14 @@ def execute_sql_query(dimensions, measures, catalog, cube, log_function, use_agg
         log_function(f"Flags - Use Agg: {use_agg}, Use Cache: {use_cache}")
         log_function("Executing SQL query...")
         
-        # Submit query with flags
-        xml_response = submit_sql_query(sql_query, catalog, cube, use_agg, use_cache)
-        
-        # Parse results
-        df = parse_sql_results(xml_response)
+        if on_rows is not None:
+            df = stream_sql_query(sql_query, catalog, cube, use_agg, use_cache, on_rows=on_rows, stop=stop)
+        else:
+            # Submit query with flags
+            xml_response = submit_sql_query(sql_query, catalog, cube, use_agg, use_cache)
+            
+            # Parse results
+            df = parse_service.parse("sql", xml_response, progress=log_function)
         
         if not df.empty:
             log_function(f"SQL query executed successfully! ({len(df)} rows)")
@@ -155,8 +167,9 @@ def execute_sql_query(dimensions, measures, catalog, cube, log_function, use_agg
         log_function(f"Traceback: {traceback.format_exc()}")
         return pd.DataFrame()
 
-def execute_raw_sql_query(sql_query, catalog, cube, log_function, use_agg=True, use_cache=True):
-    """Execute raw SQL query using AtScale's SQL endpoint with flags"""
+def execute_raw_sql_query(sql_query, catalog, cube, log_function, use_agg=True, use_cache=True,
+                          on_rows=None, stop=None):
+    """Execute raw SQL query using AtScale's SQL endpoint with flags (on_rows/stop: see execute_sql_query)"""
     try:
         log_function("Executing raw SQL query...")
         
@@ -174,12 +187,15 @@ def execute_raw_sql_query(sql_query, catalog, cube, log_function, use_agg=True,
         log_function(f"Flags - Use Agg: {use_agg}, Use Cache: {use_cache}")
         log_function("Submitting SQL query to AtScale...")
         
-        # Submit the raw SQL query directly with flags
-        xml_response = submit_sql_query(cleaned_query, catalog, cube, use_agg, use_cache)
-        
-        log_function("Parsing SQL results...")
-        # Parse the results using your existing function
-        df = parse_sql_results(xml_response)
+        if on_rows is not None:
+            df = stream_sql_query(cleaned_query, catalog, cube, use_agg, use_cache, on_rows=on_rows, stop=stop)
+        else:
+            # Submit the raw SQL query directly with flags
+            xml_response = submit_sql_query(cleaned_query, catalog, cube, use_agg, use_cache)
+            
+            log_function("Parsing SQL results...")
+            # Parse the results using your existing function
+            df = parse_service.parse("sql", xml_response, progress=log_function)
         
         if not df.empty:
             log_function(f"Raw SQL query executed successfully! ({len(df)} rows returned)")
@@ -0,0 +1,102 @@
+# cubes/cube_metadata_index.py
+"""
+In-memory index over a cube's dimension / hierarchy / level rowsets.
+
+Built once per metadata load, so tree population, MDX generation and
+drill navigation look things up in dicts instead of re-filtering (and
+re-sorting) the whole DataFrames for every dimension, hierarchy or drill:
+
+    index = CubeMetadataIndex(dimensions_df, hierarchies_df, levels_df)
+    for dim in index.dimensions:
+        for hier in index.hierarchies_of(dim['DIMENSION_UNIQUE_NAME']):
+            levels = index.levels_of(hier['HIERARCHY_UNIQUE_NAME'])   # by LEVEL_NUMBER
+    index.next_level(level_unique_name)
+
+Rows are plain dicts (DataFrame records). Pass cube= when the rowsets
+span several cubes (the Catalog tab's *_detail_df frames carry CUBE_NAME).
+"""
+
+
+def _records(df, cube=None):
+    if df is None or df.empty:
+        return []
+    if cube is not None and 'CUBE_NAME' in df.columns:
+        df = df[df['CUBE_NAME'] == cube]
+    return df.to_dict('records')
+
+
+def _group(rows, key):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.get(key), []).append(row)
+    return groups
+
+
+def _sort_levels(levels):
+    """Order one hierarchy's levels by LEVEL_NUMBER; keep row order if any number is missing or not an int"""
+    try:
+        numbers = [int(level['LEVEL_NUMBER']) for level in levels]
+    except (KeyError, ValueError, TypeError):
+        return levels
+    for level, number in zip(levels, numbers):
+        level['LEVEL_NUMBER'] = number
+    return [level for _, level in sorted(zip(numbers, levels), key=lambda pair: pair[0])]
+
+
+class CubeMetadataIndex:
+    def __init__(self, dimensions_df=None, hierarchies_df=None, levels_df=None, cube=None):
+        self.dimensions = _records(dimensions_df, cube)
+        hierarchies = _records(hierarchies_df, cube)
+        levels = _records(levels_df, cube)
+
+        self._hierarchies = _group(hierarchies, 'DIMENSION_UNIQUE_NAME')
+        self._levels = {name: _sort_levels(rows)
+                        for name, rows in _group(levels, 'HIERARCHY_UNIQUE_NAME').items()}
+
+        self._next = {}
+        self._previous = {}
+        for rows in self._levels.values():
+            for upper, lower in zip(rows, rows[1:]):
+                self._next[upper['LEVEL_UNIQUE_NAME']] = lower
+                self._previous[lower['LEVEL_UNIQUE_NAME']] = upper
+
+        # Unique name -> row, per kind
+        self._dimension_rows = {row.get('DIMENSION_UNIQUE_NAME'): row for row in self.dimensions}
+        self._hierarchy_rows = {row.get('HIERARCHY_UNIQUE_NAME'): row for row in hierarchies}
+        self._level_rows = {row.get('LEVEL_UNIQUE_NAME'): row for row in levels}
+
+    def hierarchies_of(self, dimension_unique_name):
+        """Hierarchies of a dimension, in rowset order"""
+        return self._hierarchies.get(dimension_unique_name, [])
+
+    def dimension_names(self):
+        """Dimension unique names that have hierarchies, in rowset order"""
+        return list(self._hierarchies)
+
+    def levels_of(self, hierarchy_unique_name):
+        """Levels of a hierarchy, sorted by LEVEL_NUMBER (rowset order if it isn't usable)"""
+        return self._levels.get(hierarchy_unique_name, [])
+
+    def row(self, unique_name):
+        """The level, hierarchy or dimension row with this unique name (checked in that order), or None"""
+        for rows in (self._level_rows, self._hierarchy_rows, self._dimension_rows):
+            if unique_name in rows:
+                return rows[unique_name]
+        return None
+
+    def dimension(self, dimension_unique_name):
+        return self._dimension_rows.get(dimension_unique_name)
+
+    def hierarchy(self, hierarchy_unique_name):
+        return self._hierarchy_rows.get(hierarchy_unique_name)
+
+    def level(self, level_unique_name):
+        return self._level_rows.get(level_unique_name)
+
+    def next_level(self, level_unique_name):
+        """The level below this one in its hierarchy, or None at the leaf"""
+        return self._next.get(level_unique_name)
+
+    def previous_level(self, level_unique_name):
+        """The level above this one in its hierarchy, or None at the top"""
+        return self._previous.get(level_unique_name)
@@ -44,7 +44,7 @@ def create_drill_down_wrapper(state, result_tree):
         # Call the drill_down_selection from drilldown module
         result = drill_down_selection(
             result_tree, state['query_history'], state['current_query_index'], 
-            state['levels_df'], state['current_hierarchies'], state['current_measures'], 
+            state['metadata_index'], state['current_hierarchies'], state['current_measures'], 
             state['current_catalog'], state['current_cube'], state['log_function']
         )
         
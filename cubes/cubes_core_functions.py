@@ -2,6 +2,7 @@
 import pandas as pd
 from cubes.cube_data_metadata import load_cube_metadata, populate_listboxes
 from cubes.cube_data_drilldown import get_hierarchy_levels
+from cubes.cube_metadata_index import CubeMetadataIndex
 
 # Try different import approaches for the SQL module
 try:
@@ -24,19 +25,31 @@ def on_catalog_cube_selected_wrapper(state, catalog, cube, catalog_guid=None, cu
     
     state['log_function'](f"Loading metadata for: {catalog} -> {cube}")
     
-    # Load cube metadata
-    result = load_cube_metadata(catalog, cube, state['log_function'])
-    
-    if result[0] is not None:
+    def apply_metadata(result):
         (state['dimensions_df'], state['hierarchies_df'], state['levels_df'], 
          state['measures_df'], state['dimension_mapping'], state['measure_mapping']) = result
+        # Index once per load; listboxes, MDX generation and drill-down all look up levels in it
+        state['metadata_index'] = CubeMetadataIndex(state['dimensions_df'], state['hierarchies_df'], state['levels_df'])
         # Populate listboxes
         populate_listboxes(
             state['components']['dimensions_listbox'],
             state['components']['measures_listbox'],
-            state['dimensions_df'], state['hierarchies_df'], state['levels_df'], 
-            state['measures_df'], state['dimension_mapping'], state['measure_mapping']
+            state['metadata_index'], state['measures_df'],
+            state['dimension_mapping'], state['measure_mapping']
         )
+    
+    def on_refresh(result):
+        # Cached metadata was stale: repopulate from the Tk thread, unless another cube is selected by now
+        def apply_if_current():
+            if (state['current_catalog'], state['current_cube']) == (catalog, cube):
+                apply_metadata(result)
+        state['components']['dimensions_listbox'].after(0, apply_if_current)
+    
+    # Load cube metadata
+    result = load_cube_metadata(catalog, cube, state['log_function'], on_refresh=on_refresh)
+    
+    if result[0] is not None:
+        apply_metadata(result)
 
 def on_sql_dialect_change(state):
     """Handle SQL dialect checkbox change"""
@@ -45,12 +58,12 @@ def on_sql_dialect_change(state):
     else:
         state['log_function']("MDX Dialect enabled - drill-down available")
 
-def build_initial_mdx(dimension_items, measures_set, cube, levels_df):
+def build_initial_mdx(dimension_items, measures_set, cube, metadata_index):
     """Build initial MDX query showing first level members"""
     if len(dimension_items) == 1:
         hierarchy_name = dimension_items[0].replace('.Members', '')
         # Get the first non-All level
-        levels = get_hierarchy_levels(hierarchy_name, levels_df)
+        levels = get_hierarchy_levels(hierarchy_name, metadata_index)
         if levels:
             first_level = levels[0]
             # Show members of the first level directly
@@ -68,7 +81,7 @@ def build_initial_mdx(dimension_items, measures_set, cube, levels_df):
         crossjoin_items = []
         for item in dimension_items:
             hierarchy_name = item.replace('.Members', '')
-            levels = get_hierarchy_levels(hierarchy_name, levels_df)
+            levels = get_hierarchy_levels(hierarchy_name, metadata_index)
             if levels:
                 first_level = levels[0]
                 crossjoin_items.append(f"{{ {first_level['LEVEL_UNIQUE_NAME']}.Members }}")
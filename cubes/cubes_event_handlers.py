@@ -1,9 +1,11 @@
 # cubes/tab_event_handlers.py
+import threading
 import tkinter as tk
 from tkinter import messagebox
-from cubes.cube_data_queries import run_xmla_query, build_xmla_request
-from cubes.cube_data_parsers import parse_xmla_result_to_dataframe
+from cubes.cube_data_queries import build_xmla_request
+from cubes.xmla_stream import read_cellset_streaming
 from cubes.cube_data_drilldown import get_hierarchy_levels
+from api.request_timing import operation
 
 def on_listbox_click(event, dimension_mapping, measure_mapping):
     """Handle listbox click events"""
@@ -116,40 +118,30 @@ def execute_query(state):
             # Execute SQL query
             state['log_function']("Executing SQL query...")
             from cubes.cubes_core_functions import execute_sql_query  # Import here to avoid circular import
-            df = execute_sql_query(
+            run_in_background(state, lambda on_rows=None, stop=None: execute_sql_query(
                 dimension_items, 
                 measure_unique_names, 
                 catalog, 
                 cube,
                 state['log_function'],
                 use_agg=True,
-                use_cache=True
-            )           
-            if not df.empty:
-                # Limit to first 1000 rows
-                if len(df) > 1000:
-                    df = df.head(1000)
-                    state['log_function'](f"Result truncated to first 1000 rows (original: {len(df)} rows)")
-                
-                # Display results in Treeview - pass is_sql=True
-                state['display_function'](df, is_sql=True)
-                
-                # Clear MDX history for SQL queries
-                state['query_history'] = []
-                state['current_query_index'] = -1
+                use_cache=True,
+                on_rows=on_rows,
+                stop=stop
+            ), is_sql=True)
                 
         else:
             # Execute MDX query
             from cubes.cubes_core_functions import build_initial_mdx  # Import here
             measures_set = ", ".join(measure_unique_names)
-            MDX_QUERY = build_initial_mdx(dimension_items, measures_set, cube, state['levels_df'])
+            MDX_QUERY = build_initial_mdx(dimension_items, measures_set, cube, state['metadata_index'])
             
             # Store the hierarchies for drill-down context
             level_referenced_hierarchies = []
             for item in dimension_items:
                 hierarchy_name = item.replace('.Members', '')
                 # Get the first non-All level to track current level
-                levels = get_hierarchy_levels(hierarchy_name, state['levels_df'])
+                levels = get_hierarchy_levels(hierarchy_name, state['metadata_index'])
                 if levels:
                     first_level = levels[0]
                     level_referenced_hierarchies.append(f"{first_level['LEVEL_UNIQUE_NAME']}.Members")
@@ -174,17 +166,83 @@ def execute_query(state):
             state['log_function']("Executing MDX query...")
             
             # Execute query
-            response = run_xmla_query(XMLA_REQUEST)
-            df = parse_xmla_result_to_dataframe(response)
+            def run_mdx(on_rows=None, stop=None):
+                with operation("MDX execute"):
+                    return read_cellset_streaming(XMLA_REQUEST, on_rows=on_rows, stop=stop)
             
-            if not df.empty:
-                # Limit to first 1000 rows
-                if len(df) > 1000:
-                    df = df.head(1000)
-                    state['log_function'](f"Result truncated to first 1000 rows (original: {len(df)} rows)")
-                
-                # Display results
-                state['display_function'](df, is_sql=False)
+            run_in_background(state, run_mdx, is_sql=False)
     
     except Exception as e:
-        state['log_function'](f"Query execution error: {e}")
\ No newline at end of file
+        state['log_function'](f"Query execution error: {e}")
+
+def run_in_background(state, run_query, is_sql):
+    """
+    Run the query (network + parsing) off the Tk thread and display the
+    result from the main loop when it is done. run_query(on_rows, stop)
+    may stream: with "Show rows as they arrive" checked, batches are shown
+    while the response downloads and the Stop button ends the transfer.
+    """
+    tree = state['components']['result_tree']
+    progress = state.get('progressive')
+    
+    def clear_sql_history():
+        if is_sql:
+            # Clear MDX history for SQL queries
+            state['query_history'] = []
+            state['current_query_index'] = -1
+    
+    def show_results(df):
+        if df is None or df.empty:
+            return
+        # Limit to first 1000 rows
+        if len(df) > 1000:
+            state['log_function'](f"Result truncated to first 1000 rows (original: {len(df)} rows)")
+            df = df.head(1000)
+        
+        # Display results in Treeview
+        state['display_function'](df, is_sql=is_sql)
+        clear_sql_history()
+    
+    def show_streamed_results(df):
+        # Rows are already in the tree; only the summary is left
+        state['components']['stop_btn'].config(state="disabled")
+        if df is None or df.empty:
+            return
+        if progress.stopped:
+            state['log_function'](f"Query stopped: kept {len(df)} rows")
+        elif len(df) > progress.max_rows:
+            state['log_function'](f"Result truncated to first {progress.max_rows} rows (original: {len(df)} rows)")
+        clear_sql_history()
+    
+    if progress is not None and state['components']['progressive_var'].get():
+        if progress.running:
+            state['log_function']("A query is still streaming - stop it first")
+            return
+        state['progressive_is_sql'] = is_sql
+        progress.start()
+        state['components']['stop_btn'].config(state="normal")
+        
+        def worker():
+            try:
+                df = run_query(on_rows=progress.on_rows, stop=progress.stop_event)
+            except Exception as e:
+                state['log_function'](f"Query execution error: {e}")
+                df = None
+            progress.finish(lambda: show_streamed_results(df))
+    else:
+        def worker():
+            try:
+                df = run_query()
+            except Exception as e:
+                state['log_function'](f"Query execution error: {e}")
+                return
+            tree.after(0, lambda: show_results(df))
+    
+    threading.Thread(target=worker, daemon=True).start()
+
+def stop_query(state):
+    """Stop button: close the transfer of the query that is streaming in"""
+    progress = state.get('progressive')
+    if progress is not None and progress.running:
+        progress.stop()
+        state['log_function']("Stopping query - closing the transfer")
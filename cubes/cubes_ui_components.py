@@ -12,8 +12,11 @@ def create_ui_components(content, log_ref_container, on_catalog_cube_selected, o
         'measures_listbox': None,
         'result_tree': None,
         'sql_dialect_var': tk.BooleanVar(value=False),
+        'progressive_var': tk.BooleanVar(value=True),
         'selector': None,
-        'execute_btn': None
+        'execute_btn': None,
+        'stop_btn': None,
+        'status_var': tk.StringVar(value="")
     }
     
     # Layout: selector row on top, then 2-left + 1-right frames
@@ -29,14 +32,22 @@ def create_ui_components(content, log_ref_container, on_catalog_cube_selected, o
     selector.get_selector_widget().grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
     components['selector'] = selector
     
-    # SQL Dialect Checkbox
+    # SQL Dialect + progressive display checkboxes
+    options_frame = ttk.Frame(content)
+    options_frame.grid(row=1, column=0, columnspan=2, sticky="w", padx=5, pady=2)
     sql_checkbox = ttk.Checkbutton(
-        content, 
+        options_frame, 
         text="SQL Dialect", 
         variable=components['sql_dialect_var'],
         command=on_sql_change_callback  # Set the callback
     )
-    sql_checkbox.grid(row=1, column=0, columnspan=2, sticky="w", padx=5, pady=2)
+    sql_checkbox.grid(row=0, column=0, sticky="w", padx=(0, 10))
+    progressive_checkbox = ttk.Checkbutton(
+        options_frame,
+        text="Show rows as they arrive",
+        variable=components['progressive_var']
+    )
+    progressive_checkbox.grid(row=0, column=1, sticky="w")
     
     # Left frame
     left_frame = ttk.Frame(content)
@@ -89,9 +100,19 @@ def create_ui_components(content, log_ref_container, on_catalog_cube_selected, o
     h_scrollbar.config(command=result_tree.xview)
     components['result_tree'] = result_tree
     
-    # Execute button
-    execute_btn = ttk.Button(content, text="Execute Query", command=None)  # Will be set by caller
-    execute_btn.grid(row=3, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+    # Execute / Stop buttons and the live row counter
+    button_frame = ttk.Frame(content)
+    button_frame.grid(row=3, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+    button_frame.columnconfigure(0, weight=1)
+    
+    execute_btn = ttk.Button(button_frame, text="Execute Query", command=None)  # Will be set by caller
+    execute_btn.grid(row=0, column=0, sticky="ew")
     components['execute_btn'] = execute_btn
     
+    stop_btn = ttk.Button(button_frame, text="Stop", command=None, state="disabled")  # Will be set by caller
+    stop_btn.grid(row=0, column=1, padx=(5, 0))
+    components['stop_btn'] = stop_btn
+    
+    ttk.Label(button_frame, textvariable=components['status_var']).grid(row=1, column=0, columnspan=2, sticky="w")
+    
     return components
\ No newline at end of file
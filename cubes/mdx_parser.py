@@ -1,67 +1,196 @@
 # tabs/mdx_parser.py
+import numpy as np
 import pandas as pd
-import xml.etree.ElementTree as ET
 from typing import Optional, Dict, List, Any
 import re
 
-def parse_xmla_mdx_result(xmla_response: str) -> Optional[pd.DataFrame]:
+from cubes import xml_backend
+from cubes.cellset import (
+    MDDATASET_NS, CellsetBuilder, read_axis_tuples, read_cell_columns, tuple_labels
+)
+from cubes.type_decoding import decode_typed_cells
+
+SOAP_NS = 'http://schemas.xmlsoap.org/soap/envelope/'
+SOAP_ENVELOPE_TAG = f'{{{SOAP_NS}}}Envelope'
+SOAP_FAULT_TAG = f'{{{SOAP_NS}}}Fault'
+XMLA_ERROR_TAG = '{urn:schemas-microsoft-com:xml-analysis:exception}Error'
+FORMAT_STRING_TAG = f'{{{MDDATASET_NS}}}FormatString'
+
+# Paths are compiled once (C XPath under lxml) instead of re-resolved per call
+DATA_ROOT_PATH = xml_backend.compile_path(f'.//{{{MDDATASET_NS}}}root')
+AXES_PATH = xml_backend.compile_path(f'{{{MDDATASET_NS}}}Axes')
+CELL_DATA_PATH = xml_backend.compile_path(f'{{{MDDATASET_NS}}}CellData')
+AXIS_PATHS = {
+    name: xml_backend.compile_path(f'.//{{{MDDATASET_NS}}}Axis[@name="{name}"]')
+    for name in ('Axis0', 'Axis1', 'SlicerAxis')
+}
+CELL_PATH = xml_backend.compile_path(f'{{{MDDATASET_NS}}}Cell')
+
+class MdxCellset:
     """
-    Parse XMLA MDX query response into a pandas DataFrame
-    Handles the complex XMLA structure with axes, tuples, and cell data
+    One parse of an XMLA Execute response. Carries the axes (tuple records
+    per axis, as parse_axis_data returns them), the decoded cells, tuple and
+    cell counts and any SOAP fault / XMLA error, so the DataFrame, the debug
+    stats and the error message all come from the same tree walk.
     """
-    try:
+    
+    def __init__(self, response_length=0):
+        self.response_length = response_length
+        self.has_soap_envelope = False
+        self.has_data_root = False
+        self.axes: Dict[str, List[Dict[str, str]]] = {}
+        self.cell_values: List[Dict[str, Any]] = []
+        self.has_cell_data = False
+        self.fault_code: Optional[str] = None
+        self.fault_string: Optional[str] = None
+        self.parse_error: Optional[str] = None
+        self._materialized = None  # (frame, tuple_count, cell_count, axis_hierarchies)
+    
+    @classmethod
+    def from_response(cls, xmla_response: str) -> 'MdxCellset':
+        cellset = cls(len(xmla_response or ''))
         if not xmla_response:
-            return None
-            
-        # Parse the XML response
-        root = ET.fromstring(xmla_response)
-        
-        # Define namespaces
-        namespaces = {
-            'soap': 'http://schemas.xmlsoap.org/soap/envelope/',
-            'xmla': 'urn:schemas-microsoft-com:xml-analysis',
-            'mddataset': 'urn:schemas-microsoft-com:xml-analysis:mddataset',
-            'xsd': 'http://www.w3.org/2001/XMLSchema',
-            'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
-        }
+            return cellset
+        try:
+            root = xml_backend.fromstring(xmla_response)
+        except xml_backend.ParseError as e:
+            cellset.parse_error = str(e)
+            return cellset
         
-        # Register namespaces for easier searching
-        for prefix, uri in namespaces.items():
-            ET.register_namespace(prefix, uri)
+        cellset.has_soap_envelope = root.tag == SOAP_ENVELOPE_TAG
+        cellset._read_fault(root)
         
-        # Find the root element with the actual data
-        root_elem = root.find('.//{urn:schemas-microsoft-com:xml-analysis:mddataset}root')
+        root_elem = DATA_ROOT_PATH.find(root)
         if root_elem is None:
-            return parse_fallback_mdx(xmla_response)
-        
-        # Extract axes information
-        axes_elem = root_elem.find('{urn:schemas-microsoft-com:xml-analysis:mddataset}Axes')
-        if axes_elem is None:
-            return parse_fallback_mdx(xmla_response)
+            return cellset
+        cellset.has_data_root = True
         
-        # Extract cell data
-        cell_data_elem = root_elem.find('{urn:schemas-microsoft-com:xml-analysis:mddataset}CellData')
-        if cell_data_elem is None:
-            return parse_fallback_mdx(xmla_response)
+        axes_elem = AXES_PATH.find(root_elem)
+        if axes_elem is not None:
+            for axis_name in AXIS_PATHS:
+                records = parse_axis_data(axes_elem, axis_name)
+                if records:
+                    cellset.axes[axis_name] = records
         
-        # Parse rows from Axis0 (rows axis)
-        rows = parse_axis_data(axes_elem, 'Axis0')
-        
-        # Parse columns from SlicerAxis (columns axis) 
-        columns = parse_axis_data(axes_elem, 'SlicerAxis')
+        cell_data_elem = CELL_DATA_PATH.find(root_elem)
+        if cell_data_elem is not None:
+            cellset.has_cell_data = True
+            cellset.cell_values = parse_cell_data(cell_data_elem)
+        return cellset
+    
+    def _read_fault(self, root):
+        fault = next(root.iter(SOAP_FAULT_TAG), None)
+        if fault is not None:
+            self.fault_code = fault.findtext('faultcode')
+            self.fault_string = fault.findtext('faultstring') or 'XMLA fault'
+            return
+        # XMLA errors reported inside a successful envelope (<Messages>/<Exception>)
+        error = next(root.iter(XMLA_ERROR_TAG), None)
+        if error is not None:
+            self.fault_code = error.get('ErrorCode')
+            self.fault_string = error.get('Description') or error.text or 'XMLA error'
+    
+    @property
+    def is_fault(self) -> bool:
+        return self.fault_string is not None
+    
+    @property
+    def error_message(self) -> Optional[str]:
+        if self.is_fault:
+            return f"{self.fault_string} ({self.fault_code})" if self.fault_code else self.fault_string
+        if self.parse_error:
+            return f"Response is not valid XML: {self.parse_error}"
+        return None
+    
+    @property
+    def tuple_count(self) -> int:
+        if self._materialized:
+            return self._materialized[1]
+        return sum(len(records) for records in self.axes.values())
+    
+    @property
+    def cell_count(self) -> int:
+        if self._materialized:
+            return self._materialized[2]
+        return len(self.cell_values)
+    
+    @property
+    def axis_hierarchies(self) -> Dict[str, List[str]]:
+        """{axis_name: [hierarchy, ...]} taken from the first tuple of each axis"""
+        if self._materialized:
+            return self._materialized[3]
+        return {
+            name: [key for key in records[0] if not key.endswith('_UniqueName')]
+            for name, records in self.axes.items()
+        }
+    
+    def debug_info(self) -> Dict[str, Any]:
+        info = {
+            'response_length': self.response_length,
+            'has_soap_envelope': self.has_soap_envelope,
+            'has_cell_data': self.has_cell_data,
+            'has_tuple': self.tuple_count > 0,
+            'has_axis': bool(self.axis_hierarchies),
+            'tuple_count': self.tuple_count,
+            'cell_count': self.cell_count,
+        }
+        if self.parse_error:
+            info['parse_error'] = True
+        if self.is_fault:
+            info['fault_code'] = self.fault_code
+            info['fault_string'] = self.fault_string
+        return info
+    
+    def to_dataframe(self) -> Optional[pd.DataFrame]:
+        """
+        Axis1 tuples are the rows and Axis0 tuples the value columns; a
+        single-axis result has one row per Axis0 tuple and a Value column.
+        None when the response has no axes or cells.
+        """
+        if self._materialized:
+            return self._materialized[0]
+        if 'Axis1' in self.axes:
+            rows, columns = self.axes['Axis1'], self.axes.get('Axis0', [])
+        else:
+            rows, columns = self.axes.get('Axis0', []), []
+        if rows and self.cell_values:
+            return build_dataframe_from_axes(rows, columns, self.cell_values)
+        return None
+
+    def materialize(self) -> 'MdxCellset':
+        """
+        Build the DataFrame once and drop the raw axis/cell records, keeping
+        counts and hierarchies. Used when the cellset is sent back from a
+        parse worker (cubes/parse_service.py), so only the frame is pickled.
+        """
+        if not self._materialized:
+            self._materialized = (self.to_dataframe(), self.tuple_count, self.cell_count, self.axis_hierarchies)
+            self.axes = {}
+            self.cell_values = []
+        return self
+
+def parse_mdx_cellset(xmla_response) -> MdxCellset:
+    """Parse an Execute response into a materialized MdxCellset"""
+    return MdxCellset.from_response(xmla_response).materialize()
+
+def parse_xmla_mdx_result(xmla_response: str) -> Optional[pd.DataFrame]:
+    """
+    Parse XMLA MDX query response into a pandas DataFrame
+    Handles the complex XMLA structure with axes, tuples, and cell data
+    """
+    try:
+        if not xmla_response:
+            return None
         
-        # Parse cell values
-        cell_values = parse_cell_data(cell_data_elem)
+        cellset = MdxCellset.from_response(xmla_response)
+        if cellset.parse_error:
+            print(f"XML parsing error: {cellset.parse_error}")
         
-        # Build DataFrame
-        if rows and cell_values:
-            return build_dataframe_from_axes(rows, columns, cell_values)
-        else:
+        df = cellset.to_dataframe()
+        if df is None:
             return parse_fallback_mdx(xmla_response)
+        return df
             
-    except ET.ParseError as e:
-        print(f"XML parsing error: {e}")
-        return parse_fallback_mdx(xmla_response)
     except Exception as e:
         print(f"Unexpected error parsing MDX result: {e}")
         return parse_fallback_mdx(xmla_response)
@@ -70,32 +199,20 @@ def parse_axis_data(axes_elem, axis_name: str) -> List[Dict[str, str]]:
     """Parse data from a specific axis"""
     axis_data = []
     
-    axis_elem = axes_elem.find(f'.//{{urn:schemas-microsoft-com:xml-analysis:mddataset}}Axis[@name="{axis_name}"]')
+    axis_elem = AXIS_PATHS[axis_name].find(axes_elem) if axis_name in AXIS_PATHS else None
     if axis_elem is None:
         return axis_data
     
-    # Find all tuples in this axis
-    tuples_elem = axis_elem.find('{urn:schemas-microsoft-com:xml-analysis:mddataset}Tuples')
-    if tuples_elem is None:
-        return axis_data
-    
-    for tuple_elem in tuples_elem.findall('{urn:schemas-microsoft-com:xml-analysis:mddataset}Tuple'):
+    # Members are read column-wise (see cellset.read_axis_tuples)
+    for members in read_axis_tuples(axis_elem):
         tuple_data = {}
         
-        # Extract member information
-        members = tuple_elem.findall('{urn:schemas-microsoft-com:xml-analysis:mddataset}Member')
-        for i, member_elem in enumerate(members):
-            hierarchy = member_elem.get('Hierarchy', f'Column_{i}')
-            
-            # Extract member properties
-            caption_elem = member_elem.find('{urn:schemas-microsoft-com:xml-analysis:mddataset}Caption')
-            caption = caption_elem.text if caption_elem is not None else f'Member_{i}'
-            
-            uname_elem = member_elem.find('{urn:schemas-microsoft-com:xml-analysis:mddataset}UName')
-            unique_name = uname_elem.text if uname_elem is not None else caption
+        for i, (hierarchy, caption, unique_name) in enumerate(members):
+            hierarchy = hierarchy or f'Column_{i}'
+            caption = caption if caption is not None else f'Member_{i}'
             
             tuple_data[hierarchy] = caption
-            tuple_data[f'{hierarchy}_UniqueName'] = unique_name
+            tuple_data[f'{hierarchy}_UniqueName'] = unique_name if unique_name is not None else caption
         
         if tuple_data:
             axis_data.append(tuple_data)
@@ -103,77 +220,70 @@ def parse_axis_data(axes_elem, axis_name: str) -> List[Dict[str, str]]:
     return axis_data
 
 def parse_cell_data(cell_data_elem) -> List[Dict[str, Any]]:
-    """Parse cell data values"""
-    cell_values = []
+    """Parse cell data values; values are decoded in bulk from their xsi:type"""
+    ordinals, texts, _, types = read_cell_columns(cell_data_elem)
     
-    for cell_elem in cell_data_elem.findall('{urn:schemas-microsoft-com:xml-analysis:mddataset}Cell'):
-        cell_ordinal = int(cell_elem.get('CellOrdinal', 0))
-        
-        # Extract cell value
-        value_elem = cell_elem.find('{urn:schemas-microsoft-com:xml-analysis:mddataset}Value')
-        value = None
-        if value_elem is not None and value_elem.text:
-            value_type = value_elem.get('{http://www.w3.org/2001/XMLSchema-instance}type', 'xsd:string')
-            if 'float' in value_type:
-                try:
-                    value = float(value_elem.text)
-                except (ValueError, TypeError):
-                    value = value_elem.text
-            else:
-                value = value_elem.text
-        
-        # Extract format information
-        format_elem = cell_elem.find('{urn:schemas-microsoft-com:xml-analysis:mddataset}FormatString')
-        format_string = format_elem.text if format_elem is not None else None
-        
-        cell_values.append({
-            'ordinal': cell_ordinal,
-            'value': value,
-            'format': format_string
-        })
+    # Cells without a declared type stay strings
+    types = [value_type or 'xsd:string' for value_type in types]
+    values = decode_typed_cells(texts, types) if texts else []
+    
+    # FormatString is only present when requested as a cell property
+    if next(cell_data_elem.iter(FORMAT_STRING_TAG), None) is not None:
+        formats = [cell_elem.findtext(FORMAT_STRING_TAG) for cell_elem in CELL_PATH.findall(cell_data_elem)]
+    else:
+        formats = [None] * len(texts)
     
-    # Sort by ordinal
-    cell_values.sort(key=lambda x: x['ordinal'])
-    return cell_values
+    return [
+        {'ordinal': ordinal, 'value': value, 'format': format_string}
+        for ordinal, value, format_string in zip(ordinals.tolist(), values, formats)
+    ]
 
 def build_dataframe_from_axes(rows: List[Dict], columns: List[Dict], cell_values: List[Dict]) -> pd.DataFrame:
-    """Build DataFrame from parsed axis and cell data"""
+    """
+    Build DataFrame from parsed axis and cell data. Cells are placed by
+    CellOrdinal (row * len(columns) + column), so cells the server left out
+    of a sparse / NON EMPTY result come out as NaN instead of shifting.
+    """
     
     if not rows:
         return pd.DataFrame()
     
-    # Create row data
-    row_data = []
-    for i, row in enumerate(rows):
-        row_entry = {}
-        
-        # Add row dimension data
-        for key, value in row.items():
-            if not key.endswith('_UniqueName'):  # Skip unique names for display
-                row_entry[key] = value
-        
-        # Add cell values
-        if i < len(cell_values):
-            row_entry['Value'] = cell_values[i]['value']
-            if cell_values[i]['format']:
-                row_entry['Format'] = cell_values[i]['format']
-        
-        row_data.append(row_entry)
+    # Row dimension data (unique names are skipped for display)
+    row_frame = pd.DataFrame(rows)
+    row_frame = row_frame[[col for col in row_frame.columns if not col.endswith('_UniqueName')]]
+    
+    # Value columns: one per column tuple, or a single 'Value'
+    if columns:
+        value_names = tuple_labels(
+            [[(None, col.get(key), None) for key in col if not key.endswith('_UniqueName')] for col in columns],
+            is_row=False,
+        )
+    else:
+        value_names = ['Value']
     
-    # Create DataFrame
-    df = pd.DataFrame(row_data)
+    ordinals = [cell['ordinal'] for cell in cell_values]
+    builder = CellsetBuilder(len(rows), len(value_names), keep_formatted=False)
+    builder.put(ordinals, [cell['value'] for cell in cell_values])
+    values = pd.DataFrame(builder.value_matrix(), columns=value_names)
     
-    # If we have multiple value columns, handle them properly
-    if 'Value' in df.columns and len(df.columns) > 1:
-        # Reorder columns to put Value last for better readability
-        cols = [col for col in df.columns if col != 'Value'] + ['Value']
-        df = df[cols]
+    df = pd.concat([row_frame, values], axis=1)
+    
+    if not columns:
+        formats = np.full(len(rows), None, dtype=object)
+        in_range = [i for i, ordinal in enumerate(ordinals) if 0 <= ordinal < len(rows)]
+        formats[[ordinals[i] for i in in_range]] = [cell_values[i]['format'] for i in in_range]
+        if any(formats):
+            # Format before Value, as the value column reads best last
+            df.insert(len(df.columns) - 1, 'Format', formats)
     
     return df
 
 def parse_fallback_mdx(xmla_response: str) -> Optional[pd.DataFrame]:
     """Fallback parsing method for MDX results"""
     try:
+        if not isinstance(xmla_response, str):
+            # Raw response body (bytes / mmap); only this text scan needs str
+            xmla_response = bytes(xmla_response).decode('utf-8', errors='replace')
         # Try to extract any tabular data using simpler methods
         lines = xmla_response.split('\n')
         data_lines = []
@@ -230,28 +340,7 @@ def parse_fallback_mdx(xmla_response: str) -> Optional[pd.DataFrame]:
 # tabs/mdx_parser.py (updated debug function)
 def debug_xmla_response(xmla_response: str) -> Dict[str, Any]:
     """Debug function to analyze XMLA response structure - returns cleaner info"""
-    debug_info = {
-        'response_length': len(xmla_response),
-        'has_soap_envelope': 'soap:Envelope' in xmla_response,
-        'has_cell_data': 'CellData' in xmla_response,
-        'has_tuple': 'Tuple' in xmla_response,
-        'has_axis': 'Axis' in xmla_response
-    }
-    
-    try:
-        root = ET.fromstring(xmla_response)
-        namespaces = {'mddataset': 'urn:schemas-microsoft-com:xml-analysis:mddataset'}
-        
-        # Count tuples and cells
-        tuples = root.findall('.//mddataset:Tuple', namespaces)
-        cells = root.findall('.//mddataset:Cell', namespaces)
-        debug_info['tuple_count'] = len(tuples)
-        debug_info['cell_count'] = len(cells)
-        
-    except:
-        debug_info['parse_error'] = True
-    
-    return debug_info
+    return MdxCellset.from_response(xmla_response).debug_info()
 
 # Update the main parse function to use the new XMLA parser
 def parse_mdx_result(xmla_response: str) -> Optional[pd.DataFrame]:
@@ -0,0 +1,169 @@
+# cubes/parse_service.py
+"""
+Off-thread parsing for very large XMLA / SQL responses.
+
+Parsing a multi-megabyte response holds the GIL for seconds, which freezes
+Tk even when the query itself runs in a background thread. parse() keeps
+small responses in-process and hands larger ones to a small process pool:
+
+    df = parse_service.parse("sql", xml_response, progress=log)
+    cellset = parse_service.parse("mdx", xmla_response)      # MdxCellset
+
+The raw bytes travel through multiprocessing.shared_memory instead of
+being pickled into the task. The first HEADER_SIZE bytes of the block are a
+status slot the worker updates, so the waiting thread can report queued /
+parsing to the UI. Results (DataFrames, a materialized MdxCellset)
+come back pickled.
+
+ATSCALE_PARSE_OFFLOAD_BYTES sets the threshold (0 disables offloading).
+"""
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+OFFLOAD_THRESHOLD = int(os.environ.get("ATSCALE_PARSE_OFFLOAD_BYTES", 8 * 1024 * 1024))
+MAX_WORKERS = 2
+POLL_INTERVAL = 0.25
+PROGRESS_INTERVAL = 2.0  # seconds between "still parsing" reports
+
+HEADER_SIZE = 8
+STAGE_QUEUED, STAGE_PARSING = 0, 1
+
+# kind -> (module, function); resolved lazily so workers import only what they need
+PARSERS = {
+    "mdx": ("cubes.mdx_parser", "parse_mdx_cellset"),
+    "sql": ("cubes.cube_data_sql", "parse_sql_results"),
+    "cellset": ("cubes.cube_data_parsers", "parse_xmla_result_to_dataframe"),
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+_active_blocks = {}  # shared memory name -> block, for parses still waiting on a worker
+
+
+def _parser(kind):
+    module_name, func_name = PARSERS[kind]
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parent has Tk and several background threads
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown():
+    """
+    Stop the worker processes (they are started again on demand) and unlink
+    the shared memory of parses still in flight, so none is left behind
+    when the app exits mid-parse.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+        blocks = list(_active_blocks.values())
+        _active_blocks.clear()
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    for shm in blocks:
+        _release(shm, unlink=True)
+
+
+def _release(shm, unlink):
+    try:
+        shm.close()
+    except BufferError:
+        pass  # A view is still exported by a waiting thread; its mapping goes away with it
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _worker_parse(kind, shm_name, size):
+    """Runs in a pool process: read the payload from shared memory and parse it"""
+    # Workers share the parent's resource tracker, which unlinks the block
+    # if the parent dies; the parent unlinks it after every parse
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        shm.buf[0] = STAGE_PARSING
+        payload = bytes(shm.buf[HEADER_SIZE:HEADER_SIZE + size])
+    finally:
+        shm.close()
+    return _parser(kind)(payload)
+
+
+def should_offload(payload):
+    return OFFLOAD_THRESHOLD > 0 and payload is not None and len(payload) >= OFFLOAD_THRESHOLD
+
+
+def parse(kind, payload, progress=None):
+    """
+    Parse payload (str or bytes) with the parser registered for kind.
+    Payloads of OFFLOAD_THRESHOLD bytes or more are parsed in a worker
+    process; progress(message) is called with status updates while waiting.
+    Falls back to parsing in-process if the pool or shared memory fails.
+    """
+    if not should_offload(payload):
+        return _parser(kind)(payload)
+
+    data = payload.encode("utf-8") if isinstance(payload, str) else payload
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + len(data))
+    except OSError as e:
+        _report(progress, f"Shared memory unavailable ({e}); parsing in-process")
+        return _parser(kind)(payload)
+
+    megabytes = len(data) / (1024 * 1024)
+    with _pool_lock:
+        _active_blocks[shm.name] = shm
+    try:
+        shm.buf[0] = STAGE_QUEUED
+        shm.buf[HEADER_SIZE:HEADER_SIZE + len(data)] = data
+        future = _get_pool().submit(_worker_parse, kind, shm.name, len(data))
+        _report(progress, f"Parsing {megabytes:.1f} MB response in a worker process...")
+        return _wait(future, shm, megabytes, progress)
+    except BrokenProcessPool as e:
+        shutdown()
+        _report(progress, f"Parse worker failed ({e}); parsing in-process")
+        return _parser(kind)(payload)
+    finally:
+        with _pool_lock:
+            # Not in the table any more if shutdown() already unlinked it
+            owned = _active_blocks.pop(shm.name, None) is not None
+        _release(shm, unlink=owned)
+
+
+def _wait(future, shm, megabytes, progress):
+    started = time.perf_counter()
+    stage = STAGE_QUEUED
+    last_report = started
+    while True:
+        try:
+            return future.result(timeout=POLL_INTERVAL)
+        except FutureTimeout:
+            pass
+        now = time.perf_counter()
+        if shm.buf[0] != stage:
+            stage = shm.buf[0]
+            last_report = now
+            if stage == STAGE_PARSING:
+                _report(progress, f"Worker is parsing {megabytes:.1f} MB response...")
+        elif now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            state = "waiting for a free worker" if stage == STAGE_QUEUED else "still parsing"
+            _report(progress, f"{megabytes:.1f} MB response: {state} ({now - started:.0f}s)")
+
+
+def _report(progress, message):
+    if progress is not None:
+        progress(message)
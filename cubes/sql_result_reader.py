@@ -0,0 +1,222 @@
+# cubes/sql_result_reader.py
+"""
+Columnar reader for query-submit (SQL) results.
+
+The response declares its schema in <columns>, normally before any
+<data><row>, so the reader allocates one buffer per column as soon as the
+schema is seen, then streams rows into them through an incremental parser -
+the DOM for the whole result is never built (rows that do come first are
+held as plain values until the schema arrives). Numeric, datetime and boolean columns are
+decoded every BATCH_ROWS rows into typed chunks (see cubes.type_decoding),
+so at most one batch of value strings is alive at a time; string columns
+keep one shared str object per distinct value and become categorical at
+the end. Peak memory stays close to the size of the final typed frame.
+
+    df = read_sql_result(xml_text)
+
+    reader = SqlResultReader()              # or feed chunks as they arrive
+    for chunk in chunks:
+        reader.feed(chunk)
+    df = reader.close()
+"""
+import pandas as pd
+
+from cubes import xml_backend
+from cubes.type_decoding import CATEGORY_RATIO, STRING, UNKNOWN, decode_column, kind_of
+
+BATCH_ROWS = 65536
+FIRST_BATCH_ROWS = 100  # first progressive batch, see SqlResultReader
+CHUNK_SIZE = 1024 * 1024
+
+COLUMNS_TAG = "columns"
+ROW_TAG = "row"
+
+
+def column_type(column_elem):
+    """Declared type of a <columns>/<column> entry: <type><name>, <type> text or a type attribute"""
+    type_elem = column_elem.find("type")
+    if type_elem is not None:
+        name = type_elem.findtext("name") or type_elem.text
+        if name and name.strip():
+            return name.strip()
+        code = type_elem.findtext("jdbcType") or type_elem.findtext("code")
+        if code:
+            return code.strip()
+    return column_elem.get("type") or column_elem.findtext("dataType")
+
+
+class ColumnBuffer:
+    """
+    Values of one result column. Rows append raw text to texts; flush()
+    moves the batch into typed chunks (or, for text columns that must be
+    decoded as a whole, into values with one shared str per distinct value).
+    """
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.texts = []  # current batch; appended to directly by the reader
+        self.chunks = []
+        self.deferred = kind in (STRING, UNKNOWN)
+        self.values = []
+        self.distinct = {} if self.deferred else None
+
+    def flush(self, preview=False):
+        """
+        Decode the current batch. preview=True also returns the batch as a
+        Series for progressive display (text columns are then decoded once
+        for the preview and once as a whole at the end).
+        """
+        if not self.texts:
+            return None
+        if not self.deferred:
+            batch = decode_column(self.texts, self.kind)
+            self.chunks.append(batch)
+        else:
+            batch = decode_column(self.texts, self.kind, categorize=False) if preview else None
+            if self.distinct is not None:
+                setdefault = self.distinct.setdefault
+                self.values.extend([setdefault(t, t) for t in self.texts])
+                if len(self.distinct) > CATEGORY_RATIO * len(self.values):
+                    # Mostly unique values: sharing saves nothing, stop paying for the dict
+                    self.distinct = None
+            else:
+                self.values.extend(self.texts)
+        self.texts.clear()
+        return batch.rename(self.name) if preview else None
+
+    def to_series(self):
+        self.flush()
+        if self.deferred:
+            series = decode_column(self.values, self.kind)
+        elif not self.chunks:
+            series = decode_column([], self.kind)
+        elif len(self.chunks) == 1:
+            series = self.chunks[0]
+        else:
+            series = pd.concat(self.chunks, ignore_index=True)
+        return series.rename(self.name)
+
+
+class SqlResultReader:
+    """
+    Incremental <queryResponse> parser: feed() bytes, close() returns the
+    DataFrame. With on_rows, every decoded batch is also passed to
+    on_rows(frame) as it completes; batches start at FIRST_BATCH_ROWS rows
+    and double up to batch_rows, so the first rows show up early.
+    """
+
+    def __init__(self, batch_rows=BATCH_ROWS, on_rows=None):
+        self.batch_rows = batch_rows
+        self.on_rows = on_rows
+        self.buffers = None
+        self._early_rows = []  # values of rows that came before <columns>
+        self.row_count = 0
+        self._pending = 0
+        self._flush_at = min(FIRST_BATCH_ROWS, batch_rows) if on_rows is not None else batch_rows
+        if xml_backend.BACKEND == "lxml":
+            # Only <columns> and <row> produce events; getparent() detaches read rows
+            self._parser = xml_backend.pull_parser(events=("end",), tags=[COLUMNS_TAG, ROW_TAG])
+            self._detach = True
+        else:
+            # ElementTree reports every element and has no parent links: read
+            # rows are emptied in place (their cells are freed, an empty
+            # element shell stays under <data>)
+            self._parser = xml_backend.pull_parser(events=("end",))
+            self._detach = False
+
+    @property
+    def columns(self):
+        return [buffer.name for buffer in self.buffers or ()]
+
+    def feed(self, data):
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self):
+        self._parser.close()
+        self._drain()
+        if self.buffers is None and self._early_rows:
+            raise ValueError(f"Query response has {len(self._early_rows)} rows but no <columns> schema")
+        return self.result()
+
+    def result(self):
+        """DataFrame of the rows read so far (close() for a complete response)"""
+        if not self.buffers:
+            return pd.DataFrame()
+        self._flush()
+        # Names may repeat, so concat named Series rather than build from a dict
+        return pd.concat([buffer.to_series() for buffer in self.buffers], axis=1)
+
+    def _drain(self):
+        for _, elem in self._parser.read_events():
+            if elem.tag == ROW_TAG:
+                if self.buffers is not None:
+                    self._read_row(elem)
+                else:
+                    # Rows ahead of the schema: keep their values until <columns> arrives
+                    self._early_rows.append([None if cell.get("null") is not None else cell.text
+                                             for cell in elem.findall("column")])
+            elif elem.tag == COLUMNS_TAG and self.buffers is None:
+                self._read_schema(elem)
+                early_rows, self._early_rows = self._early_rows, []
+                for values in early_rows:
+                    self._add_values(values)
+            else:
+                continue
+            # Done with this element: drop its children so the tree never grows
+            elem.clear()
+            if self._detach:
+                elem.getparent().remove(elem)
+
+    def _read_schema(self, columns_elem):
+        self.buffers = [
+            ColumnBuffer(col.findtext("name"), kind_of(column_type(col)))
+            for col in columns_elem.findall("column")
+        ]
+        self._appenders = [buffer.texts.append for buffer in self.buffers]
+
+    def _read_row(self, row):
+        appenders = self._appenders
+        cells = row.findall("column")
+        if len(cells) == len(appenders):
+            for append, cell in zip(appenders, cells):
+                append(cell.text if cell.get("null") is None else None)
+        else:
+            # Short rows are padded with nulls, extra cells ignored
+            padded = cells + [None] * (len(appenders) - len(cells))
+            for append, cell in zip(appenders, padded):
+                append(None if cell is None or cell.get("null") is not None else cell.text)
+        self._row_added()
+
+    def _add_values(self, values):
+        """Append one row of already extracted values (padded / truncated to the schema)"""
+        values = values + [None] * (len(self._appenders) - len(values))
+        for append, value in zip(self._appenders, values):
+            append(value)
+        self._row_added()
+
+    def _row_added(self):
+        self.row_count += 1
+        self._pending += 1
+        if self._pending >= self._flush_at:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        preview = self.on_rows is not None
+        batch = [buffer.flush(preview) for buffer in self.buffers]
+        self._pending = 0
+        if preview:
+            self._flush_at = min(self._flush_at * 2, self.batch_rows)
+            self.on_rows(pd.concat(batch, axis=1))
+
+
+def read_sql_result(xml_text, batch_rows=BATCH_ROWS):
+    """Parse a complete query-submit response (str or bytes) into a typed DataFrame"""
+    data = xml_text.encode("utf-8") if isinstance(xml_text, str) else xml_text
+    reader = SqlResultReader(batch_rows)
+    for start in range(0, len(data), CHUNK_SIZE):
+        reader.feed(data[start:start + CHUNK_SIZE])
+    return reader.close()
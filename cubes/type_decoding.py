@@ -0,0 +1,176 @@
+# cubes/type_decoding.py
+"""
+Column-at-a-time type decoding for XMLA cells and SQL result columns.
+
+MDX cells declare their type with xsi:type on <Value>; SQL results declare
+it in the <columns> metadata. Instead of converting cell by cell (or trying
+pd.to_numeric on every column and catching the failure), each column is
+decoded once from its declared kind:
+
+    int      -> int64 (nullable Int64 when the column has nulls)
+    float    -> float64
+    decimal  -> float64 while every value fits its 15 significant digits,
+                otherwise object (decimal.Decimal, exact)
+    datetime -> datetime64[ns]; SQL TIME values stay strings
+    bool     -> bool (nullable boolean when the column has nulls)
+    string   -> category when values repeat, otherwise object
+    unknown  -> one coerce pass; numeric only if every present value parses
+"""
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+XSI_TYPE = f"{{{XSI_NS}}}type"
+
+INT, FLOAT, DECIMAL, DATETIME, BOOL, STRING, UNKNOWN = (
+    "int", "float", "decimal", "datetime", "bool", "string", "unknown"
+)
+
+# Lower-cased type names (xsd local names and SQL/JDBC type names) -> kind
+_KIND_BY_NAME = {
+    "int": INT, "integer": INT, "long": INT, "short": INT, "byte": INT,
+    "unsignedint": INT, "unsignedlong": INT, "unsignedshort": INT, "unsignedbyte": INT,
+    "bigint": INT, "smallint": INT, "tinyint": INT,
+    "double": FLOAT, "float": FLOAT, "real": FLOAT,
+    "decimal": DECIMAL, "numeric": DECIMAL, "bigdecimal": DECIMAL, "number": DECIMAL,
+    "datetime": DATETIME, "date": DATETIME, "timestamp": DATETIME, "time": STRING,
+    "boolean": BOOL, "bool": BOOL, "bit": BOOL,
+    "string": STRING, "varchar": STRING, "char": STRING, "nvarchar": STRING, "text": STRING,
+}
+
+# java.sql.Types codes, for metadata that only carries the JDBC type number
+_KIND_BY_JDBC_CODE = {
+    -7: BOOL, -6: INT, 5: INT, 4: INT, -5: INT,
+    6: FLOAT, 7: FLOAT, 8: FLOAT, 2: DECIMAL, 3: DECIMAL,
+    1: STRING, 12: STRING, -1: STRING, -9: STRING, -15: STRING,
+    91: DATETIME, 92: STRING, 93: DATETIME, 16: BOOL,
+}
+
+# Share of distinct values under which a string column becomes categorical
+CATEGORY_RATIO = 0.5
+
+# Significant digits a float64 holds exactly; longer decimals are kept as Decimal
+FLOAT_DIGITS = 15
+
+_BOOL_TEXTS = {"true": True, "1": True, "false": False, "0": False}
+
+
+def kind_of(type_name):
+    """Map an xsi:type ('xsd:double'), SQL type name or JDBC code to a kind"""
+    if type_name is None:
+        return UNKNOWN
+    name = str(type_name).strip()
+    try:
+        return _KIND_BY_JDBC_CODE.get(int(name), UNKNOWN)
+    except ValueError:
+        pass
+    name = name.rsplit(":", 1)[-1].split("(", 1)[0].strip().lower()
+    return _KIND_BY_NAME.get(name, UNKNOWN)
+
+
+def _present_mask(texts):
+    return np.fromiter((t is not None for t in texts), dtype=bool, count=len(texts))
+
+
+def _infer(texts, categorize=True):
+    """Undeclared type: a single coerce pass decides numeric vs text"""
+    raw = pd.Series(texts, dtype=object)
+    numeric = pd.to_numeric(raw, errors="coerce")
+    if numeric.notna().sum() == raw.notna().sum():
+        return numeric
+    return _decode_string(texts, categorize)
+
+
+def _decode_string(texts, categorize=True):
+    if categorize and len(texts) > 1:
+        categorical = pd.Categorical(texts)
+        if len(categorical.categories) <= CATEGORY_RATIO * len(texts):
+            return pd.Series(categorical)
+    return pd.Series(texts, dtype=object)
+
+
+def _fits_float(texts):
+    """True if no decimal value has more significant digits than a float64 keeps"""
+    for text in texts:
+        if text is None or len(text) <= FLOAT_DIGITS:
+            continue
+        mantissa = text.lstrip("+-").split("e", 1)[0].split("E", 1)[0].replace(".", "").lstrip("0")
+        if len(mantissa) > FLOAT_DIGITS:
+            return False
+    return True
+
+
+def decode_column(texts, kind, categorize=True):
+    """
+    Decode a list of value strings (None = null) to a typed Series in one
+    vectorized conversion. Falls back to inference if the declared type
+    does not hold for the data.
+    """
+    if kind == STRING:
+        return _decode_string(texts, categorize)
+    present = _present_mask(texts)
+    has_nulls = not present.all()
+    try:
+        if kind == DECIMAL and not _fits_float(texts):
+            return pd.Series([Decimal(t) if t is not None else None for t in texts], dtype=object)
+        if kind in (FLOAT, DECIMAL):
+            filled = np.array([t if t is not None else "nan" for t in texts] if has_nulls else texts, dtype=str)
+            return pd.Series(filled.astype(np.float64))
+        if kind == INT:
+            if has_nulls:
+                values = np.zeros(len(texts), dtype=np.int64)
+                values[present] = np.array([t for t in texts if t is not None], dtype=str).astype(np.int64)
+                return pd.Series(pd.arrays.IntegerArray(values, ~present))
+            return pd.Series(np.array(texts, dtype=str).astype(np.int64))
+        if kind == BOOL:
+            # Anything but true/false/1/0 means the declared type doesn't hold
+            values = np.array([_BOOL_TEXTS[t.strip().lower()] if t is not None else False for t in texts], dtype=bool)
+            if has_nulls:
+                return pd.Series(pd.arrays.BooleanArray(values, ~present))
+            return pd.Series(values)
+        if kind == DATETIME:
+            values = pd.to_datetime(pd.Series(texts, dtype=object), errors="coerce", format="ISO8601")
+            # A present value that became NaT is not ISO 8601: keep the column as text rather than lose it
+            if values.notna().sum() == present.sum():
+                return pd.Series(values)
+            return _decode_string(texts, categorize)
+    except (ValueError, TypeError, OverflowError, KeyError, ArithmeticError):
+        pass
+    return _infer(texts, categorize)
+
+
+def decode_typed_cells(texts, type_names):
+    """
+    Decode MDX cell values using each cell's xsi:type. Cells are grouped by
+    declared type so every group converts in one call. Returns a float64
+    array when every cell is numeric, otherwise an object array.
+    """
+    count = len(texts)
+    unique_types = set(type_names)
+    if len(unique_types) == 1:
+        kind = kind_of(next(iter(unique_types)))
+        decoded = decode_column(texts, kind, categorize=False)
+        return _as_cell_array(decoded)
+
+    result = np.empty(count, dtype=object)
+    numeric = True
+    type_array = np.array(type_names, dtype=object)
+    text_array = np.array(texts, dtype=object)
+    for type_name in unique_types:
+        positions = np.flatnonzero(type_array == type_name)
+        decoded = _as_cell_array(decode_column(list(text_array[positions]), kind_of(type_name), categorize=False))
+        numeric = numeric and decoded.dtype.kind == "f"
+        result[positions] = decoded
+    return result.astype(np.float64) if numeric else result
+
+
+def _as_cell_array(series):
+    """Flatten a decoded Series into a NumPy array for the cellset value buffer"""
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+        if series.dtype.kind in "fiu":
+            return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    elif series.dtype.kind in "fiu":
+        return series.to_numpy(dtype=np.float64)
+    return series.to_numpy(dtype=object)
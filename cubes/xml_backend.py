@@ -0,0 +1,113 @@
+# cubes/xml_backend.py
+"""
+XML parser backend for XMLA / SQL result parsing.
+
+Uses lxml when it is installed (C-level XPath, huge_tree for very large
+responses) and falls back to xml.etree.ElementTree otherwise. Both expose
+the same Element API (find/findall/findtext/iter/get), so parsers only need:
+
+    root = xml_backend.fromstring(xml_text)
+    ROWS = xml_backend.compile_path(".//data/row")   # once, at import
+    for row in ROWS.findall(root): ...
+
+    parser = xml_backend.pull_parser()                # incremental parsing
+
+lxml is fast at parsing but slower than ElementTree at per-element Python
+access, so hot loops should pull whole columns with compile_xpath() (C
+level, lxml only) or limit pull-parser events to the tags they need.
+
+Set ATSCALE_XML_BACKEND=etree to force the standard library parser.
+"""
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+if lxml_etree is not None and os.environ.get("ATSCALE_XML_BACKEND", "").lower() != "etree":
+    BACKEND = "lxml"
+    ParseError = (lxml_etree.XMLSyntaxError, ET.ParseError)
+else:
+    BACKEND = "etree"
+    ParseError = (ET.ParseError,)
+
+_local = threading.local()  # lxml parser objects must not be shared between threads
+
+
+def _lxml_parser():
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = lxml_etree.XMLParser(huge_tree=True, resolve_entities=False)
+    return parser
+
+
+def _as_bytes(text):
+    # lxml refuses str input that carries an encoding declaration
+    return text.encode("utf-8") if isinstance(text, str) else text
+
+
+def fromstring(text, backend=None):
+    """Parse a complete XML document and return its root element"""
+    if (backend or BACKEND) == "lxml":
+        return lxml_etree.fromstring(_as_bytes(text), parser=_lxml_parser())
+    return ET.fromstring(text)
+
+
+def pull_parser(events=("start", "end"), tags=None, backend=None):
+    """
+    Incremental parser with feed()/read_events()/close(). Under lxml, tags
+    restricts the reported events to those elements (filtered in C);
+    ElementTree reports every element.
+    """
+    if (backend or BACKEND) == "lxml":
+        return lxml_etree.XMLPullParser(events=events, tag=tags, huge_tree=True, resolve_entities=False)
+    return ET.XMLPullParser(events=events)
+
+
+class CompiledPath:
+    """
+    An ElementPath expression ('.//{ns}row', '{ns}Caption',
+    './/{ns}Axis[@name="Axis0"]') compiled once. Under lxml it becomes an
+    ETXPath evaluated in C; under ElementTree the expression is handed to
+    the element's own find/findall.
+    """
+
+    def __init__(self, path, backend=None):
+        self.path = path
+        self.backend = backend or BACKEND
+        self._xpath = lxml_etree.ETXPath(path) if self.backend == "lxml" else None
+
+    def findall(self, elem):
+        if self._xpath is not None:
+            return self._xpath(elem)
+        return elem.findall(self.path)
+
+    def find(self, elem):
+        if self._xpath is not None:
+            found = self._xpath(elem)
+            return found[0] if found else None
+        return elem.find(self.path)
+
+    def findtext(self, elem, default=None):
+        found = self.find(elem)
+        if found is None:
+            return default
+        return found.text or ""
+
+
+def compile_path(path, backend=None):
+    return CompiledPath(path, backend)
+
+
+def compile_xpath(expr, namespaces=None, backend=None):
+    """
+    Full XPath returning strings (attribute values, text()) - lxml only.
+    Returns None under ElementTree, whose ElementPath subset cannot select
+    attributes or text; callers then walk the elements instead.
+    """
+    if (backend or BACKEND) != "lxml":
+        return None
+    return lxml_etree.XPath(expr, namespaces=namespaces, smart_strings=False)
@@ -0,0 +1,153 @@
+# cubes/xml_benchmark.py
+"""
+Micro-benchmark of the XML parser backends (see cubes/xml_backend.py).
+
+Generates representative payloads - a DISCOVER rowset, an MDX cellset and
+a SQL result - and times the real parsers on each backend. Each backend
+runs in its own interpreter (ATSCALE_XML_BACKEND=lxml|etree) because the
+backend is chosen at import time.
+
+Usage:
+    python -m cubes.xml_benchmark [--rows 20000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+MDDATASET_NS = "urn:schemas-microsoft-com:xml-analysis:mddataset"
+ROWSET_NS = "urn:schemas-microsoft-com:xml-analysis:rowset"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+SOAP_ENVELOPE = ('<?xml version="1.0" encoding="UTF-8"?>'
+                 '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+                 '<DiscoverResponse xmlns="urn:schemas-microsoft-com:xml-analysis"><return>{}</return>'
+                 '</DiscoverResponse></soap:Body></soap:Envelope>')
+ROWSET_COLUMNS = ["CATALOG_NAME", "CUBE_NAME", "DIMENSION_UNIQUE_NAME", "HIERARCHY_UNIQUE_NAME",
+                  "LEVEL_UNIQUE_NAME", "LEVEL_NUMBER", "LEVEL_CAPTION", "LEVEL_CARDINALITY",
+                  "LEVEL_TYPE", "DESCRIPTION", "LEVEL_IS_VISIBLE", "LEVEL_ORDERING_PROPERTY"]
+
+
+def make_rowset(rows):
+    body = "".join(
+        "<row>" + "".join(f"<{col}>{col.lower()}_{i % 97}</{col}>" for col in ROWSET_COLUMNS) + "</row>"
+        for i in range(rows)
+    )
+    return SOAP_ENVELOPE.format(f'<root xmlns="{ROWSET_NS}">{body}</root>')
+
+
+def make_cellset(rows, columns=5):
+    def member(hierarchy, caption):
+        return (f'<Member Hierarchy="{hierarchy}"><UName>{hierarchy}.&amp;[{caption}]</UName>'
+                f'<Caption>{caption}</Caption><LName>{hierarchy}.[Level]</LName><LNum>1</LNum></Member>')
+
+    axis0 = "".join(f"<Tuple>{member('[Measures]', f'Measure {j}')}</Tuple>" for j in range(columns))
+    axis1 = "".join(f"<Tuple>{member('[Geography].[City]', f'City {i}')}"
+                    f"{member('[Date].[Year]', str(2000 + i % 20))}</Tuple>" for i in range(rows))
+    cells = "".join(
+        f'<Cell CellOrdinal="{o}"><Value xsi:type="xsd:double">{o * 1.25}</Value>'
+        f'<FmtValue>{o * 1.25:,.2f}</FmtValue></Cell>'
+        for o in range(rows * columns) if o % 7  # sparse: every 7th cell is empty
+    )
+    root = (f'<root xmlns="{MDDATASET_NS}" xmlns:xsi="{XSI_NS}"><Axes>'
+            f'<Axis name="Axis0"><Tuples>{axis0}</Tuples></Axis>'
+            f'<Axis name="Axis1"><Tuples>{axis1}</Tuples></Axis></Axes>'
+            f'<CellData>{cells}</CellData></root>')
+    return SOAP_ENVELOPE.format(root)
+
+
+def make_sql_result(rows):
+    columns = "".join(f"<column><name>{name}</name><type><name>{kind}</name></type></column>"
+                      for name, kind in (("d_city", "String"), ("d_year", "Int"), ("salesamount", "Double")))
+    data = "".join(f"<row><column>City {i % 500}</column><column>{2000 + i % 20}</column>"
+                   f"<column>{i * 1.5}</column></row>" for i in range(rows))
+    return f"<queryResponse><columns>{columns}</columns><data>{data}</data></queryResponse>"
+
+
+def _chunks(payload, size=64 * 1024):
+    data = payload.encode("utf-8")
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_worker(rows, repeat):
+    """Time every parser on the backend selected for this interpreter"""
+    from cubes import xml_backend
+    from cubes.cube_data_parsers import parse_rows, parse_xmla_result_to_dataframe
+    from cubes.cube_data_sql import parse_sql_results
+    from cubes.mdx_parser import parse_xmla_mdx_result
+    from cubes.xmla_stream import iter_rowset_batches
+
+    rowset = make_rowset(rows)
+    cellset = make_cellset(rows // 4)
+    sql = make_sql_result(rows)
+
+    def stream_rowset():
+        for _ in iter_rowset_batches(_chunks(rowset), ROWSET_COLUMNS):
+            pass
+
+    results = {
+        "rowset parse_rows": _time(lambda: parse_rows(rowset, ROWSET_COLUMNS), repeat),
+        "rowset streaming": _time(stream_rowset, repeat),
+        "cellset parse_xmla_result_to_dataframe": _time(lambda: parse_xmla_result_to_dataframe(cellset), repeat),
+        "cellset parse_xmla_mdx_result": _time(lambda: parse_xmla_mdx_result(cellset), repeat),
+        "sql parse_sql_results": _time(lambda: parse_sql_results(sql), repeat),
+    }
+    print(json.dumps({"backend": xml_backend.BACKEND, "results": results}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare lxml and ElementTree on XMLA/SQL parsing")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.rows, args.repeat)
+        return
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    by_backend = {}
+    for backend in ("etree", "lxml"):
+        env = dict(os.environ, ATSCALE_XML_BACKEND=backend)
+        proc = subprocess.run(
+            [sys.executable, "-m", "cubes.xml_benchmark", "--worker",
+             "--rows", str(args.rows), "--repeat", str(args.repeat)],
+            cwd=project_root, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"[{backend}] failed:\n{proc.stderr}")
+            continue
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+        if report["backend"] != backend:
+            print(f"[{backend}] not available (lxml is not installed); skipped")
+            continue
+        by_backend[backend] = report["results"]
+
+    if not by_backend:
+        return
+    names = list(next(iter(by_backend.values())))
+    print(f"{'benchmark':42} " + " ".join(f"{b:>10}" for b in by_backend) +
+          ("     speedup" if len(by_backend) == 2 else ""))
+    for name in names:
+        times = [by_backend[b][name] for b in by_backend]
+        line = f"{name:42} " + " ".join(f"{t * 1000:8.1f}ms" for t in times)
+        if len(times) == 2 and times[1]:
+            line += f"  {times[0] / times[1]:9.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# cubes/xmla_async.py
+"""
+asyncio front-end for XMLA and REST calls.
+
+Requests still go through the pooled http_session transport (run on a
+bounded thread pool), but they are scheduled as asyncio tasks so a batch of
+discovery queries finishes in roughly the time of the slowest one instead
+of the sum of all of them.
+
+Tk code runs on its own thread, so a single background event loop is kept
+alive and batches are handed to it with run_sync()/run_xmla_batch(), or
+iter_xmla_completed() to handle each response as soon as it arrives.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from cubes.cube_data_queries import run_xmla_query
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 120  # seconds, per request
+
+
+class AsyncXmlaClient:
+    """Bounded-concurrency XMLA/REST client; every coroutine must run on one loop"""
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="xmla-async")
+        self._semaphore = None
+
+    def _get_semaphore(self):
+        # Created lazily so it binds to the loop the client is actually used on
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run_blocking(self, func, *args, deadline, **kwargs):
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            # Executor threads don't inherit context; carry the caller's (timing tags etc.)
+            ctx = contextvars.copy_context()
+            future = loop.run_in_executor(self._executor, lambda: ctx.run(func, *args, **kwargs))
+            # On timeout/cancel the task is abandoned; the worker thread is
+            # bounded by the same timeout passed to the HTTP layer.
+            return await asyncio.wait_for(future, deadline)
+
+    async def query(self, xml_body, timeout=None):
+        """Run one XMLA request and return the response body (bytes, or an mmap when spooled)"""
+        timeout = self.timeout if timeout is None else timeout
+        return await self._run_blocking(run_xmla_query, xml_body, deadline=timeout, timeout=timeout)
+
+    async def rest(self, method, url, timeout=None, **kwargs):
+        """Run one JWT-authenticated REST request and return the Response"""
+        from common import authorized_request
+
+        timeout = self.timeout if timeout is None else timeout
+        kwargs.setdefault("verify", False)
+        return await self._run_blocking(authorized_request, method, url, deadline=timeout, timeout=timeout, **kwargs)
+
+    async def query_many(self, xml_bodies, timeout=None):
+        """
+        Run XMLA requests concurrently. Results come back in input order;
+        a failed request yields its exception instead of a response.
+        """
+        tasks = [asyncio.ensure_future(self.query(body, timeout=timeout)) for body in xml_bodies]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Background loop + sync bridge ---
+_loop = None
+_loop_thread = None
+_client = None
+_loop_lock = threading.Lock()
+_client_settings = {"max_concurrency": DEFAULT_MAX_CONCURRENCY, "timeout": DEFAULT_TIMEOUT}
+
+
+def configure(max_concurrency=None, timeout=None):
+    """Change concurrency/timeout for the shared client (takes effect on next start)"""
+    if max_concurrency is not None:
+        _client_settings["max_concurrency"] = int(max_concurrency)
+    if timeout is not None:
+        _client_settings["timeout"] = float(timeout)
+
+
+def _ensure_loop():
+    global _loop, _loop_thread, _client
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="xmla-async-loop", daemon=True)
+            _loop_thread.start()
+            _client = AsyncXmlaClient(**_client_settings)
+        return _loop
+
+
+def get_client():
+    """Return the shared client bound to the background loop"""
+    _ensure_loop()
+    return _client
+
+
+def submit(coro):
+    """
+    Schedule a coroutine on the background loop and return a
+    concurrent.futures.Future; calling .cancel() on it cancels the task.
+    """
+    return asyncio.run_coroutine_threadsafe(_in_context(coro, contextvars.copy_context()), _ensure_loop())
+
+
+async def _in_context(coro, ctx):
+    """Run coro with the submitting thread's context variables applied"""
+    for var, value in ctx.items():
+        var.set(value)
+    return await coro
+
+
+def run_sync(coro, timeout=None):
+    """Block the calling (non-loop) thread until coro finishes on the background loop"""
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("run_sync() cannot be called from the async loop thread")
+    future = submit(coro)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def run_xmla_batch(xml_bodies, timeout=None):
+    """Sync helper: run XMLA requests concurrently, return responses/exceptions in order"""
+    return run_sync(get_client().query_many(list(xml_bodies), timeout=timeout))
+
+
+def iter_xmla_completed(xml_bodies, timeout=None):
+    """
+    Sync helper: run XMLA requests concurrently and yield (index, response)
+    in completion order; a failed request yields its exception. Closing the
+    generator early cancels the requests still pending.
+    """
+    client = get_client()
+    futures = {submit(client.query(body, timeout=timeout)): index for index, body in enumerate(xml_bodies)}
+    try:
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                response = e
+            yield futures[future], response
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def shutdown():
+    """Stop the background loop (used on application exit)"""
+    global _loop, _client
+    with _loop_lock:
+        if _loop is not None and not _loop.is_closed():
+            if _client is not None:
+                _client.close()
+            _loop.call_soon_threadsafe(_loop.stop)
+        _loop = None
+        _client = None
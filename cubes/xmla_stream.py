@@ -0,0 +1,233 @@
+# cubes/xmla_stream.py
+"""
+Streaming XMLA execution.
+
+The response body is read in chunks (stream=True) and fed to an incremental
+XML parser. Each completed row / Tuple / Cell element is handed to the
+caller and then detached from the tree, so neither the full payload string
+nor the full DOM is ever held in memory - peak usage follows batch size,
+not response size.
+"""
+from contextlib import contextmanager
+
+import pandas as pd
+
+from api import http_session, request_timing
+from common import load_config
+from cubes import xml_backend
+from cubes.cellset import CellsetBuilder, cellset_frame, read_cell, read_member
+from cubes.cube_data_parsers import rowset_tag_index
+from cubes.cube_data_queries import XmlaFaultError, is_fault_response
+
+SOAP_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+ROWSET_NS = "urn:schemas-microsoft-com:xml-analysis:rowset"
+MDDATASET_NS = "urn:schemas-microsoft-com:xml-analysis:mddataset"
+
+ROW_TAG = f"{{{ROWSET_NS}}}row"
+AXIS_TAG = f"{{{MDDATASET_NS}}}Axis"
+TUPLE_TAG = f"{{{MDDATASET_NS}}}Tuple"
+MEMBER_TAG = f"{{{MDDATASET_NS}}}Member"
+CELL_TAG = f"{{{MDDATASET_NS}}}Cell"
+FAULT_TAG = f"{{{SOAP_NS}}}Fault"
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_BATCH_SIZE = 1000
+
+
+@contextmanager
+def open_xmla_stream(xml_body: str, chunk_size=DEFAULT_CHUNK_SIZE, timeout=None):
+    """POST an XMLA request and yield an iterator over the raw response bytes"""
+    config = load_config()
+    resp = http_session.post(
+        config.xmla_url,
+        data=xml_body.encode("utf-8"),
+        headers={"Content-Type": "text/xml"},
+        auth=config.credentials,
+        verify=False,
+        retry="xmla",
+        compress_body=True,
+        timeout=timeout,
+        stream=True,
+    )
+    try:
+        # A SOAP fault comes back as a 500 with an XML body; let the parser raise it with its code and message
+        if not is_fault_response(resp):
+            resp.raise_for_status()
+    except Exception:
+        http_session.read_body(resp)  # completes the timing/transfer records and closes
+        raise
+
+    # iter_body records timing and transfer when the stream ends; the download
+    # phase therefore includes the consumer's incremental parsing
+    chunks = http_session.iter_body(resp, chunk_size=chunk_size)
+    try:
+        yield chunks
+    finally:
+        chunks.close()
+        resp.close()  # in case the consumer never started iterating
+
+
+def iter_elements(chunks, tags, start_tags=()):
+    """
+    Feed byte chunks to an incremental parser and yield (event, element) for
+    each completed element whose tag is in tags ("end") and each opened
+    element whose tag is in start_tags ("start" - attributes only, no
+    children yet). Once the consumer moves on, a completed element is cleared
+    and detached from its parent so the tree never grows.
+    """
+    tags = set(tags)
+    start_tags = set(start_tags)
+    if xml_backend.BACKEND == "lxml":
+        # Only the wanted elements produce events; parents come from getparent()
+        parser = xml_backend.pull_parser(events=("start", "end"), tags=list(tags | start_tags | {FAULT_TAG}))
+        stack = None
+    else:
+        parser = xml_backend.pull_parser(events=("start", "end"))
+        stack = []
+
+    def drain():
+        for event, elem in parser.read_events():
+            if event == "start":
+                if stack is not None:
+                    stack.append(elem)
+                if elem.tag in start_tags:
+                    yield event, elem
+                continue
+            if stack is not None:
+                stack.pop()
+            if elem.tag == FAULT_TAG:
+                raise XmlaFaultError(elem.findtext("faultstring") or "XMLA fault", elem.findtext("faultcode"))
+            if elem.tag in tags:
+                yield event, elem
+                elem.clear()
+                parent = stack[-1] if stack else (elem.getparent() if stack is None else None)
+                if parent is not None:
+                    parent.remove(elem)
+
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+            yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def iter_rowset_batches(chunks, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield lists of {column: text} dicts for rowset (DISCOVER / $system) responses"""
+    tag_to_index = rowset_tag_index(columns)
+    batch = []
+    for _, row in iter_elements(chunks, (ROW_TAG,)):
+        values = [None] * len(columns)
+        for child in row:
+            idx = tag_to_index.get(child.tag)
+            if idx is not None and values[idx] is None:
+                values[idx] = child.text
+        batch.append(dict(zip(columns, values)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def stream_rowset(xml_body: str, columns, batch_size=DEFAULT_BATCH_SIZE, timeout=None):
+    """Execute a rowset query and yield one DataFrame per batch of rows"""
+    with open_xmla_stream(xml_body, timeout=timeout) as chunks:
+        for batch in iter_rowset_batches(chunks, columns, batch_size):
+            yield pd.DataFrame(batch, columns=list(columns))
+
+
+def iter_cellset_events(chunks, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Walk an MDX cellset incrementally. Yields
+      ("tuples", axis_name, [[(hierarchy, caption, uname), ...], ...])  - axis tuples in order
+      ("cells", [(ordinal, value_text, fmt_value_text, xsi_type), ...])  - see cellset.read_cell
+    Axes always precede CellData in an XMLA response.
+    """
+    axis_name = None
+    tuples = []
+    cells = []
+
+    for event, elem in iter_elements(chunks, (TUPLE_TAG, AXIS_TAG, CELL_TAG), start_tags=(AXIS_TAG,)):
+        if elem.tag == AXIS_TAG:
+            if event == "start":
+                axis_name = elem.get("name")
+            elif tuples:
+                yield "tuples", axis_name, tuples
+                tuples = []
+        elif elem.tag == TUPLE_TAG:
+            tuples.append([read_member(m) for m in elem.findall(MEMBER_TAG)])
+            if len(tuples) >= batch_size:
+                yield "tuples", axis_name, tuples
+                tuples = []
+        else:
+            cells.append(read_cell(elem))
+            if len(cells) >= batch_size:
+                yield "cells", cells
+                cells = []
+    if cells:
+        yield "cells", cells
+
+
+def read_cellset_streaming(xml_body: str, batch_size=DEFAULT_BATCH_SIZE, max_rows=None, timeout=None,
+                           formatted=True, on_rows=None, stop=None):
+    """
+    Execute an MDX request and build the same DataFrame as
+    parse_xmla_result_to_dataframe(), chunk by chunk. Each batch of cells is
+    written by CellOrdinal into a preallocated CellsetBuilder (empty cells are
+    omitted by the server and stay NaN). Rows past max_rows are dropped.
+    formatted=True (the preview) shows FmtValue text; False gives values
+    decoded from their xsi:type.
+
+    on_rows(frame) is called (on this thread) with each run of rows as soon
+    as they are complete, for progressive display. A single-axis result
+    becomes one row per Axis0 tuple with a 'Value' column, as in
+    cellset_to_dataframe. Setting the stop event closes the transfer; the
+    rows completed so far are returned.
+    """
+    axes = {"Axis0": [], "Axis1": []}
+    builder = None
+    emitted = 0
+
+    def layout():
+        if axes["Axis1"]:
+            return axes["Axis1"], axes["Axis0"]
+        # Single-axis result: one row per Axis0 tuple and a 'Value' column
+        return axes["Axis0"], [[(None, "Value", "Value")]]
+
+    def new_builder():
+        row_tuples, column_tuples = layout()
+        return CellsetBuilder(len(row_tuples), len(column_tuples), keep_formatted=formatted, max_rows=max_rows)
+
+    def emit(upto):
+        nonlocal emitted
+        if on_rows is not None and upto > emitted:
+            on_rows(cellset_frame(builder, *layout(), formatted=formatted, rows=slice(emitted, upto)))
+            emitted = upto
+
+    with open_xmla_stream(xml_body, timeout=timeout) as chunks:
+        for event in iter_cellset_events(chunks, batch_size):
+            if event[0] == "tuples":
+                _, axis_name, tuples = event
+                if axis_name in axes:
+                    axes[axis_name].extend(tuples)
+            else:
+                if builder is None:
+                    builder = new_builder()
+                builder.add_cells(event[1])
+                emit(builder.complete_rows())
+            if stop is not None and stop.is_set():
+                break
+
+    if not axes["Axis1"] and not axes["Axis0"]:
+        return pd.DataFrame()
+    with request_timing.phase("dataframe"):
+        if builder is None:
+            builder = new_builder()
+        stopped = stop is not None and stop.is_set()
+        # A stopped transfer keeps only the rows known to be complete
+        rows = slice(0, builder.complete_rows()) if stopped else None
+        if not stopped:
+            emit(builder.n_rows)
+        df = cellset_frame(builder, *layout(), formatted=formatted, rows=rows)
+    return df
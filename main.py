@@ -1,15 +1,26 @@
 import tkinter as tk
 from tkinter import ttk
-from common import make_tab_with_log, append_log
+from common import make_tab_with_log, append_log, load_config, set_token_log
+from api.http_session import configure_pools, configure_compression, close_all
+from api.retry_policy import configure_policies
+from cubes import parse_service, xmla_async
 from tabs.overview_tab import build_tab as overview_tab
 from tabs.migrations_tab import build_tab as migrations_tab
 from tabs.queries_tab import build_tab as queries_tab
 from tabs.cube_data_preview_tab import build_tab as cube_data_preview_tab
 from tabs.catalog_tab import build_tab as catalog_tab
 from tabs.aggregate_tab import build_tab as aggregate_tab
+from tabs.performance_panel import PerformancePanel
 
 
 def main():
+    # Size the shared HTTP connection pools before any tab starts fanning out
+    config = load_config()
+    configure_pools(config.get("http_pool_connections"), config.get("http_pool_maxsize"))
+    configure_compression(config.get("http_compress_requests"), config.get("http_compress_threshold"))
+    configure_policies(config.get("retry_policies"))
+    xmla_async.configure(config.get("xmla_max_concurrency"), config.get("xmla_timeout"))
+
     root = tk.Tk()
     root.title("Tabbed Window")
     root.geometry("1300x1000")
@@ -22,6 +33,15 @@ def main():
         except tk.TclError:
             continue
 
+    # Request timings (p50/p95 per operation), toggled with F12 or the Tools menu
+    performance_panel = PerformancePanel(root)
+    menubar = tk.Menu(root)
+    tools_menu = tk.Menu(menubar, tearoff=0)
+    tools_menu.add_command(label="Performance Panel", accelerator="F12", command=performance_panel.toggle)
+    menubar.add_cascade(label="Tools", menu=tools_menu)
+    root.config(menu=menubar)
+    root.bind("<F12>", performance_panel.toggle)
+
     notebook = ttk.Notebook(root)
     notebook.pack(fill="both", expand=True)
 
@@ -42,7 +62,13 @@ def main():
     append_log(log5[0], "Catalog ready.")
     append_log(log6[0], "Aggregate ready.")
 
+    # Background token refreshes run on a timer thread; report failures in the Overview log
+    set_token_log(lambda message: root.after(0, append_log, log1[0], message))
+
     root.mainloop()
+    xmla_async.shutdown()
+    parse_service.shutdown()
+    close_all()
 
 
 if __name__ == "__main__":
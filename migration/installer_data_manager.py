@@ -2,8 +2,8 @@
 # [file content begin]
 import tkinter as tk
 import requests
-from common import append_log, get_jwt
-from api.folders import get_folders
+from common import append_log
+from api.catalog_registry import get_registry
 
 class InstallerDataManager:
     def __init__(self, config, log_ref_container, left_listbox):
@@ -13,14 +13,14 @@ class InstallerDataManager:
         self.flat_installer_list = []  # Store the display structure
         self._selected_project_ids = set()  # Track selected projects by ID for sticky behavior
 
-    def load_installer_data(self):
-        """Load all projects from Installer and display as flat sorted list"""
+    def load_installer_data(self, refresh=False):
+        """
+        Load all projects from Installer and display as flat sorted list.
+        The folder tree is shared with the Overview tab; refresh=True fetches
+        it again instead of reusing the loaded copy.
+        """
         try:
-            jwt = get_jwt()
-            host = self.config["host"]
-            org = self.config["organization"]
-            
-            folders_json = get_folders(host, org, jwt)
+            folders_json = get_registry().get("folders", refresh=refresh).data
             append_log(self.log_ref_container[0], "Loaded installer folder structure")
             
             self._build_installer_listbox(folders_json)
@@ -99,7 +99,7 @@ class InstallerDataManager:
     def refresh_installer_data(self):
         """Refresh installer data and update the listbox"""
         append_log(self.log_ref_container[0], "Refreshing installer source data...")
-        self.load_installer_data()
+        self.load_installer_data(refresh=True)
         append_log(self.log_ref_container[0], "✓ Installer source refreshed")
 
     def save_selection_state(self):
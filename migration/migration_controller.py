@@ -38,7 +38,7 @@ class MigrationController:
         if self.git_data_manager:
             self.git_data_manager.save_selection_state()
         
-        self.load_installer_data()
+        self.load_installer_data(refresh=True)
         self.refresh_git_repositories()
         append_log(self.log_ref_container[0], "✓ Both installer and Git data refreshed")
 
@@ -63,9 +63,9 @@ class MigrationController:
             self.right_listbox.configure(state='normal')
             append_log(self.log_ref_container[0], "Mode: Container to Installer - Select repos on right")
 
-    def load_installer_data(self):
+    def load_installer_data(self, refresh=False):
         """Load installer data using InstallerDataManager"""
-        self.installer_data_manager.load_installer_data()
+        self.installer_data_manager.load_installer_data(refresh=refresh)
 
     def load_git_repositories(self):
         """Load Git repositories using GitDataManager"""
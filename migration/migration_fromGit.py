@@ -41,7 +41,7 @@ class MigrationFromGit:
                 }
                 
                 # Get repository contents recursively
-                url = f"https://api.github.com/repos/{clean_repo_name}/contents/"
+                url = f"{self.api_git_ops.base_url}/repos/{clean_repo_name}/contents/"
                 response = requests.get(url, headers=headers, timeout=30)
                 
                 if response.status_code != 200:
@@ -1,16 +1,16 @@
 import os
 import json
-import requests
 import threading
 import time
 import re
-from common import append_log, get_jwt
+from common import append_log, authorized_request
 from migration.java_service import JavaServiceManager
 from migration.xml_to_sml import XmlToSmlConverter
 from migration.sml_to_xml import SmlToXmlConverter
 from migration.migration_toGit import MigrationToGit
 from migration.migration_fromGit import MigrationFromGit
 from api.git_operations import GitOperations as ApiGitOperations
+from api.request_timing import operation
 
 class MigrationOperations:
     def __init__(self, config, log_ref_container):
@@ -210,6 +210,7 @@ class MigrationOperations:
         return True
 
 
+    @operation("migration to git")
     def _migrate_project_to_git(self, project_id, project_name):
         """Migrate a project to Git repository using project name as repo name"""
         try:
@@ -312,6 +313,7 @@ class MigrationOperations:
         thread.start()
         return True
 
+    @operation("migration to installer")
     def _migrate_git_to_installer(self, repo_name, project_name):
         """Migrate from Git repository to Installer"""
         try:
@@ -370,20 +372,19 @@ class MigrationOperations:
             append_log(self.log_ref_container[0], f"✗ Error deleting repository: {e}")
             return False
 
+    @operation("migration export xml")
     def _export_xml(self, project_id):
         """Export project XML from AtScale"""
         try:
-            jwt = get_jwt()
             host = self.config["host"]
             org = self.config["organization"]
             
             url = f"https://{host}:10500/org/{org}/project/{project_id}/xml/download"
             headers = {
-                "Authorization": f"Bearer {jwt}",
                 "Content-Type": "application/json"
             }
             
-            response = requests.get(url, headers=headers, verify=False, timeout=30)
+            response = authorized_request("GET", url, headers=headers, verify=False, timeout=30)
             response.raise_for_status()
             
             return response.text
@@ -1,8 +1,7 @@
 # [file name]: project_deletion_manager.py
 # [file content begin]
 import tkinter as tk
-import requests
-from common import append_log, get_jwt
+from common import append_log, authorized_request
 
 class ProjectDeletionManager:
     def __init__(self, config, log_ref_container, installer_data_manager):
@@ -53,19 +52,17 @@ class ProjectDeletionManager:
     def _delete_project_from_atscale(self, project_id, project_name):
         """Delete project from AtScale using API"""
         try:
-            jwt = get_jwt()
             host = self.config["host"]
             org = self.config["organization"]
             
             url = f"https://{host}:10500/api/1.0/org/{org}/project/{project_id}"
             headers = {
-                "Authorization": f"Bearer {jwt}",
                 "Content-Type": "application/json"
             }
             
             append_log(self.log_ref_container[0], f"Deleting project '{project_name}' (ID: {project_id})...")
             
-            response = requests.delete(url, headers=headers, verify=False, timeout=30)
+            response = authorized_request("DELETE", url, headers=headers, verify=False, timeout=30)
             
             if response.status_code == 200:
                 append_log(self.log_ref_container[0], f"✓ Successfully deleted project: {project_name}")
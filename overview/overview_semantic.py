@@ -4,10 +4,9 @@ import os
 import time
 import re
 import traceback
-import requests
 import pandas as pd
 from collections import defaultdict
-from common import append_log
+from common import append_log, authorized_request
 
 # Import helper modules (relative import so package layout remains)
 from overview.overview_semantic_extract import extract_window_project, extract_basic_fields
@@ -22,13 +21,13 @@ class SemanticParser:
         self.org = org
         self.log_ref_container = log_ref_container
 
-    def process_cube_data(self, cube_label, cube_id, project_id, jwt, export_enabled, result_text):
+    def process_cube_data(self, cube_label, cube_id, project_id, export_enabled, result_text):
         try:
             append_log(self.log_ref_container[0], f"Cube selected: {cube_label}")
 
             url = f"https://{self.host}:10500/org/{self.org}/project/{project_id}/cube/{cube_id}/"
-            headers = {"Authorization": f"Bearer {jwt}", "Content-Type": "application/json"}
-            resp = requests.get(url, headers=headers, verify=False, timeout=20)
+            headers = {"Content-Type": "application/json"}
+            resp = authorized_request("GET", url, headers=headers, verify=False, timeout=20)
             resp.raise_for_status()
 
             html_content = resp.text
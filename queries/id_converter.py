@@ -2,17 +2,14 @@
 """
 Convert between XMLA GUIDs and API IDs for installer/container instances.
 """
-import requests
-from common import get_jwt, get_instance_type, load_config
+from common import authorized_request, get_instance_type, load_config
 
 
 class IdConverter:
     def __init__(self):
         self.config = load_config()
         self.instance_type = get_instance_type()
-        self.jwt_token = get_jwt()
         self.headers = {
-            "Authorization": f"Bearer {self.jwt_token}",
             "Content-Type": "application/json"
         }
     
@@ -39,12 +36,11 @@ class IdConverter:
             return catalog_guid
         
         # Fallback: try to get project by name
-        host = self.config["host"]
-        org = self.config["organization"]
-        url = f"https://{host}:10502/projects/orgId/{org}"
+        org = self.config.organization
+        url = f"{self.config.engine_base}/projects/orgId/{org}"
         
         try:
-            response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+            response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -64,11 +60,10 @@ class IdConverter:
     
     def _get_container_catalog_id(self, catalog_name, catalog_guid):
         """Get catalog ID for container"""
-        host = self.config["host"]
-        url = f"https://{host}/wapi/p/catalogs"
+        url = f"{self.config.engine_base}/wapi/p/catalogs"
         
         try:
-            response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+            response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -87,11 +82,10 @@ class IdConverter:
         if not catalog_id:
             return None
         
-        host = self.config["host"]
-        url = f"https://{host}/wapi/p/catalogs/{catalog_id}/models"
+        url = f"{self.config.engine_base}/wapi/p/catalogs/{catalog_id}/models"
         
         try:
-            response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+            response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
             response.raise_for_status()
             data = response.json()
             
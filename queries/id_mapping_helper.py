@@ -2,17 +2,14 @@
 """
 Helper to map between catalog/cube names and IDs for API calls.
 """
-import requests
-from common import get_jwt, get_instance_type, load_config
+from common import authorized_request, get_instance_type, load_config
 
 
 class IdMappingHelper:
     def __init__(self):
         self.config = load_config()
         self.instance_type = get_instance_type()
-        self.jwt_token = get_jwt()
         self.headers = {
-            "Authorization": f"Bearer {self.jwt_token}",
             "Content-Type": "application/json"
         }
         
@@ -34,11 +31,10 @@ class IdMappingHelper:
                 return project_id
         elif self.instance_type == "container":
             # Fetch catalog list
-            host = self.config["host"]
-            url = f"https://{host}/wapi/p/catalogs"
+            url = f"{self.config.engine_base}/wapi/p/catalogs"
             
             try:
-                response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+                response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -57,12 +53,11 @@ class IdMappingHelper:
         if self.instance_type != "installer":
             return None
         
-        host = self.config["host"]
-        org = self.config["organization"]
-        url = f"https://{host}:10502/projects/orgId/{org}"
+        org = self.config.organization
+        url = f"{self.config.engine_base}/projects/orgId/{org}"
         
         try:
-            response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+            response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -93,11 +88,10 @@ class IdMappingHelper:
                 return None
             
             # Get models in catalog
-            host = self.config["host"]
-            url = f"https://{host}/wapi/p/catalogs/{catalog_id}/models"
+            url = f"{self.config.engine_base}/wapi/p/catalogs/{catalog_id}/models"
             
             try:
-                response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+                response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -1,8 +1,12 @@
 # tabs/queries_executor.py
 import pandas as pd
 from cubes.cube_data_queries import run_xmla_query, build_xmla_request
-from cubes.mdx_parser import parse_mdx_result, debug_xmla_response
+from cubes import parse_service
+from cubes.mdx_parser import parse_fallback_mdx
 from cubes.cube_data_sql import execute_raw_sql_query
+from cubes.cellset import flat_frame
+from cubes.xmla_stream import XmlaFaultError, read_cellset_streaming
+from api.request_timing import operation, phase
 
 
 class QueryExecutor:
@@ -13,15 +17,22 @@ class QueryExecutor:
         if self.log_callback:
             self.log_callback(message)
     
-    def execute_query(self, query, query_type, catalog, cube, use_agg=True, use_cache=True):
-        """Execute query and return results as DataFrame"""
+    def execute_query(self, query, query_type, catalog, cube, use_agg=True, use_cache=True,
+                      on_rows=None, stop=None):
+        """
+        Execute query and return results as DataFrame. With on_rows, batches
+        of rows are passed to on_rows(frame) while the response downloads;
+        setting the stop event ends the transfer early.
+        """
         try:
             self.log(f"Using flags - Use Agg: {use_agg}, Use Cache: {use_cache}")
             
             if query_type == "MDX":
+                if on_rows is not None:
+                    return self.stream_mdx(query, catalog, cube, use_agg, use_cache, on_rows, stop)
                 return self.execute_mdx(query, catalog, cube, use_agg, use_cache)
             elif query_type == "SQL":
-                return self.execute_sql(query, catalog, cube, use_agg, use_cache)
+                return self.execute_sql(query, catalog, cube, use_agg, use_cache, on_rows, stop)
             else:
                 self.log(f"Unknown query type: {query_type}")
                 return None
@@ -29,6 +40,7 @@ class QueryExecutor:
             self.log(f"Query execution error: {e}")
             return None
     
+    @operation("MDX execute")
     def execute_mdx(self, query, catalog, cube, use_agg=True, use_cache=True):
         """Execute MDX query using XMLA with flags"""
         try:
@@ -42,24 +54,24 @@ class QueryExecutor:
                 self.log("Empty response from XMLA query")
                 return pd.DataFrame()
             
-            # Only show minimal debug info, not the full XMLA response
-            debug_info = debug_xmla_response(response)
-            self.log(f"MDX response: {debug_info['tuple_count']} tuples, {debug_info['cell_count']} cells")
+            # Parse once; counts, fault details and the DataFrame all come from this object
+            with phase("parse"):
+                cellset = parse_service.parse("mdx", response, progress=self.log)
+            self.log(f"MDX response: {cellset.tuple_count} tuples, {cellset.cell_count} cells")
             
-            # Parse the response using our XMLA-specific parser
-            df = parse_mdx_result(response)
+            if cellset.is_fault:
+                self.log(f"XMLA Error: {cellset.error_message}")
+                return pd.DataFrame()
+            
+            with phase("dataframe"):
+                df = cellset.to_dataframe()
+            if df is None and cellset.parse_error:
+                # Not XML at all - keep the old text fallback for odd payloads
+                self.log(cellset.error_message)
+                df = parse_fallback_mdx(response)
             
             if df is None or df.empty:
                 self.log("Failed to parse MDX response - no data extracted")
-                # Only show error details if parsing fails
-                if 'error' in response.lower() or 'fault' in response.lower():
-                    self.log("XMLA response contains error indicators")
-                    # Extract error message if possible
-                    if '<faultstring>' in response:
-                        start = response.find('<faultstring>') + 13
-                        end = response.find('</faultstring>')
-                        error_msg = response[start:end]
-                        self.log(f"XMLA Error: {error_msg}")
                 return pd.DataFrame()
                 
             self.log(f"Successfully parsed MDX result: {len(df)} rows, {len(df.columns)} columns")
@@ -69,18 +81,51 @@ class QueryExecutor:
             
             return df
             
+        except XmlaFaultError as e:
+            self.log(f"XMLA Error: {e}")
+            return pd.DataFrame()
+        except Exception as e:
+            self.log(f"MDX execution error: {e}")
+            return pd.DataFrame()
+    
+    @operation("MDX execute")
+    def stream_mdx(self, query, catalog, cube, use_agg=True, use_cache=True, on_rows=None, stop=None):
+        """Execute MDX query, passing completed rows to on_rows as the cellset streams in"""
+        try:
+            self.log(f"Executing MDX query against {catalog}.{cube} (streaming)")
+            xmla_request = build_xmla_request(query, catalog, cube, use_agg, use_cache)
+            
+            # Same flat layout as build_dataframe_from_axes: row captions, then one column per tuple
+            df = read_cellset_streaming(xmla_request, formatted=False, stop=stop,
+                                        on_rows=lambda frame: on_rows(flat_frame(frame)))
+            if df.empty:
+                self.log("Failed to parse MDX response - no data extracted")
+                return pd.DataFrame()
+            
+            df = flat_frame(df)
+            if stop is not None and stop.is_set():
+                self.log(f"MDX query stopped after {len(df)} rows")
+            self.log(f"Successfully parsed MDX result: {len(df)} rows, {len(df.columns)} columns")
+            self.log(f"Columns: {list(df.columns)}")
+            return df
+            
+        except XmlaFaultError as e:
+            self.log(f"XMLA Error: {e}")
+            return pd.DataFrame()
         except Exception as e:
             self.log(f"MDX execution error: {e}")
             return pd.DataFrame()
     
-    def execute_sql(self, query, catalog, cube, use_agg=True, use_cache=True):
+    @operation("SQL execute")
+    def execute_sql(self, query, catalog, cube, use_agg=True, use_cache=True, on_rows=None, stop=None):
         """Execute SQL query with flags"""
         try:
             self.log(f"Executing SQL query against {catalog}.{cube}")
             
             # Import and use the raw SQL execution function with flags
 
-            return execute_raw_sql_query(query, catalog, cube, self.log, use_agg, use_cache)
+            return execute_raw_sql_query(query, catalog, cube, self.log, use_agg, use_cache,
+                                         on_rows=on_rows, stop=stop)
             
         except ImportError as e:
             self.log(f"Error importing SQL module: {e}")
@@ -4,8 +4,9 @@ from tkinter import ttk
 import pandas as pd
 
 class QueryResults:
-    def __init__(self, parent):
+    def __init__(self, parent, on_stop=None):
         self.parent = parent
+        self.on_stop = on_stop
         self.create_widgets()
     
     def create_widgets(self):
@@ -49,10 +50,17 @@ class QueryResults:
         self.v_scrollbar.config(command=self.results_tree.yview)
         self.h_scrollbar.config(command=self.results_tree.xview)
         
-        # Status label
+        # Status row: label + Stop button (enabled while rows are streaming in)
+        status_frame = ttk.Frame(self.main_frame)
+        status_frame.grid(row=2, column=0, sticky="ew", pady=(5, 0))
+        status_frame.columnconfigure(0, weight=1)
+        
         self.status_var = tk.StringVar(value="Ready")
-        self.status_label = ttk.Label(self.main_frame, textvariable=self.status_var)
-        self.status_label.grid(row=2, column=0, sticky="w", pady=(5, 0))
+        self.status_label = ttk.Label(status_frame, textvariable=self.status_var)
+        self.status_label.grid(row=0, column=0, sticky="w")
+        
+        self.stop_btn = ttk.Button(status_frame, text="Stop", command=self.on_stop, state="disabled")
+        self.stop_btn.grid(row=0, column=1, sticky="e")
     
     def display_results(self, df):
         """Display DataFrame in the results treeview"""
@@ -88,6 +96,29 @@ class QueryResults:
         
         return len(df) > max_display_rows  # Return whether results were truncated
     
+    def begin_incremental(self):
+        """Clear the tree for a result that will arrive in batches (see append_rows)"""
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.results_tree["columns"] = []
+        self.stop_btn.config(state="normal")
+    
+    def append_rows(self, df, start):
+        """Append a batch of rows; start == 0 means the first batch, which sets the columns"""
+        columns = list(df.columns)
+        if start == 0:
+            self.results_tree["columns"] = columns
+            for col in columns:
+                self.results_tree.heading(col, text=col)
+                self.results_tree.column(col, width=120, minwidth=80, stretch=False)
+        
+        for row in df.itertuples(index=False, name=None):
+            values = [str(value) if pd.notna(value) else "" for value in row]
+            self.results_tree.insert("", "end", values=values)
+    
+    def end_incremental(self):
+        """The result is complete (or was stopped)"""
+        self.stop_btn.config(state="disabled")
+    
     def clear_results(self):
         """Clear the results treeview"""
         self.results_tree.delete(*self.results_tree.get_children())
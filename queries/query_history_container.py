@@ -2,9 +2,10 @@
 """
 Query history service for container instances.
 """
-import requests
 from queries.query_history_base import QueryHistoryBase
 from queries.id_mapping_helper import IdMappingHelper
+from common import authorized_request
+from api.request_timing import operation
 
 
 class QueryHistoryContainer(QueryHistoryBase):
@@ -12,20 +13,18 @@ class QueryHistoryContainer(QueryHistoryBase):
         super().__init__()
         self.mapping_helper = IdMappingHelper()
     
+    @operation("history fetch")
     def fetch_query_history(self, catalog_name=None, cube_name=None, catalog_id=None, model_id=None):
         """
         Fetch query history from container instance with proper filtering.
         """
-        jwt_token = get_jwt()
         headers = {
-            "Authorization": f"Bearer {jwt_token}",
             "Content-Type": "application/json"
         }
         
-        host = self.config["host"]
         
         # Build URL with parameters
-        url = f"https://{host}/wapi/p/queries"
+        url = f"{self.config.engine_base}/wapi/p/queries"
         params = {
             "page": 1,
             "showCanaries": "false",
@@ -44,7 +43,7 @@ class QueryHistoryContainer(QueryHistoryBase):
         queries = []
         
         try:
-            response = requests.get(url, headers=headers, params=params, verify=False, timeout=30)
+            response = authorized_request("GET", url, headers=headers, params=params, verify=False, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -2,32 +2,26 @@
 """
 Query history service for installer instances.
 """
-import requests
 from queries.query_history_base import QueryHistoryBase
-from common import load_config, get_jwt, get_instance_type
+from common import authorized_request
+from api.request_timing import operation
 
 
 class QueryHistoryInstaller(QueryHistoryBase):
-    def __init__(self):
-        super().__init__()
-        self.config = load_config()
-    
     # tabs/query_history_installer.py (updated sorting)
+    @operation("history fetch")
     def fetch_query_history(self, catalog_name=None, cube_name=None, catalog_id=None, cube_id=None):
         """
         Fetch query history from installer instance using project ID and cube ID.
         """
-        jwt_token = get_jwt()
         headers = {
-            "Authorization": f"Bearer {jwt_token}",
             "Content-Type": "application/json"
         }
         
-        host = self.config["host"]
-        org = self.config["organization"]
+        org = self.config.organization
         
         # Build URL with parameters
-        url = f"https://{host}:10502/queries/orgId/{org}"
+        url = f"{self.config.engine_base}/queries/orgId/{org}"
         params = {
             "limit": 100,
             "querySource": "user",
@@ -47,7 +41,7 @@ class QueryHistoryInstaller(QueryHistoryBase):
         queries = []
         
         try:
-            response = requests.get(url, headers=headers, params=params, verify=False, timeout=30)
+            response = authorized_request("GET", url, headers=headers, params=params, verify=False, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -2,17 +2,14 @@
 """
 Helper module to map catalog/cube names to IDs for API calls.
 """
-import requests
-from common import get_jwt, get_instance_type, load_config
+from common import authorized_request, get_instance_type, load_config
 
 
 class QueryHistoryMapping:
     def __init__(self):
         self.config = load_config()
         self.instance_type = get_instance_type()
-        self.jwt_token = get_jwt()
         self.headers = {
-            "Authorization": f"Bearer {self.jwt_token}",
             "Content-Type": "application/json"
         }
     
@@ -24,9 +21,8 @@ class QueryHistoryMapping:
                 return self.config["organization"]
             elif self.instance_type == "container":
                 # Need to call catalog API
-                host = self.config["host"]
-                url = f"https://{host}/wapi/p/catalogs"
-                response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+                url = f"{self.config.engine_base}/wapi/p/catalogs"
+                response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -46,9 +42,8 @@ class QueryHistoryMapping:
                 return None
             elif self.instance_type == "container":
                 # Get models in catalog
-                host = self.config["host"]
-                url = f"https://{host}/wapi/p/catalogs/{catalog_id}/models"
-                response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+                url = f"{self.config.engine_base}/wapi/p/catalogs/{catalog_id}/models"
+                response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -66,10 +61,9 @@ class QueryHistoryMapping:
         
         try:
             # Try to get projects list
-            host = self.config["host"]
-            org = self.config["organization"]
-            url = f"https://{host}:10502/projects/orgId/{org}"
-            response = requests.get(url, headers=self.headers, verify=False, timeout=30)
+            org = self.config.organization
+            url = f"{self.config.engine_base}/projects/orgId/{org}"
+            response = authorized_request("GET", url, headers=self.headers, verify=False, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -12,6 +12,7 @@ class QueryInputUI:
         self.query_type_var = tk.StringVar(value="MDX")
         self.use_agg_var = tk.BooleanVar(value=True)
         self.use_cache_var = tk.BooleanVar(value=True)
+        self.progressive_var = tk.BooleanVar(value=True)
 
         self.query_text = None
         self.main_frame = None
@@ -39,7 +40,10 @@ class QueryInputUI:
         self.use_agg_checkbox = ttk.Checkbutton(options_frame, text="Use Agg", variable=self.use_agg_var)
         self.use_cache_checkbox = ttk.Checkbutton(options_frame, text="Use Cache", variable=self.use_cache_var)
         self.use_agg_checkbox.grid(row=0, column=4, padx=(0, 10))
-        self.use_cache_checkbox.grid(row=0, column=5)
+        self.use_cache_checkbox.grid(row=0, column=5, padx=(0, 10))
+        self.progressive_checkbox = ttk.Checkbutton(options_frame, text="Show rows as they arrive",
+                                                    variable=self.progressive_var)
+        self.progressive_checkbox.grid(row=0, column=6)
 
         # Query text area
         ttk.Label(self.main_frame, text="Query:").grid(row=1, column=0, sticky="w", pady=(0, 5))
@@ -1,4 +1,5 @@
 # tabs/catalog_tab.py
+import threading
 import tkinter as tk
 from tkinter import ttk
 import pandas as pd
@@ -6,8 +7,11 @@ from common import append_log
 
 # Import from our existing modules
 from cubes.common_selector import CatalogCubeSelector
-from catalog.catalog_data_loader import load_catalog_data
-from catalog.catalog_tree_manager import populate_catalog_treeviews, handle_tree_selection
+from catalog.catalog_data_loader import CatalogData, load_catalog_data
+from catalog.catalog_tree_manager import (
+    populate_catalog_treeviews, populate_dimensions_tree, populate_measures_tree, handle_tree_selection,
+    DIMENSION_TREE_ROWSETS, MEASURE_TREE_ROWSETS
+)
 from catalog.catalog_display import display_catalog_details
 
 def build_tab(content, log_ref_container):
@@ -48,15 +52,57 @@ def build_tab(content, log_ref_container):
         
         # REMOVE: The cube metadata loading part - that belongs to cube_data_preview_tab.py
         # FIXED: Just load catalog data for treeviews
-        catalog_data = load_catalog_data(catalog, cube, lambda msg: append_log(log_ref_container[0], msg))
+        # The rowsets load concurrently on a worker thread; each tree is filled as soon as
+        # its own rowsets are in (columns/dependencies are only fetched if read)
+        catalog_data = CatalogData(catalog, cube, log_from_thread)
+        dimensions_tree.delete(*dimensions_tree.get_children())
+        measures_tree.delete(*measures_tree.get_children())
         
-        # Populate treeviews
-        if catalog_data:
-            populate_catalog_treeviews(dimensions_tree, measures_tree, catalog_data, current_cube)
+        def load():
+            result = load_catalog_data(
+                catalog, cube, log_from_thread,
+                on_rowset=lambda name, df: content.after(0, apply_rowset, catalog, cube, name, df),
+                on_refresh=lambda data: content.after(0, refresh_catalog_data, catalog, cube, data))
+            content.after(0, finish_loading, catalog, cube, result)
+        
+        threading.Thread(target=load, name="catalog-load", daemon=True).start()
+
+    def log_from_thread(msg):
+        # Loader and cache revalidation log from background threads, so go through the Tk event loop
+        content.after(0, append_log, log_ref_container[0], msg)
+
+    def is_current(catalog, cube):
+        return (catalog, cube) == (current_catalog, current_cube)
+
+    def apply_rowset(catalog, cube, name, df):
+        """One rowset arrived: fill the tree it completes"""
+        if not is_current(catalog, cube):
+            return
+        catalog_data[name] = df
+        if name in DIMENSION_TREE_ROWSETS and all(catalog_data.get(n) is not None for n in DIMENSION_TREE_ROWSETS):
+            populate_dimensions_tree(dimensions_tree, catalog_data, current_cube)
+            append_log(log_ref_container[0], "Dimensions tree populated")
+        elif name in MEASURE_TREE_ROWSETS:
+            populate_measures_tree(measures_tree, catalog_data, current_cube)
+            append_log(log_ref_container[0], "Measures tree populated")
+
+    def finish_loading(catalog, cube, result):
+        if not is_current(catalog, cube):
+            return
+        if any(result.get(name) is not None for name in DIMENSION_TREE_ROWSETS + MEASURE_TREE_ROWSETS):
             append_log(log_ref_container[0], "Catalog treeviews populated")
         else:
             append_log(log_ref_container[0], "Failed to load catalog data")
 
+    def refresh_catalog_data(catalog, cube, data):
+        """Cached catalog data turned out stale; show the fresh copy if this cube is still selected"""
+        nonlocal catalog_data
+        if not is_current(catalog, cube):
+            return
+        catalog_data = data
+        populate_catalog_treeviews(dimensions_tree, measures_tree, catalog_data, current_cube)
+        append_log(log_ref_container[0], "Catalog treeviews refreshed")
+
     def on_dimensions_tree_select(event):
         """Handle dimension tree selection - allow parent node selection"""
         nonlocal last_dimensions_selection
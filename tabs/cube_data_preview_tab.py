@@ -4,11 +4,13 @@ import pandas as pd
 from common import append_log
 
 # Import from our new modules
+from cubes.cellset import flat_labels
 from cubes.cubes_ui_components import create_ui_components
+from tabs.progressive_results import ProgressiveResults
 from cubes.cubes_core_functions import on_catalog_cube_selected_wrapper, on_sql_dialect_change
 from cubes.cubes_event_handlers import (
     on_listbox_click, get_selected_dimension, 
-    drill_down_listbox_item, execute_query
+    drill_down_listbox_item, execute_query, stop_query
 )
 from cubes.cubes_context_menus import (
     create_context_menus, show_result_context_menu,
@@ -25,6 +27,7 @@ def build_tab(content, log_ref_container):
         'hierarchies_df': None,  
         'levels_df': None,
         'measures_df': None,
+        'metadata_index': None,  # CubeMetadataIndex over the three frames above
         'dimension_mapping': {},
         'measure_mapping': {},
         'query_history': [],
@@ -38,7 +41,8 @@ def build_tab(content, log_ref_container):
         'current_drill_down_data': {},
         
         # Functions
-        'log_function': lambda msg: append_log(log_ref_container[0], msg),
+        # Queries run in a background thread, so log through the Tk event loop
+        'log_function': lambda msg: content.after(0, append_log, log_ref_container[0], msg),
         'display_function': None  # Will be set later
     }
     
@@ -57,9 +61,6 @@ def build_tab(content, log_ref_container):
     # Create display function
     def display_dataframe_in_treeview(df, is_sql=False):
         """Display DataFrame in Treeview widget"""
-        # Clear existing data
-        components['result_tree'].delete(*components['result_tree'].get_children())
-        
         # Remove duplicate rows
         original_shape = df.shape
         df = df[~df.index.duplicated(keep='first')]
@@ -68,14 +69,30 @@ def build_tab(content, log_ref_container):
         if original_shape != df.shape:
             state['log_function'](f"Removed duplicates: {original_shape} -> {df.shape}")
         
+        prepare_result_tree(df, is_sql)
+        insert_result_rows(df, is_sql)
+    
+    def append_result_rows(df, start, is_sql=False):
+        """Append one batch of a result that is still downloading (start == 0 resets the tree)"""
+        if start == 0:
+            prepare_result_tree(df, is_sql)
+        # Duplicates can only be dropped within the batch here
+        df = df[~df.index.duplicated(keep='first')]
+        insert_result_rows(df, is_sql, start)
+    
+    def prepare_result_tree(df, is_sql):
+        """Clear the tree and configure its columns for df"""
+        # Clear existing data
+        components['result_tree'].delete(*components['result_tree'].get_children())
+        
         # Clear any previous item data
         if hasattr(display_dataframe_in_treeview, "item_data"):
             display_dataframe_in_treeview.item_data.clear()
         else:
             display_dataframe_in_treeview.item_data = {}
         
-        # Configure columns
-        columns = list(df.columns)
+        # Configure columns (MDX cellsets carry MultiIndex axes; show captions)
+        columns = flat_labels(df.columns, df.attrs.get('captions'))
         
         if is_sql:
             # For SQL: Use regular columns without the tree column
@@ -96,24 +113,30 @@ def build_tab(content, log_ref_container):
             for col in columns:
                 components['result_tree'].heading(col, text=col)
                 components['result_tree'].column(col, width=120, minwidth=80)
+    
+    def insert_result_rows(df, is_sql, start=0):
+        """Insert df's rows; start is the row number of the first one"""
+        captions = df.attrs.get('captions')
+        columns = flat_labels(df.columns, captions)
+        row_labels = flat_labels(df.index, captions)
         
         # Insert data
-        for i, (index, row) in enumerate(df.iterrows()):
-            values = [str(row[col]) if pd.notna(row[col]) else "" for col in columns]
+        for i, (index, row) in enumerate(zip(df.index, df.itertuples(index=False, name=None))):
+            values = [str(value) if pd.notna(value) else "" for value in row]
             
             if is_sql:
                 item = components['result_tree'].insert("", "end", text="", values=values)
             else:
-                item = components['result_tree'].insert("", "end", text=str(index), values=values)
+                item = components['result_tree'].insert("", "end", text=row_labels[i], values=values)
             
             # Store drill-down data
             row_data = {
                 'index': index,
-                'display_text': str(index),
-                'values': dict(row),
-                'row_number': i,
+                'display_text': row_labels[i],
+                'values': dict(zip(columns, row)),
+                'row_number': start + i,
                 'item_id': item,
-                'member_caption': str(index)
+                'member_caption': row_labels[i]
             }
             
             display_dataframe_in_treeview.item_data[item] = row_data
@@ -130,6 +153,15 @@ def build_tab(content, log_ref_container):
     
     state['display_function'] = display_dataframe_in_treeview
     
+    # Progressive display: batches from the query thread are inserted from the Tk loop
+    def append_rows(df, start):
+        append_result_rows(df, start, is_sql=state['progressive_is_sql'])
+    
+    state['progressive'] = ProgressiveResults(
+        components['result_tree'], append_rows,
+        on_status=components['status_var'].set, log=state['log_function'])
+    state['progressive_is_sql'] = False
+    
     # Create show details function
     def show_selection_details():
         selected_items = components['result_tree'].selection()
@@ -190,5 +222,6 @@ def build_tab(content, log_ref_container):
     
     # Set execute button command
     components['execute_btn'].config(command=lambda: execute_query(state))
+    components['stop_btn'].config(command=lambda: stop_query(state))
     
     return content
\ No newline at end of file
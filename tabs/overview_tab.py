@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from common import append_log, load_config
-from api.folders import get_folders
+from api.catalog_registry import get_registry
 from overview.overview_semantic import SemanticParser
 
 def build_tab(content, log_ref_container):
@@ -44,9 +44,10 @@ def build_tab(content, log_ref_container):
     # Fetch data
     try:
         from common import get_jwt
-        jwt = get_jwt()
+        get_jwt()
         append_log(log_ref_container[0], "JWT acquired.")
-        folders_json = get_folders(host, org, jwt)
+        # Shared with the Migrations tab: one request at startup
+        folders_json = get_registry().get("folders").data
         append_log(log_ref_container[0], "Folders retrieved.")
     except Exception as e:
         append_log(log_ref_container[0], f"Error fetching data: {e}")
@@ -113,7 +114,6 @@ def build_tab(content, log_ref_container):
             cube_label, 
             cube_id, 
             project_id, 
-            jwt, 
             export_var.get(), 
             result_text
         )
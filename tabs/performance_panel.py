@@ -0,0 +1,103 @@
+# tabs/performance_panel.py
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+from api import request_timing
+from common import token_refresh_error
+
+REFRESH_MS = 2000
+PHASE_ORDER = ["total", "connect", "tls", "ttfb", "download", "parse", "dataframe"]
+
+
+class PerformancePanel:
+    """Toggleable window with p50/p95 per operation and phase from api.request_timing"""
+
+    def __init__(self, root):
+        self.root = root
+        self.window = None
+        self._after_id = None
+
+    def toggle(self, event=None):
+        if self.window is not None and self.window.winfo_exists():
+            self.close()
+        else:
+            self.open()
+
+    def open(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Performance")
+        self.window.geometry("760x420")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ttk.Frame(self.window, padding=6)
+        toolbar.pack(fill="x")
+        ttk.Button(toolbar, text="Refresh", command=self.refresh).pack(side="left")
+        ttk.Button(toolbar, text="Export JSONL...", command=self.export).pack(side="left", padx=6)
+        ttk.Button(toolbar, text="Clear", command=self.clear).pack(side="left")
+        self.status_var = tk.StringVar()
+        ttk.Label(toolbar, textvariable=self.status_var).pack(side="right")
+
+        frame = ttk.Frame(self.window)
+        frame.pack(fill="both", expand=True)
+        columns = ("phase", "count", "p50", "p95")
+        self.tree = ttk.Treeview(frame, columns=columns, show="tree headings")
+        self.tree.heading("#0", text="Operation")
+        self.tree.column("#0", width=240)
+        for col in columns:
+            self.tree.heading(col, text=col.upper() if col.startswith("p") else col.capitalize())
+            self.tree.column(col, width=110, anchor="e" if col != "phase" else "w")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self.refresh()
+
+    def close(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
+    def refresh(self):
+        if self.window is None or not self.window.winfo_exists():
+            return
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+
+        self.tree.delete(*self.tree.get_children())
+        summary = request_timing.summary()
+        for op_name in sorted(summary):
+            phases = summary[op_name]
+            parent = self.tree.insert("", "end", text=op_name, open=True)
+            ordered = [p for p in PHASE_ORDER if p in phases] + sorted(p for p in phases if p not in PHASE_ORDER)
+            for phase_name in ordered:
+                stats = phases[phase_name]
+                self.tree.insert(parent, "end", values=(
+                    phase_name,
+                    stats["count"],
+                    f"{stats['p50'] * 1000:.1f} ms",
+                    f"{stats['p95'] * 1000:.1f} ms",
+                ))
+        status = f"{len(request_timing.get_records())} records"
+        error = token_refresh_error()
+        if error is not None:
+            status += f" | token refresh failed: {error}"
+        self.status_var.set(status)
+        self._after_id = self.root.after(REFRESH_MS, self.refresh)
+
+    def export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=".jsonl",
+            filetypes=[("JSON lines", "*.jsonl"), ("All files", "*.*")],
+        )
+        if path:
+            count = request_timing.export_jsonl(path)
+            self.status_var.set(f"Exported {count} records")
+
+    def clear(self):
+        request_timing.clear()
+        self.refresh()
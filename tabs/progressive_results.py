@@ -0,0 +1,136 @@
+# tabs/progressive_results.py
+"""
+Progressive display of query results.
+
+The query runs in a worker thread and hands every batch of parsed rows to
+on_rows(frame) while the response is still downloading. Batches are queued
+and the Tk thread drains the queue with after(), inserting at most
+INSERT_ROWS rows per tick so the window keeps repainting during large
+results:
+
+    progress = ProgressiveResults(tree, append_rows, on_status=status_var.set, log=log)
+    progress.start()
+    # worker thread
+    df = stream_query(on_rows=progress.on_rows, stop=progress.stop_event)
+    progress.finish(lambda: show_final(df))
+
+append_rows(frame, start) receives consecutive slices of the result; start
+is the position of the first row (0 means new columns). A live counter and
+the time to the first row are reported through on_status; stop() ends the
+transfer and keeps the rows received so far.
+"""
+import queue
+import threading
+import time
+
+POLL_MS = 50
+INSERT_ROWS = 200  # rows inserted per Tk tick
+
+
+class ProgressiveResults:
+    def __init__(self, widget, append_rows, on_status=None, log=None, max_rows=1000):
+        self.widget = widget
+        self.append_rows = append_rows
+        self.on_status = on_status
+        self.log = log
+        self.max_rows = max_rows
+        self.stop_event = threading.Event()
+        self._queue = queue.Queue()
+        self._running = False
+        self._reset()
+
+    def _reset(self):
+        self.started = time.perf_counter()
+        self.first_row_seconds = None
+        self.rows_received = 0
+        self.rows_shown = 0
+        self._frame = None
+        self._offset = 0
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        """Begin a new result (Tk thread)"""
+        self.stop_event = threading.Event()
+        self._queue = queue.Queue()
+        self._reset()
+        self._running = True
+        self._report()
+        self.widget.after(POLL_MS, self._poll)
+
+    def on_rows(self, frame):
+        """Queue a batch of rows (worker thread)"""
+        if frame is None or frame.empty:
+            return
+        if self.first_row_seconds is None:
+            self.first_row_seconds = time.perf_counter() - self.started
+        self.rows_received += len(frame)
+        self._queue.put(frame)
+
+    def stop(self):
+        """Ask the worker to close the transfer; rows already received stay"""
+        self.stop_event.set()
+
+    @property
+    def stopped(self):
+        return self.stop_event.is_set()
+
+    def finish(self, on_done=None):
+        """Called by the worker when the query is over; on_done runs on the Tk thread after the last rows"""
+        self._queue.put((on_done,))
+
+    def status_text(self):
+        if self.first_row_seconds is None:
+            return f"Rows: 0 (waiting for first row, {time.perf_counter() - self.started:.1f} s)"
+        text = f"Rows: {self.rows_received} (first rows after {self.first_row_seconds:.2f} s)"
+        if self.rows_received > self.max_rows:
+            text += f", showing first {self.max_rows}"
+        return text
+
+    def _report(self):
+        if self.on_status is not None:
+            self.on_status(self.status_text())
+
+    def _poll(self):
+        budget = INSERT_ROWS
+        while budget > 0:
+            if self._frame is None:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, tuple):
+                    self._done(item[0])
+                    return
+                self._frame, self._offset = item, 0
+            budget -= self._insert(budget)
+        self._report()
+        self.widget.after(POLL_MS, self._poll)
+
+    def _insert(self, budget):
+        """Insert up to budget rows of the current frame; returns how many were consumed"""
+        frame = self._frame
+        room = max(self.max_rows - self.rows_shown, 0)
+        if room == 0:
+            # Past max_rows: rows are only counted
+            self._frame = None
+            return 0
+        count = min(budget, room, len(frame) - self._offset)
+        if self.rows_shown == 0 and self.log is not None:
+            self.log(f"First rows displayed after {time.perf_counter() - self.started:.2f} s "
+                     f"(received after {self.first_row_seconds:.2f} s)")
+        self.append_rows(frame.iloc[self._offset:self._offset + count], self.rows_shown)
+        self.rows_shown += count
+        self._offset += count
+        if self._offset >= len(frame):
+            self._frame = None
+        return count
+
+    def _done(self, on_done):
+        self._running = False
+        self._frame = None
+        self._report()
+        if on_done is not None:
+            on_done()
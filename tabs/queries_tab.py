@@ -1,4 +1,5 @@
 # tabs/queries_tab.py
+import threading
 import tkinter as tk
 from tkinter import ttk
 from common import append_log
@@ -10,6 +11,7 @@ from queries.query_input_logic import QueryInputLogic
 from queries.queries_results import QueryResults
 from queries.queries_executor import QueryExecutor
 from queries.id_converter import IdConverter
+from tabs.progressive_results import ProgressiveResults
 
 
 def build_tab(content, log_ref_container):
@@ -27,7 +29,8 @@ def build_tab(content, log_ref_container):
     current_cube_id = ""
 
     # Initialize components
-    executor = QueryExecutor(lambda msg: append_log(log_ref_container[0], msg))
+    # The executor runs in a background thread, so it logs through the Tk event loop
+    executor = QueryExecutor(lambda msg: content.after(0, append_log, log_ref_container[0], msg))
 
     # Define sample queries
     mdx_sample = """-- Sample MDX Query
@@ -81,9 +84,30 @@ ORDER BY `Calendar Year`"""
         cleaned_query = clean_query(query)
         append_log(log_ref_container[0], f"Executing {query_type} query...")
 
-        df = executor.execute_query(cleaned_query, query_type, current_catalog, current_cube,
-                                    use_agg=use_agg, use_cache=use_cache)
-
+        query_results.set_status(f"Running {query_type} query...")
+        
+        if query_ui.progressive_var.get():
+            if progress.running:
+                append_log(log_ref_container[0], "A query is still streaming - stop it first")
+                return
+            query_results.begin_incremental()
+            progress.start()
+            
+            def run_query():
+                df = executor.execute_query(cleaned_query, query_type, current_catalog, current_cube,
+                                            use_agg=use_agg, use_cache=use_cache,
+                                            on_rows=progress.on_rows, stop=progress.stop_event)
+                progress.finish(lambda: show_streamed_results(df))
+        else:
+            def run_query():
+                df = executor.execute_query(cleaned_query, query_type, current_catalog, current_cube,
+                                            use_agg=use_agg, use_cache=use_cache)
+                content.after(0, lambda: show_results(df))
+        
+        # Network and parsing stay off the Tk thread so the window keeps repainting
+        threading.Thread(target=run_query, daemon=True).start()
+
+    def show_results(df):
         if df is not None:
             if not df.empty:
                 was_truncated = query_results.display_results(df)
@@ -97,6 +121,28 @@ ORDER BY `Calendar Year`"""
             query_results.set_status("Query execution failed")
             append_log(log_ref_container[0], "Query execution failed - no results")
 
+    def show_streamed_results(df):
+        # Rows are already in the tree; only the summary is left
+        query_results.end_incremental()
+        if df is None:
+            query_results.set_status("Query execution failed")
+            append_log(log_ref_container[0], "Query execution failed - no results")
+            return
+        if progress.stopped:
+            append_log(log_ref_container[0], f"Query stopped: {len(df)} rows received")
+        elif df.empty:
+            append_log(log_ref_container[0], "Query executed but returned no data")
+        else:
+            if len(df) > progress.max_rows:
+                append_log(log_ref_container[0], f"Results were truncated to first {progress.max_rows} rows")
+            append_log(log_ref_container[0], f"Query executed successfully: {len(df)} rows returned")
+        query_results.set_status(progress.status_text())
+
+    def stop_query():
+        if progress.running:
+            progress.stop()
+            append_log(log_ref_container[0], "Stopping query - closing the transfer")
+
     def clean_query(query):
         lines = query.split('\n')
         cleaned_lines = []
@@ -121,8 +167,13 @@ ORDER BY `Calendar Year`"""
     query_ui.set_on_show_history(query_logic.show_query_history)
 
     # Query results component
-    query_results = QueryResults(content)
+    query_results = QueryResults(content, on_stop=stop_query)
     query_results.get_widget().grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
+    
+    # Batches from the worker thread are inserted into the tree from the Tk loop
+    progress = ProgressiveResults(query_results.results_tree, query_results.append_rows,
+                                  on_status=query_results.set_status,
+                                  log=lambda msg: append_log(log_ref_container[0], msg))
 
     # Set sample queries
     query_logic.set_sample_queries(mdx_sample, sql_sample)